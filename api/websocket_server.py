@@ -19,6 +19,8 @@ from core.task.models import UnifiedTask, TaskType, TaskStatus
 from core.task.executors.conversation_with_wake import ConversationExecutorWithWake
 from core.client.openai_client import OpenAIClient
 from config import OPENAI_API_KEY, OPENAI_BASE_URL, MCP_CONFIG_PATH
+from config import WAKE_WORD_ENGINE, PORCUPINE_ACCESS_KEY, WAKE_WORD_MODEL_PATHS
+from util.log_queue import setup_queue_logging, stop_queue_logging
 
 # ==================== FastAPI 应用 ====================
 app = FastAPI(title="数字人对话 WebSocket API")
@@ -44,11 +46,11 @@ def state_callback(state: str, data: Dict):
     print(f"   数据: {data}")
     print(f"   当前连接数: {len(active_connections)}")
     
-    # 🔧 修复：message 类型单独处理
-    if state == "message":
+    # 🔧 修复：message 类型单独处理（messages 为合并推送的多条消息）
+    if state in ("message", "messages"):
         # 消息事件：直接使用 message 作为类型
         message = {
-            "type": "message",
+            "type": state,
             "data": data,
             "timestamp": asyncio.get_event_loop().time()
         }
@@ -93,6 +95,7 @@ async def startup():
     """启动时初始化"""
     global agent, conversation_executor
     
+    setup_queue_logging()
     print("\n🚀 初始化数字人对话系统...")
     
     # 1. 初始化 Agent
@@ -111,18 +114,29 @@ async def startup():
     mcp_executor = McpExecutor(
         router=mcp_manager.router,
         connections=mcp_manager.connections,
-        task_queue=agent.task_queue
+        task_queue=agent.task_queue,
+        connection_pool=mcp_manager.connection_pool
     )
     agent.task_scheduler.register_executor(TaskType.MCP_CALL, mcp_executor)
     
     # 4. 创建 ConversationExecutor（带唤醒词）
+    wake_word_config = None
+    if WAKE_WORD_ENGINE:
+        wake_word_config = {
+            "engine": WAKE_WORD_ENGINE,
+            "access_key": PORCUPINE_ACCESS_KEY,
+            "keyword_paths": WAKE_WORD_MODEL_PATHS,
+            "model_paths": WAKE_WORD_MODEL_PATHS,
+        }
+    
     conversation_executor = ConversationExecutorWithWake(
         agent=agent,
         llm_client=llm_client,
         wake_words=["你好小狐狸", "小狐狸", "hey fox"],
         idle_timeout=30.0,
         max_idle_rounds=2,
-        state_callback=state_callback
+        state_callback=state_callback,
+        wake_word_config=wake_word_config
     )
     
     # ⚠️ 关键：先启动 Agent（会自动注册旧的 ConversationExecutor）
@@ -170,7 +184,7 @@ async def startup():
         print(f"❌ 任务失败原因: {fail_reason}")
         print(f"   执行器类型: {type(conversation_executor).__name__}")
         # 可选：打印完整的任务历史，方便调试
-        print(f"   任务完整历史: {json.dumps(task_detail.history, ensure_ascii=False, indent=2)}")
+        print(f"   任务完整历史: {json.dumps([dict(e) for e in task_detail.history], ensure_ascii=False, indent=2)}")
     else:
         print(f"✅ 任务运行正常，执行器: {type(conversation_executor).__name__}")
     
@@ -191,6 +205,7 @@ async def shutdown():
         await agent.stop()
     
     print("✅ 系统已关闭")
+    stop_queue_logging()
 
 # ==================== WebSocket 端点 ====================
 @app.websocket("/ws/conversation")
@@ -21,6 +21,11 @@ DASHSCOPE_BASE_URL = os.getenv(
     "https://dashscope.aliyuncs.com/api/v1",
 )
 
+# 本地唤醒词配置（未设置引擎时，待机阶段通过 ASR 文本匹配唤醒词）
+WAKE_WORD_ENGINE = os.getenv("WAKE_WORD_ENGINE")  # "porcupine" / "openwakeword"
+PORCUPINE_ACCESS_KEY = os.getenv("PORCUPINE_ACCESS_KEY")
+WAKE_WORD_MODEL_PATHS = [p for p in os.getenv("WAKE_WORD_MODEL_PATHS", "").split(",") if p]  # .ppn / .onnx 模型路径
+
 # 模型配置
 QWEN_MAX_MODEL = "qwen-max"  # 任务决策推理模型
 QWEN_VL_MODEL = "qwen-vl-plus"  # 视觉理解模型
@@ -13,6 +13,7 @@ from core.action.base import (
 )
 from core.action.speak_action import SpeakAction
 from core.action.listen_action_vad import ListenActionVAD as ListenAction
+from core.action.wake_word_action import WakeWordAction
 from core.action.conversation_action_enhanced import ConversationActionEnhanced as ConversationAction
 
 __all__ = [
@@ -22,5 +23,6 @@ __all__ = [
     "ActionMetadata",
     "SpeakAction",
     "ListenAction",
+    "WakeWordAction",
     "ConversationAction",
 ]
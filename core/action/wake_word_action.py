@@ -0,0 +1,250 @@
+"""WakeWordAction - 本地唤醒词检测 Action
+
+在本地逐帧运行轻量级唤醒词引擎（Porcupine / openWakeWord），
+只有检测到唤醒词后才需要进入 VAD 录音 + ASR 流程，待机时不再调用云端识别
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+from core.action.base import BaseAction, ActionContext, ActionResult, ActionMetadata
+from util.audio import AlsaRecorder
+
+try:
+    import pvporcupine
+except ImportError:
+    pvporcupine = None
+
+try:
+    from openwakeword.model import Model as OpenWakeWordModel
+except ImportError:
+    OpenWakeWordModel = None
+
+
+class WakeWordAction(BaseAction):
+    """本地唤醒词检测 Action
+
+    录音线程持续读取 16kHz int16 帧，通过 loop.call_soon_threadsafe 投递到 asyncio.Queue，
+    协程侧逐帧送入唤醒词引擎（单帧处理 <1ms），检测到唤醒词立即返回
+    """
+
+    def __init__(self):
+        """初始化 WakeWordAction"""
+        super().__init__()
+        self.sample_rate = 16000
+        self.device = None
+        self.engine = None          # "porcupine" / "openwakeword"
+        self.frame_length = 512     # 每帧采样数
+        self.threshold = 0.5        # openWakeWord 置信度阈值
+        self.keywords: List[str] = []
+
+        self._porcupine = None
+        self._oww_model = None
+
+    def get_metadata(self) -> ActionMetadata:
+        """获取 Action 元信息"""
+        return ActionMetadata(
+            name="wake_word",
+            version="1.0.0",
+            description="本地唤醒词检测 Action，检测到唤醒词后再进行语音识别",
+            dependencies=["audio_device", "pvporcupine|openwakeword"],
+            capabilities=["wake_word"],
+            author="Robot Agent Team"
+        )
+
+    def initialize(self, config_dict: Dict[str, Any]) -> None:
+        """初始化唤醒词引擎
+
+        Args:
+            config_dict: 配置参数
+                - engine: "porcupine" / "openwakeword"，默认按已安装的库自动选择
+                - device: 录音设备
+                - access_key: Porcupine AccessKey
+                - keyword_paths: Porcupine 自定义唤醒词模型（.ppn）路径列表
+                - keywords: Porcupine 内置唤醒词列表
+                - model_paths: openWakeWord 模型路径列表
+                - threshold: openWakeWord 置信度阈值
+        """
+        try:
+            print("[WakeWordAction] Initializing...")
+
+            self.device = config_dict.get("device", None)
+            self.threshold = config_dict.get("threshold", self.threshold)
+
+            engine = config_dict.get("engine")
+            if engine is None:
+                engine = "porcupine" if pvporcupine else "openwakeword"
+
+            if engine == "porcupine":
+                if pvporcupine is None:
+                    raise RuntimeError("唤醒词引擎 porcupine 需要安装 pvporcupine: pip install pvporcupine")
+
+                keyword_paths = config_dict.get("keyword_paths")
+                keywords = config_dict.get("keywords")
+                self._porcupine = pvporcupine.create(
+                    access_key=config_dict.get("access_key"),
+                    keyword_paths=keyword_paths,
+                    keywords=None if keyword_paths else keywords
+                )
+                self.sample_rate = self._porcupine.sample_rate
+                self.frame_length = self._porcupine.frame_length
+                self.keywords = list(keyword_paths or keywords or [])
+
+            elif engine == "openwakeword":
+                if OpenWakeWordModel is None:
+                    raise RuntimeError("唤醒词引擎 openwakeword 需要安装 openwakeword: pip install openwakeword")
+
+                model_paths = config_dict.get("model_paths") or []
+                self._oww_model = OpenWakeWordModel(wakeword_models=model_paths)
+                self.frame_length = 1280  # openWakeWord 推荐 80ms 帧
+                self.keywords = list(self._oww_model.models.keys())
+
+            else:
+                raise ValueError(f"Unknown wake word engine: {engine}")
+
+            self.engine = engine
+            self._initialized = True
+            print("[WakeWordAction] Initialization complete")
+            print(f"  Engine: {self.engine}")
+            print(f"  Keywords: {self.keywords}")
+            print(f"  Frame: {self.frame_length} samples @ {self.sample_rate}Hz")
+
+        except Exception as e:
+            print(f"[WakeWordAction] Initialization failed: {e}")
+            raise
+
+    async def execute(self, context: ActionContext) -> ActionResult:
+        """监听直到检测到唤醒词
+
+        Args:
+            context: Action 执行上下文
+                - input_data: 可选的超时时长（秒），默认一直监听
+                - config.stop_check: 可选的无参回调，返回 True 时停止监听
+
+        Returns:
+            ActionResult: output 为 {"detected": bool, "keyword": str | None}
+        """
+        start_time = time.time()
+
+        if not self._initialized:
+            return ActionResult(success=False, error=RuntimeError("WakeWordAction not initialized"))
+
+        timeout = context.input_data if isinstance(context.input_data, (int, float)) else None
+        stop_check = context.config.get("stop_check")
+
+        loop = asyncio.get_running_loop()
+        frames: asyncio.Queue = asyncio.Queue()
+        stop_event = threading.Event()
+        frame_bytes = self.frame_length * 2  # int16
+
+        def read_loop():
+            """录音线程：逐帧读取并投递到事件循环"""
+            recorder = AlsaRecorder(rate=self.sample_rate, channels=1, device=self.device)
+            try:
+                recorder.start()
+                while not stop_event.is_set():
+                    frame = recorder.read(frame_bytes)
+                    if frame:
+                        loop.call_soon_threadsafe(frames.put_nowait, frame)
+            except Exception as e:
+                loop.call_soon_threadsafe(frames.put_nowait, e)
+            finally:
+                recorder.stop()
+                loop.call_soon_threadsafe(frames.put_nowait, None)
+
+        reader = threading.Thread(target=read_loop, name="wake-word-recorder", daemon=True)
+        reader.start()
+
+        keyword = None
+        pending = b""
+
+        try:
+            while True:
+                if stop_check and stop_check():
+                    break
+
+                remaining = None
+                if timeout is not None:
+                    remaining = timeout - (time.time() - start_time)
+                    if remaining <= 0:
+                        break
+
+                # 最多等待 0.5s，保证 stop_check 能及时生效
+                try:
+                    frame = await asyncio.wait_for(
+                        frames.get(), timeout=min(remaining, 0.5) if remaining else 0.5
+                    )
+                except asyncio.TimeoutError:
+                    continue
+
+                if frame is None:
+                    break
+                if isinstance(frame, Exception):
+                    raise frame
+
+                # arecord 可能返回不足一帧的数据，拼接成完整帧再处理
+                pending += frame
+                while len(pending) >= frame_bytes:
+                    pcm = np.frombuffer(pending[:frame_bytes], dtype=np.int16)
+                    pending = pending[frame_bytes:]
+                    keyword = self._process(pcm)
+                    if keyword is not None:
+                        break
+
+                if keyword is not None:
+                    print(f"[WakeWordAction] Wake word detected: {keyword}")
+                    break
+
+            return ActionResult(
+                success=True,
+                output={"detected": keyword is not None, "keyword": keyword},
+                metadata={"elapsed_time": time.time() - start_time, "engine": self.engine}
+            )
+
+        except Exception as e:
+            print(f"[WakeWordAction] Execution failed: {e}")
+            return ActionResult(
+                success=False,
+                error=e,
+                metadata={"elapsed_time": time.time() - start_time}
+            )
+        finally:
+            # 释放录音设备，后续 ListenActionVAD 需要重新打开
+            stop_event.set()
+            await asyncio.to_thread(reader.join, 2.0)
+
+    def _process(self, pcm: np.ndarray) -> Optional[str]:
+        """处理一帧音频
+
+        Args:
+            pcm: int16 单声道采样
+
+        Returns:
+            检测到的唤醒词，未检测到返回 None
+        """
+        if self._porcupine is not None:
+            index = self._porcupine.process(pcm)
+            if index >= 0:
+                return self.keywords[index] if index < len(self.keywords) else str(index)
+            return None
+
+        scores = self._oww_model.predict(pcm)
+        for name, score in scores.items():
+            if score >= self.threshold:
+                self._oww_model.reset()
+                return name
+        return None
+
+    def cleanup(self) -> None:
+        """清理资源"""
+        print("[WakeWordAction] Cleaning up...")
+        if self._porcupine is not None:
+            self._porcupine.delete()
+            self._porcupine = None
+        self._oww_model = None
+        self._initialized = False
+        print("[WakeWordAction] Cleanup complete")
@@ -24,6 +24,7 @@ from core.task import (
     ActionChainExecutor,
     ConversationExecutor
 )
+from util.log_queue import setup_queue_logging, stop_queue_logging
 import config
 
 
@@ -66,6 +67,13 @@ class RobotAgent:
         # 执行器（延迟初始化）
         self._executors_initialized = False
         
+        # 任务完成队列：有等待方的任务进入终态时投递 (task_id, status)，
+        # 由后台消费者统一唤醒 wait_for / wait_any 的等待方
+        self._completion_cq: asyncio.Queue = asyncio.Queue()
+        # task_id -> 等待该任务的 Future 列表（每次 wait_for / wait_any 调用各自一个）
+        self._completion_waiters: Dict[str, List[asyncio.Future]] = {}
+        self._completion_consumer: Optional[asyncio.Task] = None
+        
         print("[Agent] Robot agent initialized in IDLE state")
         print("[Agent] Using unified task loop architecture")
     
@@ -82,6 +90,7 @@ class RobotAgent:
             self._initialize_executors()
         
         self.task_loop.start()
+        self._ensure_completion_consumer()
         self.set_state(AgentState.RESPONDING)
     
     async def stop(self):  # ✅ 改为 async
@@ -90,6 +99,10 @@ class RobotAgent:
         
         self.task_loop.stop()
         
+        if self._completion_consumer:
+            self._completion_consumer.cancel()
+            self._completion_consumer = None
+        
         # ✅ 正确 await 异步清理
         for action_name in list(self.actions.keys()):
             await self.unregister_action(action_name)
@@ -225,6 +238,103 @@ class RobotAgent:
         """获取任务详情"""
         return await self.task_queue.get_by_id(task_id)
     
+    async def wait_for(self, task_id: str, timeout: Optional[float] = None) -> Optional[TaskStatus]:
+        """等待任务进入终态（仅支持通过 submit_task 提交的任务）
+        
+        Args:
+            task_id: 任务ID
+            timeout: 超时时间（秒），None 表示一直等待
+            
+        Returns:
+            Optional[TaskStatus]: 任务终态，超时或任务不存在时返回 None
+        """
+        task = await self.task_queue.get_by_id(task_id)
+        if task is None:
+            return None
+        if task.is_terminal():
+            return task.status
+        
+        future = self._add_completion_waiter(task)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._remove_completion_waiter(task_id, future)
+    
+    async def wait_any(self, task_ids: List[str], timeout: Optional[float] = None) -> Optional[tuple]:
+        """等待任意一个任务进入终态
+        
+        Args:
+            task_ids: 任务ID列表
+            timeout: 超时时间（秒），None 表示一直等待
+            
+        Returns:
+            Optional[tuple]: (task_id, 终态)，超时返回 None
+        """
+        tasks = []
+        for task_id in task_ids:
+            task = await self.task_queue.get_by_id(task_id)
+            if task is None:
+                continue
+            if task.is_terminal():
+                return task_id, task.status
+            tasks.append(task)
+        
+        if not tasks:
+            return None
+        
+        futures = {self._add_completion_waiter(task): task.task_id for task in tasks}
+        try:
+            done, _ = await asyncio.wait(futures, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for future, task_id in futures.items():
+                self._remove_completion_waiter(task_id, future)
+        if not done:
+            return None
+        
+        future = done.pop()
+        return futures[future], future.result()
+    
+    def _ensure_completion_consumer(self) -> None:
+        """确保完成队列消费者在运行"""
+        if self._completion_consumer is None or self._completion_consumer.done():
+            self._completion_consumer = asyncio.create_task(self._consume_completions())
+    
+    def _add_completion_waiter(self, task: UnifiedTask) -> asyncio.Future:
+        """为任务登记一个完成 Future
+        
+        只有登记了等待方的任务才会注入完成队列，无人等待的任务进入终态时不投递事件
+        """
+        self._ensure_completion_consumer()
+        task.completion_queue = self._completion_cq
+        
+        future = asyncio.get_running_loop().create_future()
+        self._completion_waiters.setdefault(task.task_id, []).append(future)
+        return future
+    
+    def _remove_completion_waiter(self, task_id: str, future: asyncio.Future) -> None:
+        """移除等待方（超时或已完成），避免被放弃的 Future 堆积"""
+        waiters = self._completion_waiters.get(task_id)
+        if not waiters:
+            return
+        if future in waiters:
+            waiters.remove(future)
+        if not waiters:
+            del self._completion_waiters[task_id]
+    
+    async def _consume_completions(self) -> None:
+        """消费完成队列：一次唤醒处理队列中积压的全部完成事件"""
+        while True:
+            completions = [await self._completion_cq.get()]
+            while not self._completion_cq.empty():
+                completions.append(self._completion_cq.get_nowait())
+            
+            for task_id, status in completions:
+                for future in self._completion_waiters.pop(task_id, ()):
+                    if not future.done():
+                        future.set_result(status)
+    
     async def cancel_task(self, task_id: str) -> bool:
         """取消任务"""
         cancelled = await self.task_queue.cancel(task_id)
@@ -238,6 +348,7 @@ class RobotAgent:
 # 示例主函数
 async def main():
     """主函数示例"""
+    setup_queue_logging()
     agent = RobotAgent()
     
     agent.register_action("speak", SpeakAction())
@@ -246,6 +357,7 @@ async def main():
     
     await asyncio.sleep(300)
     await agent.stop()
+    stop_queue_logging()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@
 """
 
 from core.mcp_control.connection import McpConnection, ConnectionState
+from core.mcp_control.connection_pool import McpConnectionPool
 from core.mcp_control.manager import McpManager
 from core.mcp_control.router import McpRouter, RouterDecision, RouterContext
 from core.mcp_control.tool_index import ToolIndex, ToolIndexEntry
@@ -16,6 +17,7 @@ __all__ = [
     # Connection
     "McpConnection",
     "ConnectionState",
+    "McpConnectionPool",
     # Manager
     "McpManager",
     # Router
@@ -0,0 +1,76 @@
+# core/mcp_control/connection_pool.py
+"""MCP 连接池
+
+McpManager 为每个 MCP Server 建立一个长连接，并持有 connections 对应的连接池，
+所有 McpExecutor 共享；连接池负责调用前的状态检查与断线后的惰性重连
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+
+class McpConnectionPool:
+    """MCP 连接池（由 McpManager 持有）
+
+    连接处于 READY 状态时直接返回，无需加锁；
+    否则在该 Server 的锁内重连（并发调用方共享同一次重连），两次重连尝试之间至少间隔 reconnect_interval 秒
+    """
+
+    def __init__(self, connections: Dict[str, Any], reconnect_interval: float = 5.0):
+        """初始化连接池
+
+        Args:
+            connections: server_id -> McpConnection 的字典（与 McpManager 共享）
+            reconnect_interval: 同一 Server 两次重连尝试的最小间隔（秒），默认5秒
+        """
+        self.connections = connections
+        self.reconnect_interval = reconnect_interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # server_id -> 上次重连尝试时间（time.monotonic()）
+        self._last_reconnect: Dict[str, float] = {}
+
+    @staticmethod
+    def is_ready(connection: Any) -> bool:
+        """连接是否可用（没有 state 属性的连接视为可用）"""
+        state = getattr(connection, "state", None)
+        return state is None or getattr(state, "value", state) == "ready"
+
+    async def get(self, server_id: str) -> Optional[Any]:
+        """获取可用连接
+
+        连接不可用时尝试重连；重连失败或处于重连间隔内时仍返回原连接，
+        由 call_tool 返回 "Connection not ready" 错误
+
+        Args:
+            server_id: MCP Server ID
+
+        Returns:
+            连接对象，server_id 不存在时返回 None
+        """
+        connection = self.connections.get(server_id)
+        if connection is None or self.is_ready(connection):
+            return connection
+
+        lock = self._locks.get(server_id)
+        if lock is None:
+            lock = self._locks[server_id] = asyncio.Lock()
+
+        async with lock:
+            # 等待期间其他调用方可能已完成重连
+            if self.is_ready(connection):
+                return connection
+
+            now = time.monotonic()
+            if now - self._last_reconnect.get(server_id, float("-inf")) < self.reconnect_interval:
+                return connection
+            self._last_reconnect[server_id] = now
+
+            reconnect = getattr(connection, "reconnect", None)
+            if reconnect is not None:
+                print(f"[McpConnectionPool] Connection {server_id} not ready, reconnecting...")
+                try:
+                    await reconnect()
+                except Exception as e:
+                    print(f"[McpConnectionPool] Reconnect {server_id} failed: {e}")
+
+        return connection
@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional
 
 from core.mcp_control.protocols import LLMClientProtocol
 from core.mcp_control.connection import McpConnection
+from core.mcp_control.connection_pool import McpConnectionPool
 from core.mcp_control.tool_index import ToolIndex
 from core.mcp_control.router import McpRouter
 
@@ -74,6 +75,9 @@ MCP Manager - MCP Controller 的门面类
         else:
             print(f"[McpManager] Successfully connected to {len(self.connections)} server(s)")
         
+        # 连接池：所有 McpExecutor 共享，调用前检查连接状态并惰性重连
+        self.connection_pool = McpConnectionPool(self.connections)
+        
         # 3. 初始化 Tool Index
         print("[McpManager] Initializing Tool Index...")
         self.tool_index = ToolIndex()
@@ -38,6 +38,8 @@ class ToolIndex:
         self.version = "1.0.0"
         self.tools: Dict[str, ToolIndexEntry] = {}  # tool_name -> ToolIndexEntry
         self.last_sync: Optional[str] = None
+        # 工具列表修订号：每次同步 / 加载 / 注册工具后递增，调用方可据此判断工具列表是否变化
+        self.revision = 0
         print("[ToolIndex] Initialized")
 
         # 👇 新增：本地工具实例注册表
@@ -65,6 +67,7 @@ class ToolIndex:
         )
         self.tools[rag_entry.tool_name] = rag_entry
         self.local_tool_instances[rag_entry.tool_name] = rag_tool  # 👈 注册实例
+        self.revision += 1
         print(f"[ToolIndex] Local tool registered: {rag_entry.tool_name}")
         
     # 👇 新增：获取本地工具实例
@@ -134,6 +137,7 @@ class ToolIndex:
                 server_stats.append({"server_id": server_id, "status": "error", "tools": 0, "error": str(e)})
         
         self.last_sync = datetime.now().isoformat()
+        self.revision += 1
         
         # 输出汇总信息
         successful_servers = sum(1 for s in server_stats if s["status"] == "success")
@@ -244,6 +248,7 @@ class ToolIndex:
                         cost_estimate=tool_data.get("cost_estimate", "medium")
                     )
                     self.tools[entry.tool_name] = entry
+            self.revision += 1
             
             print(f"[ToolIndex] Loaded {len(self.tools)} tools from {path}")
             if self.last_sync:
@@ -254,7 +254,7 @@ class TaskDispatcher:
                             "metadata": {
                                 "task_id": mcp_task_id,
                                 "steps": task_detail.execution_data.get("current_step", 0),
-                                "history": task_detail.history
+                                "history": [dict(entry) for entry in task_detail.history]
                             }
                         }
                     else:
@@ -269,7 +269,7 @@ class TaskDispatcher:
                             "metadata": {
                                 "task_id": mcp_task_id,
                                 "status": task_detail.status.value,
-                                "history": task_detail.history
+                                "history": [dict(entry) for entry in task_detail.history]
                             }
                         }
             
@@ -1,6 +1,7 @@
 # core/task/executors/action_chain.py
 """Action链执行器"""
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List
 from core.task.executors.base import BaseTaskExecutor
 from core.task.models import UnifiedTask, TaskStatus
 
@@ -12,8 +13,13 @@ class ActionChainExecutor(BaseTaskExecutor):
     """Action链执行器
     
     按顺序执行多个Action，支持数据传递和错误中断
+    
+    execution_data 可选 parallel_groups (List[List[str]])：
+    组内Action并发执行，组间按顺序执行
     """
     
+    __slots__ = ("agent",)
+    
     def __init__(self, agent: 'RobotAgent'):
         """初始化Action链执行器
         
@@ -25,11 +31,29 @@ class ActionChainExecutor(BaseTaskExecutor):
     
     async def validate(self, task: UnifiedTask) -> bool:
         """验证任务参数"""
-        if not await super().validate(task):
-            return False
+        execution_data = task.execution_data
+        return self._validate(
+            task,
+            execution_data.get("action_names", []),
+            execution_data.get("parallel_groups")
+        )
+    
+    def _validate(self, task: UnifiedTask, action_names: List[str], parallel_groups: List[List[str]] = None) -> bool:
+        """使用已提取的参数验证任务（纯同步检查，execute中直接调用无需await）
         
+        Args:
+            task: 任务对象
+            action_names: execution_data中的action_names
+            parallel_groups: execution_data中的parallel_groups
+        """
+        # 分组模式下校验所有组内的Action
+        if parallel_groups:
+            if not isinstance(parallel_groups, list) or not all(isinstance(g, list) for g in parallel_groups):
+                self._log(task, "parallel_groups must be a list of lists", "ERROR")
+                return False
+            action_names = [name for group in parallel_groups for name in group]
+
         # 验证action_names
-        action_names = task.execution_data.get("action_names", [])
         if not action_names:
             self._log(task, "No action_names provided", "ERROR")
             return False
@@ -38,11 +62,12 @@ class ActionChainExecutor(BaseTaskExecutor):
             self._log(task, "action_names must be a list", "ERROR")
             return False
         
-        # 验证所有Action已注册
-        for action_name in action_names:
-            if action_name not in self.agent.actions:
-                self._log(task, f"Action '{action_name}' not registered", "ERROR")
-                return False
+        # 验证所有Action已注册（一次性报告全部未注册的Action）
+        actions = self.agent.actions
+        missing = [name for name in action_names if name not in actions]
+        if missing:
+            self._log(task, f"Unregistered actions: {missing}", "ERROR")
+            return False
         
         return True
     
@@ -57,23 +82,31 @@ class ActionChainExecutor(BaseTaskExecutor):
         5. 记录所有Action的执行结果
         """
         try:
+            # 获取参数（只读取一次execution_data）
+            execution_data = task.execution_data
+            action_names = execution_data.get("action_names", [])
+            parallel_groups = execution_data.get("parallel_groups")
+            initial_input = execution_data.get("initial_input")
+            
             # 验证参数
-            if not await self.validate(task):
+            if not self._validate(task, action_names, parallel_groups):
                 task.transition_to(TaskStatus.FAILED, "Validation failed")
                 return
             
-            # 获取参数
-            action_names = task.execution_data.get("action_names", [])
-            initial_input = task.execution_data.get("initial_input")
+            # 分组并发模式
+            if parallel_groups:
+                await self._execute_parallel_groups(task, parallel_groups, initial_input)
+                return
             
-            self._log(task, f"Starting action chain with {len(action_names)} actions")
+            len_actions = len(action_names)
+            self._log(task, f"Starting action chain with {len_actions} actions")
             
             # 执行Action链
             results = []
             current_input = initial_input
             
-            for i, action_name in enumerate(action_names):
-                self._log(task, f"Executing action {i+1}/{len(action_names)}: {action_name}")
+            for i, action_name in enumerate(action_names, 1):
+                self._log(task, f"Executing action {i}/{len_actions}: {action_name}")
                 
                 # 执行Action
                 result = await self.agent.execute_action(action_name, current_input)
@@ -110,3 +143,79 @@ class ActionChainExecutor(BaseTaskExecutor):
             
         except Exception as e:
             await self.handle_error(task, e)
+    
+    async def _execute_parallel_groups(self, task: UnifiedTask, parallel_groups: List[List[str]], initial_input: Any = None) -> None:
+        """分组并发执行Action
+        
+        组内Action通过asyncio.gather并发执行，组间按顺序执行；
+        上一组的输出（action名 -> output 的字典）作为下一组的输入
+        
+        Args:
+            task: 任务对象
+            parallel_groups: Action分组列表
+            initial_input: 第一组的输入
+        """
+        len_groups = len(parallel_groups)
+        self._log(task, f"Starting action chain with {len_groups} parallel groups")
+        
+        results = []
+        current_input = initial_input
+        
+        for i, group in enumerate(parallel_groups, 1):
+            self._log(task, f"Executing group {i}/{len_groups}: {group}")
+            
+            # return_exceptions=True：单个Action异常不会中途取消同组其他Action
+            group_results = await asyncio.gather(
+                *(self.agent.execute_action(action_name, current_input) for action_name in group),
+                return_exceptions=True
+            )
+            
+            group_output: Dict[str, Any] = {}
+            failed_action = None
+            
+            for action_name, result in zip(group, group_results):
+                if isinstance(result, BaseException):
+                    results.append({
+                        "action": action_name,
+                        "success": False,
+                        "output": None,
+                        "error": str(result)
+                    })
+                    self._log(task, f"Action '{action_name}' raised: {result}", "ERROR")
+                    failed_action = failed_action or action_name
+                    continue
+                
+                results.append({
+                    "action": action_name,
+                    "success": result.success,
+                    "output": result.output,
+                    "error": str(result.error) if result.error else None
+                })
+                
+                if not result.success:
+                    self._log(task, f"Action '{action_name}' failed: {result.error}", "ERROR")
+                    failed_action = failed_action or action_name
+                    continue
+                
+                group_output[action_name] = result.output
+            
+            # 同组全部记录后再中断
+            if failed_action:
+                task.result = {
+                    "success": False,
+                    "stopped_at": failed_action,
+                    "results": results
+                }
+                task.transition_to(TaskStatus.FAILED, f"Action '{failed_action}' failed")
+                return
+            
+            current_input = group_output
+        
+        task.result = {
+            "success": True,
+            "results": results,
+            "final_output": current_input
+        }
+        
+        self._log(task, f"Action chain completed successfully")
+        task.transition_to(TaskStatus.COMPLETED, "All action groups completed")
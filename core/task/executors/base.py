@@ -1,20 +1,83 @@
 # core/task/executors/base.py
 """任务执行器基类"""
+import itertools
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from core.task.models import UnifiedTask, TaskStatus
 
+logger = logging.getLogger("executor")
+
+# 任务历史中的级别字符串 -> logging 级别
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+# 日志条目全局序号（用于排序，比比较时间戳更可靠且无需系统调用）
+_log_seq = itertools.count()
+
+
+class LogEntry:
+    """执行器写入 task.history 的日志条目
+    
+    使用 __slots__ 代替每条日志一个字典，减少内存占用与分配开销；
+    提供 get / [] / keys 以兼容按字典读取历史记录的代码，
+    dict(entry) 即可得到普通字典用于序列化；seq 为全局递增序号
+    """
+    __slots__ = ("seq", "timestamp", "event", "level", "message", "executor")
+    
+    def __init__(self, timestamp: float, level: str, message: str, executor: str, event: str = "log"):
+        self.seq = next(_log_seq)
+        self.timestamp = timestamp
+        self.event = event
+        self.level = level
+        self.message = message
+        self.executor = executor
+    
+    def keys(self) -> tuple:
+        return self.__slots__
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+    
+    def asdict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {key: getattr(self, key) for key in self.__slots__}
+    
+    def __repr__(self) -> str:
+        return f"LogEntry({self.asdict()!r})"
 
 class BaseTaskExecutor(ABC):
     """任务执行器抽象基类
     
     所有任务执行器必须继承此类并实现相应的抽象方法
+    （子类可声明 __slots__ 以去掉实例 __dict__）
     """
     
+    __slots__ = ("_name", "_mcp_tool_index")
+    
     def __init__(self):
         """初始化执行器"""
         self._name = self.__class__.__name__
-        print(f"[{self._name}] Initialized")
+        self._mcp_tool_index = None  # 见 _get_mcp_tool_index
+        logger.info("[%s] Initialized", self._name)
     
     @abstractmethod
     async def execute(self, task: UnifiedTask) -> None:
@@ -30,9 +93,22 @@ class BaseTaskExecutor(ABC):
         """
         pass
     
+    def _get_mcp_tool_index(self):
+        """获取 agent 上 MCP Manager 的工具索引（供持有 agent 的执行器使用）
+        
+        获取到后缓存；MCP Manager 可能在执行器创建后才注入，未获取到时返回 None，下次调用再解析
+        """
+        if self._mcp_tool_index is None:
+            mcp_manager = getattr(getattr(self, "agent", None), "mcp_manager", None)
+            self._mcp_tool_index = mcp_manager.tool_index if mcp_manager else None
+        return self._mcp_tool_index
+    
     async def validate(self, task: UnifiedTask) -> bool:
         """验证任务参数（可选重写）
         
+        execution_data 为 None 已在 UnifiedTask 构造时拒绝，这里拒绝空的 execution_data；
+        子类校验了必需字段时（空字典必然缺少该字段）无需再调用基类
+        
         Args:
             task: 要验证的任务
             
@@ -41,7 +117,7 @@ class BaseTaskExecutor(ABC):
         """
         # 基础验证
         if not task.execution_data:
-            print(f"[{self._name}] Task {task.task_id[:8]} has no execution_data")
+            logger.warning("%s Task %s has no execution_data", self._name, task.short_id)
             return False
         
         return True
@@ -53,7 +129,7 @@ class BaseTaskExecutor(ABC):
             task: 发生错误的任务
             error: 错误对象
         """
-        print(f"[{self._name}] Error handling task {task.task_id[:8]}: {error}")
+        logger.error("%s Error handling task %s: %s", self._name, task.short_id, error)
         task.result = {"error": str(error), "error_type": type(error).__name__}
         task.transition_to(TaskStatus.FAILED, f"Error: {str(error)}")
     
@@ -65,14 +141,7 @@ class BaseTaskExecutor(ABC):
             message: 日志消息
             level: 日志级别
         """
-        from datetime import datetime
-        
-        task.history.append({
-            "timestamp": datetime.now().timestamp(),
-            "event": "log",
-            "level": level,
-            "message": message,
-            "executor": self._name
-        })
+        task.history.append(LogEntry(time.time(), level, message, self._name))
         
-        print(f"[{self._name}:{level}] Task {task.task_id[:8]} - {message}")
+        # 惰性 % 格式化：级别未启用时不构建字符串
+        logger.log(LEVELS.get(level, logging.INFO), "%s Task %s - %s", self._name, task.short_id, message)
@@ -1,15 +1,96 @@
 # core/task/executors/conversation.py
 """ConversationExecutor - 智能对话任务执行器"""
 
-from typing import TYPE_CHECKING, Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Callable, Final
 from core.task.executors.base import BaseTaskExecutor
 from core.task.models import UnifiedTask, TaskStatus, TaskType
+from config import build_analyze_prompt
+from util import fast_json
+from util.sentence_buffer import SentenceBuffer
 import asyncio
+import operator
 
 if TYPE_CHECKING:
     from core.agent import RobotAgent
 
 
+# 工具输出格式化时的摘要截断长度
+_SNIPPET_MAX: Final = 150
+_ITEM_SNIPPET_MAX: Final = 100
+
+# 列表分支中已确认存在 title 字段，直接用 itemgetter 取值
+_title_get = operator.itemgetter("title")
+
+# 融合工具结果回复的系统提示（固定不变，用户问题与工具结果放在 user 消息中，便于命中 LLM 前缀缓存）
+_FINAL_SYSTEM_PROMPT: Final = """你是一个友好的智能助手。
+请根据用户问题和工具返回的信息，用简洁、自然、口语化的中文回复用户（2-3句话，总结关键信息）。
+如果是新闻或搜索结果，简要概括前几条即可。"""
+
+
+def _fmt_list(tool_output: list) -> str:
+    """格式化列表输出（搜索结果取前3条，其余取前5项）"""
+    if tool_output and isinstance(tool_output[0], dict):
+        # 提取关键信息（如标题、摘要）
+        return "\n".join(
+            f"{i}. {_title_get(item)} - {item.get('snippet', '')[:_ITEM_SNIPPET_MAX]}"
+            if "title" in item else f"{i}. {str(item)[:_ITEM_SNIPPET_MAX]}"
+            for i, item in enumerate(tool_output[:3], 1)
+        )
+    return "\n".join(str(item) for item in tool_output[:5])
+
+
+def _fmt_dict(tool_output: dict) -> Any:
+    """格式化字典输出（仅处理 query + results 结构，其他原样返回）"""
+    if "query" not in tool_output or "results" not in tool_output:
+        return tool_output
+    
+    results = tool_output["results"]
+    if not results:
+        return "未找到相关结果"
+    
+    return "\n\n".join(
+        f"{i}. {r.get('title', '')}\n   {r.get('snippet', '')[:_SNIPPET_MAX]}"
+        for i, r in enumerate(results[:3], 1)
+    )
+
+
+_FORMATTERS: Dict[type, Callable[[Any], Any]] = {
+    list: _fmt_list,
+    dict: _fmt_dict,
+}
+
+
+def _format_tool_output(tool_output: Any) -> Any:
+    """按类型分派格式化工具输出（列表、字典以外的类型原样返回）"""
+    fmt = _FORMATTERS.get(type(tool_output))
+    return fmt(tool_output) if fmt else tool_output
+
+
+def _extract_tool_output(mcp_result: Dict) -> Any:
+    """从 MCP 任务结果中提取并格式化工具输出（纯同步，可放到线程中执行）"""
+    tool_output = None
+    
+    # 尝试多种路径获取实际结果
+    if "final_result" in mcp_result:
+        tool_output = mcp_result["final_result"]
+    elif "result" in mcp_result:
+        tool_output = mcp_result["result"]
+    elif "step_results" in mcp_result and mcp_result["step_results"]:
+        # 如果有步骤结果，取最后一个
+        last_step = mcp_result["step_results"][-1]
+        tool_output = last_step.get("result")
+    
+    # 如果 tool_output 是嵌套字典，继续提取
+    if isinstance(tool_output, dict):
+        if "result" in tool_output:
+            tool_output = tool_output["result"]
+        elif "content" in tool_output:
+            tool_output = tool_output["content"]
+    
+    # 格式化输出（处理列表、字典等）
+    return _format_tool_output(tool_output)
+
+
 class ConversationExecutor(BaseTaskExecutor):
     """智能对话执行器
     
@@ -21,17 +102,24 @@ class ConversationExecutor(BaseTaskExecutor):
     5. 语音播报
     """
     
+    __slots__ = (
+        "agent",
+        "llm_client",
+        "conversation_history",
+        "max_history_length",
+        "_speak_tasks",
+    )
+    
     def __init__(self, agent: 'RobotAgent', llm_client):
         super().__init__()
         self.agent = agent
         self.llm_client = llm_client
         self.conversation_history = []
         self.max_history_length = 10
+        # 正在后台播报的 TTS 任务（持有引用，防止被回收）
+        self._speak_tasks = set()
     
     async def validate(self, task: UnifiedTask) -> bool:
-        if not await super().validate(task):
-            return False
-        
         user_text = task.execution_data.get("user_text")
         if not user_text:
             self._log(task, "No user_text provided", "ERROR")
@@ -56,6 +144,9 @@ class ConversationExecutor(BaseTaskExecutor):
             response_text = intent_result.get("response", "")
             task_info = intent_result.get("task_info")
             
+            # 流式生成回复时由逐句播报任务负责播报
+            speak_task = None
+            
             # 2. 判断是否需要 MCP 工具
             if intent_type == "task_request" and task_info:
                 executor_type = task_info.get("executor_type")
@@ -67,17 +158,34 @@ class ConversationExecutor(BaseTaskExecutor):
                     mcp_result = await self._call_mcp_tool(task_info)
                     
                     if mcp_result.get("success"):
-                        # 融合 MCP 结果生成回复
-                        response_text = await self._generate_final_response(
-                            user_text, 
-                            mcp_result
-                        )
+                        # 融合 MCP 结果流式生成回复，边生成边逐句播报
+                        sentence_queue: asyncio.Queue = asyncio.Queue()
+                        speak_task = asyncio.create_task(self._speak_sentences(sentence_queue))
+                        try:
+                            response_text = await self._generate_final_response(
+                                user_text, 
+                                mcp_result,
+                                sentence_queue
+                            )
+                        except BaseException:
+                            # 生成失败时取消逐句播报，并交由回调收尾，避免任务悬空
+                            speak_task.cancel()
+                            self._speak_tasks.add(speak_task)
+                            speak_task.add_done_callback(lambda t: self._on_speak_done(task, t))
+                            raise
                     else:
                         response_text = f"抱歉，执行任务时出错了：{mcp_result.get('error', '未知错误')}"
             
-            # 3. 语音播报
+            # 3. 语音播报（默认后台播报，不阻塞任务完成；await_speak=True 时等待播报结束）
             self._log(task, f"Bot: {response_text}")
-            await self._speak(response_text)
+            await_speak = task.execution_data.get("await_speak", False)
+            if speak_task is None:
+                speak_task = asyncio.create_task(self._speak(response_text))
+            if await_speak:
+                await speak_task
+            else:
+                self._speak_tasks.add(speak_task)
+                speak_task.add_done_callback(lambda t: self._on_speak_done(task, t))
             
             # 4. 更新对话历史
             self.conversation_history.append({"role": "user", "content": user_text})
@@ -91,7 +199,8 @@ class ConversationExecutor(BaseTaskExecutor):
                 "success": True,
                 "user_input": user_text,
                 "bot_response": response_text,
-                "used_mcp": executor_type == "mcp" if task_info else False
+                "used_mcp": executor_type == "mcp" if task_info else False,
+                "speak_pending": not await_speak
             }
             
             task.transition_to(TaskStatus.COMPLETED, "Conversation completed")
@@ -101,13 +210,11 @@ class ConversationExecutor(BaseTaskExecutor):
     
     async def _analyze_intent(self, user_text: str) -> Dict[str, Any]:
         """意图分析"""
-        from config import build_analyze_prompt
-        
         # 获取 MCP 工具列表
-        mcp_tools = []
-        if hasattr(self.agent, 'mcp_manager') and self.agent.mcp_manager:
-            all_tools = self.agent.mcp_manager.tool_index.get_all_tools()
-            mcp_tools = [(tool.tool_name, tool.description) for tool in all_tools]
+        tool_index = self._get_mcp_tool_index()
+        mcp_tools = [
+            (tool.tool_name, tool.description) for tool in tool_index.get_all_tools()
+        ] if tool_index else []
         
         prompt = build_analyze_prompt(
             available_actions=[("speak", "语音播报", ["tts"])],
@@ -125,8 +232,7 @@ class ConversationExecutor(BaseTaskExecutor):
             response_format={"type": "json_object"}
         )
         
-        import json
-        return json.loads(response)
+        return await asyncio.to_thread(fast_json.loads, response)
 
     async def _call_mcp_tool(self, task_info: Dict) -> Dict[str, Any]:
         """调用 MCP 工具"""
@@ -147,15 +253,12 @@ class ConversationExecutor(BaseTaskExecutor):
             context=context
         )
         
-        # 提交并等待
+        # 提交并等待完成通知
         task_id = await self.agent.submit_task(mcp_task)
         
-        max_wait = 60
-        waited = 0
+        task_status = await self.agent.wait_for(task_id, timeout=60)
         
-        while waited < max_wait:
-            task_status = await self.agent.get_task_status(task_id)
-            
+        if task_status is not None:
             if task_status == TaskStatus.COMPLETED:
                 task_detail = await self.agent.get_task_detail(task_id)
                 
@@ -188,84 +291,79 @@ class ConversationExecutor(BaseTaskExecutor):
                 
                 return {"success": False, "error": error_msg}
             
-            await asyncio.sleep(1)
-            waited += 1
+            return {"success": False, "error": f"Task {task_status.value}"}
         
         return {"success": False, "error": "Timeout"}
     
-    async def _generate_final_response(self, user_text: str, mcp_result: Dict) -> str:
-        """融合 MCP 结果生成回复"""
+    async def _generate_final_response(self, user_text: str, mcp_result: Dict,
+                                       sentence_queue: asyncio.Queue = None) -> str:
+        """融合 MCP 结果生成回复（流式）
         
-        # 👇 修复：更智能地提取工具输出
-        tool_output = None
+        Args:
+            user_text: 用户输入
+            mcp_result: MCP 任务结果
+            sentence_queue: 可选的播报队列，每凑够一句即放入，结束时放入 None
+            
+        Returns:
+            str: 完整回复文本
+        """
         
-        # 尝试多种路径获取实际结果
-        if "final_result" in mcp_result:
-            tool_output = mcp_result["final_result"]
-        elif "result" in mcp_result:
-            tool_output = mcp_result["result"]
-        elif "step_results" in mcp_result and mcp_result["step_results"]:
-            # 如果有步骤结果，取最后一个
-            last_step = mcp_result["step_results"][-1]
-            tool_output = last_step.get("result")
+        # 提取并格式化工具输出（搜索结果可能较大，放到线程中避免阻塞事件循环）
+        tool_output = await asyncio.to_thread(_extract_tool_output, mcp_result)
         
-        # 如果 tool_output 是嵌套字典，继续提取
-        if isinstance(tool_output, dict):
-            if "result" in tool_output:
-                tool_output = tool_output["result"]
-            elif "content" in tool_output:
-                tool_output = tool_output["content"]
+        messages = [
+            {"role": "system", "content": _FINAL_SYSTEM_PROMPT},
+            {"role": "user", "content": f"用户问题：\"{user_text}\"\n\n工具返回的信息：\n{tool_output}"}
+        ]
         
-        # 格式化输出（处理列表、字典等）
-        if isinstance(tool_output, list):
-            # 如果是搜索结果列表
-            if tool_output and isinstance(tool_output[0], dict):
-                # 提取关键信息（如标题、摘要）
-                formatted_output = []
-                for i, item in enumerate(tool_output[:3], 1):  # 只取前3条
-                    if "title" in item:
-                        formatted_output.append(f"{i}. {item.get('title', '')} - {item.get('snippet', '')[:100]}")
-                    else:
-                        formatted_output.append(f"{i}. {str(item)[:100]}")
-                tool_output = "\n".join(formatted_output)
-            else:
-                tool_output = "\n".join(str(item) for item in tool_output[:5])
-        elif isinstance(tool_output, dict):
-            # 如果是字典，尝试提取 query 和 results
-            if "query" in tool_output and "results" in tool_output:
-                results = tool_output["results"]
-                if results:
-                    formatted_results = []
-                    for i, r in enumerate(results[:3], 1):
-                        title = r.get("title", "")
-                        snippet = r.get("snippet", "")
-                        formatted_results.append(f"{i}. {title}\n   {snippet[:150]}")
-                    tool_output = "\n\n".join(formatted_results)
-                else:
-                    tool_output = "未找到相关结果"
+        parts = []
+        sentence_buffer = SentenceBuffer()
+        try:
+            async for delta in self.llm_client.chat_completion_stream(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=200
+            ):
+                parts.append(delta)
+                if sentence_queue is not None:
+                    for sentence in sentence_buffer.feed(delta):
+                        sentence_queue.put_nowait(sentence)
+        finally:
+            if sentence_queue is not None:
+                rest = sentence_buffer.flush()
+                if rest:
+                    sentence_queue.put_nowait(rest)
+                sentence_queue.put_nowait(None)
         
-        system_prompt = f"""你是一个友好的智能助手。
-
-    用户问题："{user_text}"
-
-    工具返回的信息：
-    {tool_output}
-
-    请用简洁、自然、口语化的中文回复用户（2-3句话，总结关键信息）。
-    如果是新闻或搜索结果，简要概括前几条即可。"""
+        return "".join(parts)
+    
+    def _on_speak_done(self, task: UnifiedTask, speak_task: asyncio.Task) -> None:
+        """后台播报结束回调：更新任务结果并记录日志"""
+        self._speak_tasks.discard(speak_task)
         
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_text}
-        ]
+        if speak_task.cancelled():
+            spoken = False
+            self._log(task, "Speak cancelled", "WARNING")
+        elif speak_task.exception():
+            spoken = False
+            self._log(task, f"Speak failed: {speak_task.exception()}", "ERROR")
+        else:
+            spoken = speak_task.result()
         
-        response = await self.llm_client.chat_completion(
-            messages=messages,
-            temperature=0.7,
-            max_tokens=200
-        )
+        if isinstance(task.result, dict):
+            task.result["speak_pending"] = False
+            task.result["spoken"] = spoken
+    
+    async def _speak_sentences(self, sentence_queue: asyncio.Queue) -> bool:
+        """按顺序播报队列中的句子，直到收到 None
         
-        return response
+        Returns:
+            bool: 所有句子是否都播报成功
+        """
+        success = True
+        while (sentence := await sentence_queue.get()) is not None:
+            success = await self._speak(sentence) and success
+        return success
     
     async def _speak(self, text: str) -> bool:
         """播报语音"""
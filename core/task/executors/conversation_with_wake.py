@@ -2,18 +2,56 @@
 """ConversationExecutor with Wake Word - 带唤醒词的对话执行器"""
 
 from typing import TYPE_CHECKING, Dict, Any, Optional, Callable
-from core.task.executors.base import BaseTaskExecutor
+from core.task.executors.base import BaseTaskExecutor, LogEntry
 from core.task.models import UnifiedTask, TaskStatus, TaskType
+from core.action.base import ActionContext
 from core.action.listen_action_vad import ListenActionVAD, VADPresets
+from core.action.wake_word_action import WakeWordAction
+from util.keyword_matcher import KeywordMatcher
+from util import fast_json
+from util.sentence_buffer import SentenceBuffer
+from config import build_analyze_prompt
 import asyncio
+import itertools
+import logging
+import re
 import time
+from collections import deque
 
 if TYPE_CHECKING:
     from core.agent import RobotAgent
 
+logger = logging.getLogger("conversation_with_wake")
+
+
+# 结束对话的关键词
+GOODBYE_KEYWORDS = (
+    "再见", "拜拜", "byebye", "goodbye", "886",
+    "结束", "停止", "退出", "你退下吧"
+)
+
+# 闲聊短句（仅问候、致谢），整句匹配时跳过意图分析，直接闲聊回复；
+# 不包含"好的""可以"等应答词：它们可能是对助手确认提问（如"要打开客厅灯吗？"）的回答，需要走意图分析
+_CHITCHAT_RE = re.compile(
+    r"(?:你好|您好|嗨|哈喽|hello|hi|早上好|中午好|下午好|晚上好|晚安"
+    r"|谢谢你?|多谢|感谢|辛苦了)"
+    r"[啊呀呢吧啦哦]?[\s。！？!?~～，,.]*",
+    re.IGNORECASE
+)
+
+# 闲聊回复的系统提示（不包含工具列表）
+_CHAT_SYSTEM_PROMPT = "你是一个友好的语音助手，名字叫小狐狸。请用简短、自然、口语化的中文回复（1-2句话）。"
+
+# 融合工具结果回复的系统提示（固定不变，用户问题与工具结果放在 user 消息中，便于命中 LLM 前缀缓存）
+_FINAL_SYSTEM_PROMPT = """你是一个友好的智能助手。
+请根据用户问题和工具返回的信息，用简洁、自然、口语化的中文回复用户（2-3句话，总结关键信息）。
+如果是新闻或搜索结果，简要概括前几条即可。"""
+
 
 class ConversationState:
     """对话状态"""
+    __slots__ = ()
+    
     WAITING_WAKE = "waiting_wake"      # 等待唤醒
     CONVERSING = "conversing"          # 对话中
     IDLE = "idle"                      # 闲置（无语音）
@@ -28,11 +66,39 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
     3. 对话结束（再见/超时）后回到待机
     """
     
+    __slots__ = (
+        "agent",
+        "llm_client",
+        "wake_words",
+        "_wake_matcher",
+        "_goodbye_matcher",
+        "idle_timeout",
+        "max_idle_rounds",
+        "state_callback",
+        "max_history_length",
+        "conversation_history",
+        "max_messages",
+        "messages",
+        "_cb_queue",
+        "_cb_dispatcher",
+        "_cb_coalesce_window",
+        "_cached_prompt",
+        "_cached_tools_key",
+        "listen_action",
+        "wake_word_action",
+        "current_state",
+        "running",
+        "_start_event",
+        "listening_active",
+        "total_conversations",
+    )
+    
     def __init__(self, agent: 'RobotAgent', llm_client, 
                  wake_words: list = None,
                  idle_timeout: float = 30.0,
                  max_idle_rounds: int = 2,
-                 state_callback: Optional[Callable] = None):
+                 state_callback: Optional[Callable] = None,
+                 wake_word_config: Optional[Dict[str, Any]] = None):
         """初始化
         
         Args:
@@ -42,58 +108,109 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
             idle_timeout: 对话时无语音超时（秒）
             max_idle_rounds: 最大无语音轮数
             state_callback: 状态回调函数 (state, data) -> None
+            wake_word_config: 本地唤醒词引擎配置（见 WakeWordAction.initialize），
+                为空时通过 ASR 文本匹配唤醒词
         """
         super().__init__()
         self.agent = agent
         self.llm_client = llm_client
         self.wake_words = wake_words or ["你好小狐狸", "小狐狸", "hey fox"]
+        # 唤醒词 / 再见关键词匹配器（构造时预处理小写与自动机）
+        self._wake_matcher = KeywordMatcher(self.wake_words)
+        self._goodbye_matcher = KeywordMatcher(GOODBYE_KEYWORDS)
         self.idle_timeout = idle_timeout
         self.max_idle_rounds = max_idle_rounds
         self.state_callback = state_callback  # 用于推送状态给前端
         
-        # 对话历史
-        self.conversation_history = []
+        # 对话历史（deque 超出长度自动淘汰最旧的记录）
         self.max_history_length = 10
+        self.conversation_history = deque(maxlen=self.max_history_length * 2)
         
         # 💬 新增：消息列表（用于前端字幕显示）
-        self.messages = []  # 格式: [{"role": "user|assistant", "content": "...", "timestamp": ...}]
         self.max_messages = 50
+        self.messages = deque(maxlen=self.max_messages)
+        
+        # 消息推送队列：短时间内的多条消息合并为一次回调
+        self._cb_queue: asyncio.Queue = asyncio.Queue()
+        self._cb_dispatcher: Optional[asyncio.Task] = None
+        self._cb_coalesce_window = 0.02
+        
+        # 意图分析 Prompt 缓存（工具列表不变时复用，保持系统 Prompt 前缀稳定）
+        self._cached_prompt = None
+        self._cached_tools_key = None  # (工具索引, 修订号)，修订号变化时重建 Prompt
         
         # 监听器
         self.listen_action = ListenActionVAD()
         self.listen_action.initialize(VADPresets.STANDARD)
         
+        # 本地唤醒词引擎：待机时只跑唤醒词检测，唤醒后才进行 VAD 录音 + ASR
+        self.wake_word_action = None
+        if wake_word_config:
+            try:
+                self.wake_word_action = WakeWordAction()
+                self.wake_word_action.initialize(wake_word_config)
+            except Exception as e:
+                print(f"⚠️  本地唤醒词引擎不可用，回退到语音识别匹配: {e}")
+                self.wake_word_action = None
+        
         # 状态控制
         self.current_state = ConversationState.WAITING_WAKE
         self.running = False  # 👈 改为 False，由前端启动
+        self._start_event = asyncio.Event()  # 前端启动信号（避免轮询 running）
         self.listening_active = False  # 👈 新增：当前是否在监听
         self.total_conversations = 0
     
-    def _add_message(self, role: str, content: str):
-        """添加消息到列表（供前端显示）"""
+    def _add_message(self, role: str, content: str, timestamp: Optional[float] = None):
+        """添加消息到列表（供前端显示）
+        
+        Args:
+            role: user / assistant
+            content: 消息内容
+            timestamp: 消息时间，对话轮次内由调用方统一传入，缺省时取当前时间
+        """
         message = {
             "role": role,
             "content": content,
-            "timestamp": time.time()
+            "timestamp": timestamp if timestamp is not None else time.time()
         }
-        self.messages.append(message)
-        
-        # 限制消息数量
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
+        self.messages.append(message)  # 超过 max_messages 时自动丢弃最旧的消息
         
-        # 通过状态回调推送给前端
+        # 通过状态回调推送给前端（由后台任务合并推送）
         if self.state_callback:
-            self.state_callback("message", {
-                "message": message,
-                "total_messages": len(self.messages)
-            })
+            self._cb_queue.put_nowait(message)
+            if self._cb_dispatcher is None or self._cb_dispatcher.done():
+                self._cb_dispatcher = asyncio.create_task(self._callback_dispatcher())
+    
+    async def _callback_dispatcher(self):
+        """合并推送消息：收到消息后再等待一个合并窗口，窗口内的消息一次推送
+        
+        单条消息仍以 "message" 事件推送，多条合并为 "messages" 事件
+        """
+        while True:
+            batch = [await self._cb_queue.get()]
+            await asyncio.sleep(self._cb_coalesce_window)
+            while not self._cb_queue.empty():
+                batch.append(self._cb_queue.get_nowait())
+            
+            if not self.state_callback:
+                continue
+            
+            if len(batch) == 1:
+                self.state_callback("message", {
+                    "message": batch[0],
+                    "total_messages": len(self.messages)
+                })
+            else:
+                self.state_callback("messages", {
+                    "batch": batch,
+                    "total_messages": len(self.messages)
+                })
     
     def get_messages(self, limit: int = None) -> list:
         """获取消息列表"""
         if limit:
-            return self.messages[-limit:]
-        return self.messages
+            return list(itertools.islice(self.messages, max(0, len(self.messages) - limit), None))
+        return list(self.messages)
     
     def clear_messages(self):
         """清空消息列表"""
@@ -103,6 +220,7 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
         """启动监听（由前端调用）"""
         if not self.running:
             self.running = True
+            self._start_event.set()
             self.listening_active = True
             print("🎤 监听已启动")
             
@@ -115,6 +233,7 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
     def stop_listening(self):
         """停止监听（由前端调用）"""
         self.running = False
+        self._start_event.clear()
         self.listening_active = False
         print("🛑 监听已停止")
         
@@ -134,15 +253,10 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
         
         # 2. 如果 task 不为空，才记录到 task.history（避免 None 报错）
         if task is not None and hasattr(task, 'history'):
-            task.history.append({
-                "timestamp": time.time(),
-                "event": "log",
-                "level": level,
-                "message": message,
-                "executor": self.__class__.__name__
-            })
+            task.history.append(LogEntry(time.time(), level, message, self.__class__.__name__))
 
     async def validate(self, task: UnifiedTask) -> bool:
+        # execution_data 全部为可选参数，仅做基类的非空校验
         return await super().validate(task)
     
     async def execute(self, task: UnifiedTask) -> None:
@@ -181,8 +295,7 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
         print("=" * 60)
         
         # 等待前端启动信号
-        while not self.running:
-            await asyncio.sleep(0.5)
+        await self._start_event.wait()
         
         print("\n✅ 监听已启动！开始永久待机循环...")
         
@@ -248,10 +361,11 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
     
     async def _wait_for_wake_word(self) -> bool:
         """等待唤醒词 - 真正的永久监听，直到检测到唤醒词或被停止"""
-        from core.action.base import ActionContext
-        
         print("\n[_wait_for_wake_word] 进入唤醒词监听...")
         
+        if self.wake_word_action is not None:
+            return await self._wait_for_wake_word_local()
+        
         while self.running:
             print(f"[_wait_for_wake_word] 开始监听（无限循环，直到检测到唤醒词或手动停止）")
             
@@ -269,10 +383,10 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
                 print(f"[_wait_for_wake_word] 识别到语音: {text}")
                 
                 # 检查唤醒词
-                for wake_word in self.wake_words:
-                    if wake_word.lower() in text:
-                        print(f"[_wait_for_wake_word] ✅ 检测到唤醒词: {wake_word}")
-                        return True
+                wake_word = self._wake_matcher.find(text)
+                if wake_word:
+                    print(f"[_wait_for_wake_word] ✅ 检测到唤醒词: {wake_word}")
+                    return True
                 
                 # 没有唤醒词，继续监听
                 print(f"[_wait_for_wake_word] ⚠️  语音中没有唤醒词，继续监听")
@@ -283,10 +397,31 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
         
         return False
     
+    async def _wait_for_wake_word_local(self) -> bool:
+        """使用本地唤醒词引擎等待唤醒（逐帧检测，不调用 ASR）"""
+        context = ActionContext(
+            agent_state=None,
+            config={"stop_check": lambda: not self.running}
+        )
+        
+        while self.running:
+            result = await self.wake_word_action.execute(context)
+            
+            if not self.running:
+                return False
+            
+            if result.success and result.output.get("detected"):
+                print(f"[_wait_for_wake_word] ✅ 检测到唤醒词: {result.output.get('keyword')}")
+                return True
+            
+            if not result.success:
+                print(f"[_wait_for_wake_word] ⚠️  本地唤醒词检测失败: {result.error}，1秒后重试")
+                await asyncio.sleep(1)
+        
+        return False
+    
     async def _conversation_loop(self, task: UnifiedTask):
         """对话循环"""
-        from core.action.base import ActionContext
-        
         idle_count = 0
         round_count = 0
         max_rounds = 20
@@ -335,23 +470,31 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
             if not user_text:
                 continue
             
+            # 本轮消息共用一次取得的时间戳
+            turn_ts = time.time()
+            
             # 添加到消息列表
-            self._add_message("user", user_text)
+            self._add_message("user", user_text, turn_ts)
             
             # 检查再见
             if self._is_goodbye(user_text):
                 print("👋 检测到再见关键词")
                 goodbye_msg = "再见，下次见！"
-                self._add_message("assistant", goodbye_msg)
+                self._add_message("assistant", goodbye_msg, turn_ts)
                 await self._speak(goodbye_msg)
                 break
             
-            # 处理输入
-            response_text = await self._handle_user_input(user_text)
+            # 处理输入（回复按句送入播报队列，边生成边播放）
+            sentence_queue: asyncio.Queue = asyncio.Queue()
+            speak_task = asyncio.create_task(self._speak_sentences(sentence_queue))
+            try:
+                response_text = await self._handle_user_input(user_text, sentence_queue)
+            finally:
+                sentence_queue.put_nowait(None)
             print(f"🤖 助手: {response_text}")
             
             # 添加到消息列表
-            self._add_message("assistant", response_text)
+            self._add_message("assistant", response_text, turn_ts)
             
             # 播报
             self._set_state(ConversationState.CONVERSING, {
@@ -360,12 +503,26 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
                 "round": round_count + 1
             })
             
-            await self._speak(response_text)
+            # 等待播报结束再进入下一轮监听（避免录到自己的声音）
+            await speak_task
             
             round_count += 1
     
-    async def _handle_user_input(self, user_text: str) -> str:
-        """处理用户输入（意图分析 + MCP）"""
+    async def _handle_user_input(self, user_text: str, sentence_queue: asyncio.Queue = None) -> str:
+        """处理用户输入（意图分析 + MCP）
+        
+        Args:
+            user_text: 用户输入
+            sentence_queue: 可选的播报队列，回复文本按句放入（不放入结束标记）
+        """
+        # 闲聊短句：跳过意图分析（无需构建工具列表 Prompt），直接生成回复
+        if _CHITCHAT_RE.fullmatch(user_text):
+            response_text = await self._chat_only(user_text, sentence_queue)
+            self.conversation_history.append({"role": "user", "content": user_text})
+            self.conversation_history.append({"role": "assistant", "content": response_text})
+            return response_text
+        
+        streamed = False
         # 1. 意图分析
         intent_result = await self._analyze_intent(user_text)
         
@@ -394,33 +551,65 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
                 
                 if mcp_result.get("success"):
                     response_text = await self._generate_final_response(
-                        user_text, mcp_result
+                        user_text, mcp_result, sentence_queue
                     )
+                    streamed = True
                 else:
                     response_text = f"抱歉，执行任务时出错了：{mcp_result.get('error', '未知错误')}"
+        
+        # 非流式生成的回复整体送入播报队列
+        if sentence_queue is not None and not streamed and response_text:
+            sentence_queue.put_nowait(response_text)
+        
         # 3. 更新历史
         self.conversation_history.append({"role": "user", "content": user_text})
         self.conversation_history.append({"role": "assistant", "content": response_text})
         
-        if len(self.conversation_history) > self.max_history_length * 2:
-            self.conversation_history = self.conversation_history[-self.max_history_length:]
-        
         return response_text
     
+    async def _chat_only(self, user_text: str, sentence_queue: asyncio.Queue = None) -> str:
+        """闲聊回复（不带工具列表，流式，凑够一句即放入 sentence_queue）"""
+        messages = [
+            {"role": "system", "content": _CHAT_SYSTEM_PROMPT},
+            *self.conversation_history,
+            {"role": "user", "content": user_text}
+        ]
+        
+        parts = []
+        sentence_buffer = SentenceBuffer()
+        try:
+            async for delta in self.llm_client.chat_completion_stream(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=100
+            ):
+                parts.append(delta)
+                if sentence_queue is not None:
+                    for sentence in sentence_buffer.feed(delta):
+                        sentence_queue.put_nowait(sentence)
+        finally:
+            rest = sentence_buffer.flush()
+            if sentence_queue is not None and rest:
+                sentence_queue.put_nowait(rest)
+        
+        return "".join(parts)
+    
     async def _analyze_intent(self, user_text: str) -> Dict[str, Any]:
         """意图分析（复用原逻辑）"""
-        from config import build_analyze_prompt
-        import json
-        
-        mcp_tools = []
-        if hasattr(self.agent, 'mcp_manager') and self.agent.mcp_manager:
-            all_tools = self.agent.mcp_manager.tool_index.get_all_tools()
-            mcp_tools = [(tool.tool_name, tool.description) for tool in all_tools]
-        
-        prompt = build_analyze_prompt(
-            available_actions=[("speak", "语音播报", ["tts"])],
-            mcp_tools=mcp_tools
-        )
+        tool_index = self._get_mcp_tool_index()
+        
+        # 工具列表未变化（同一索引且修订号不变）时复用已构建的 Prompt，无需遍历工具列表
+        tools_key = (tool_index, tool_index.revision) if tool_index else None
+        if tools_key != self._cached_tools_key or self._cached_prompt is None:
+            mcp_tools = [
+                (tool.tool_name, tool.description) for tool in tool_index.get_all_tools()
+            ] if tool_index else []
+            self._cached_prompt = build_analyze_prompt(
+                available_actions=[("speak", "语音播报", ["tts"])],
+                mcp_tools=mcp_tools
+            )
+            self._cached_tools_key = tools_key
+        prompt = self._cached_prompt
         
         messages = [
             {"role": "system", "content": prompt},
@@ -433,7 +622,7 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
             response_format={"type": "json_object"}
         )
         
-        return json.loads(response)
+        return await asyncio.to_thread(fast_json.loads, response)
     
     async def _call_mcp_tool(self, task_info: Dict) -> Dict[str, Any]:
         """调用 MCP 工具（复用原逻辑）"""
@@ -455,12 +644,10 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
         
         task_id = await self.agent.submit_task(mcp_task)
         
-        max_wait = 60
-        waited = 0
+        # 等待任务完成通知（任务进入终态时由 Agent 唤醒，无需轮询）
+        task_status = await self.agent.wait_for(task_id, timeout=60)
         
-        while waited < max_wait:
-            task_status = await self.agent.get_task_status(task_id)
-            
+        if task_status is not None:
             if task_status == TaskStatus.COMPLETED:
                 task_detail = await self.agent.get_task_detail(task_id)
                 
@@ -479,81 +666,91 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
                     error_msg = task_detail.result.get("error", str(task_detail.result))
                 return {"success": False, "error": error_msg}
             
-            await asyncio.sleep(1)
-            waited += 1
+            return {"success": False, "error": f"Task {task_status.value}"}
         
         return {"success": False, "error": "Timeout"}
     
-    async def _generate_final_response(self, user_text: str, mcp_result: Dict) -> str:
-        """融合 MCP 结果生成回复"""
+    def _format_tool_output(self, mcp_result: Dict) -> Any:
+        """从 MCP 任务结果中提取工具输出（纯同步，可放到线程中执行）"""
+        # 按结构匹配：formatted_output > result（其中的 formatted_output / RAG results / 其他）> 最后一个步骤结果
+        match mcp_result:
+            case {"formatted_output": tool_output}:
+                logger.debug("使用 formatted_output: %.100s", tool_output)
+            case {"result": {"formatted_output": tool_output}}:
+                logger.debug("从 result 中提取 formatted_output")
+            case {"result": {"results": results}}:
+                # RAG 返回的原始格式
+                tool_output = self._format_rag_results(results)
+                logger.debug("格式化 RAG results: %d 条", len(results))
+            case {"result": result_data}:
+                tool_output = str(result_data)
+                logger.debug("使用 str(result_data)，result 数据类型: %s", type(result_data))
+            case {"step_results": [*_, last_step]}:
+                tool_output = last_step.get("result")
+                logger.debug("使用 step_results")
+            case _:
+                tool_output = "未能获取到有效结果"
+                logger.debug("未找到有效结果字段")
+        
+        logger.debug("最终 tool_output: %s", tool_output)
+        return tool_output
+    
+    @staticmethod
+    def _format_rag_results(results: list) -> str:
+        """格式化 RAG 原始检索结果（取前3条）"""
+        if not results:
+            return "未找到相关结果"
+        
+        lines = []
+        for i, item in enumerate(results[:3], 1):
+            if isinstance(item, dict):
+                content = item.get("content") or item.get("snippet") or ""
+                lines.append(f"{i}. {item.get('title', '')}\n   {str(content)[:150]}")
+            else:
+                lines.append(f"{i}. {str(item)[:150]}")
+        return "\n\n".join(lines)
+    
+    async def _generate_final_response(self, user_text: str, mcp_result: Dict,
+                                       sentence_queue: asyncio.Queue = None) -> str:
+        """融合 MCP 结果生成回复（流式，凑够一句即放入 sentence_queue）"""
         
         print(f"\n🔧 [DEBUG] _generate_final_response 输入:")
         print(f"  - user_text: {user_text}")
         print(f"  - mcp_result keys: {list(mcp_result.keys())}")
         
-        tool_output = None
-        
-        # 1. 优先使用 formatted_output
-        if "formatted_output" in mcp_result:
-            tool_output = mcp_result["formatted_output"]
-            print(f"✅ [DEBUG] 使用 formatted_output: {tool_output[:100]}")
-        
-        # 2. 尝试提取 result
-        elif "result" in mcp_result:
-            result_data = mcp_result["result"]
-            print(f"🔍 [DEBUG] result 数据类型: {type(result_data)}")
-            
-            # 如果 result 是字典且有 formatted_output
-            if isinstance(result_data, dict):
-                if "formatted_output" in result_data:
-                    tool_output = result_data["formatted_output"]
-                    print(f"✅ [DEBUG] 从 result 中提取 formatted_output")
-                elif "results" in result_data:
-                    # RAG 返回的原始格式
-                    results = result_data["results"]
-                    tool_output = self._format_rag_results(results)
-                    print(f"✅ [DEBUG] 格式化 RAG results: {len(results)} 条")
-                else:
-                    tool_output = str(result_data)
-                    print(f"⚠️ [DEBUG] 使用 str(result_data)")
-            else:
-                tool_output = str(result_data)
-        
-        # 3. 尝试从 step_results 提取
-        elif "step_results" in mcp_result and mcp_result["step_results"]:
-            last_step = mcp_result["step_results"][-1]
-            tool_output = last_step.get("result")
-            print(f"✅ [DEBUG] 使用 step_results")
-        
-        # 4. 兜底
-        else:
-            tool_output = "未能获取到有效结果"
-            print(f"⚠️ [DEBUG] 未找到有效结果字段")
-        
-        print(f"📝 [DEBUG] 最终 tool_output: {tool_output}")
-        
-        system_prompt = f"""你是一个友好的智能助手。
-
-用户问题："{user_text}"
-
-工具返回的信息：
-{tool_output}
-
-请用简洁、自然、口语化的中文回复用户（2-3句话，总结关键信息）。
-如果是新闻或搜索结果，简要概括前几条即可。"""
+        # 提取工具输出（结果可能较大，放到线程中避免阻塞事件循环）
+        tool_output = await asyncio.to_thread(self._format_tool_output, mcp_result)
         
         messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_text}
+            {"role": "system", "content": _FINAL_SYSTEM_PROMPT},
+            {"role": "user", "content": f"用户问题：\"{user_text}\"\n\n工具返回的信息：\n{tool_output}"}
         ]
         
-        response = await self.llm_client.chat_completion(
-            messages=messages,
-            temperature=0.7,
-            max_tokens=200
-        )
-        
-        return response
+        parts = []
+        sentence_buffer = SentenceBuffer()
+        try:
+            async for delta in self.llm_client.chat_completion_stream(
+                messages=messages,
+                temperature=0.7,
+                max_tokens=200
+            ):
+                parts.append(delta)
+                if sentence_queue is not None:
+                    for sentence in sentence_buffer.feed(delta):
+                        sentence_queue.put_nowait(sentence)
+        finally:
+            rest = sentence_buffer.flush()
+            if sentence_queue is not None and rest:
+                sentence_queue.put_nowait(rest)
+        
+        return "".join(parts)
+    
+    async def _speak_sentences(self, sentence_queue: asyncio.Queue) -> bool:
+        """按顺序播报队列中的句子，直到收到 None"""
+        success = True
+        while (sentence := await sentence_queue.get()) is not None:
+            success = await self._speak(sentence) and success
+        return success
     
     async def _speak(self, text: str) -> bool:
         """语音播报"""
@@ -562,12 +759,7 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
     
     def _is_goodbye(self, text: str) -> bool:
         """检查再见关键词"""
-        goodbye_keywords = [
-            "再见", "拜拜", "byebye", "goodbye", "886",
-            "结束", "停止", "退出", "你退下吧"
-        ]
-        text_lower = text.lower().strip()
-        return any(kw in text_lower for kw in goodbye_keywords)
+        return self._goodbye_matcher.matches(text)
     
     def _set_state(self, state: str, data: Dict = None):
         """设置状态并触发回调"""
@@ -581,10 +773,16 @@ class ConversationExecutorWithWake(BaseTaskExecutor):
     def stop(self):
         """停止监听"""
         self.running = False
+        self._start_event.clear()
         self.listening_active = False
     
     def cleanup(self):
         """清理资源"""
+        if self._cb_dispatcher is not None:
+            self._cb_dispatcher.cancel()
+            self._cb_dispatcher = None
         self.listen_action.cleanup()
+        if self.wake_word_action is not None:
+            self.wake_word_action.cleanup()
         self.conversation_history.clear()
         self.messages.clear()
\ No newline at end of file
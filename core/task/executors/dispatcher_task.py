@@ -3,6 +3,7 @@
 
 专门处理来自 TaskDispatcher 的任务请求
 """
+import time
 from typing import TYPE_CHECKING, Dict, Any
 from core.task.executors.base import BaseTaskExecutor
 from core.task.models import UnifiedTask, TaskStatus
@@ -18,6 +19,8 @@ class DispatcherTaskExecutor(BaseTaskExecutor):
     支持：execute_action, mcp_tool, user_input 等任务类型
     """
     
+    __slots__ = ("task_dispatcher",)
+    
     def __init__(self, task_dispatcher: 'TaskDispatcher'):
         """初始化执行器
         
@@ -29,9 +32,6 @@ class DispatcherTaskExecutor(BaseTaskExecutor):
     
     async def validate(self, task: UnifiedTask) -> bool:
         """验证任务参数"""
-        if not await super().validate(task):
-            return False
-        
         # 验证是否包含 task_request
         task_request = task.execution_data.get("task_request")
         if not task_request:
@@ -62,10 +62,7 @@ class DispatcherTaskExecutor(BaseTaskExecutor):
             self._log(task, f"Executing dispatcher task: {task_request.task_type}")
             
             # 更新 TaskDispatcher 状态为运行中
-            if callback_task_id and callback_task_id in self.task_dispatcher.task_status_map:
-                task_info = self.task_dispatcher.task_status_map[callback_task_id]
-                task_info.status = "running"
-                task_info.updated_at = self._get_timestamp()
+            self._update_status(callback_task_id, status="running")
             
             # 执行实际任务逻辑
             result = await self.task_dispatcher._execute_task_by_type(task_request)
@@ -79,12 +76,12 @@ class DispatcherTaskExecutor(BaseTaskExecutor):
                 task.transition_to(TaskStatus.COMPLETED, "Execution completed")
                 
                 # 更新 TaskDispatcher 状态为完成
-                if callback_task_id and callback_task_id in self.task_dispatcher.task_status_map:
-                    task_info = self.task_dispatcher.task_status_map[callback_task_id]
-                    task_info.status = "completed"
-                    task_info.message = "Task completed successfully"
-                    task_info.result = result
-                    task_info.updated_at = self._get_timestamp()
+                self._update_status(
+                    callback_task_id,
+                    status="completed",
+                    message="Task completed successfully",
+                    result=result
+                )
                 
                 # 触发完成回调
                 if callback_task_id:
@@ -95,11 +92,7 @@ class DispatcherTaskExecutor(BaseTaskExecutor):
                 task.transition_to(TaskStatus.FAILED, str(error))
                 
                 # 更新 TaskDispatcher 状态为失败
-                if callback_task_id and callback_task_id in self.task_dispatcher.task_status_map:
-                    task_info = self.task_dispatcher.task_status_map[callback_task_id]
-                    task_info.status = "failed"
-                    task_info.message = f"Task failed: {error}"
-                    task_info.updated_at = self._get_timestamp()
+                self._update_status(callback_task_id, status="failed", message=f"Task failed: {error}")
                 
                 # 触发失败回调
                 if callback_task_id:
@@ -110,17 +103,25 @@ class DispatcherTaskExecutor(BaseTaskExecutor):
             
             # 更新 TaskDispatcher 状态为失败
             callback_task_id = task.execution_data.get("task_id_for_callback")
-            if callback_task_id and callback_task_id in self.task_dispatcher.task_status_map:
-                task_info = self.task_dispatcher.task_status_map[callback_task_id]
-                task_info.status = "failed"
-                task_info.message = f"Execution error: {str(e)}"
-                task_info.updated_at = self._get_timestamp()
+            self._update_status(callback_task_id, status="failed", message=f"Execution error: {str(e)}")
             
             # 触发失败回调
             if callback_task_id:
                 await self.task_dispatcher.on_task_failed(callback_task_id, {"error": str(e)})
     
-    def _get_timestamp(self) -> float:
-        """获取当前时间戳"""
-        import time
-        return time.time()
+    def _update_status(self, callback_task_id: str, **fields: Any) -> None:
+        """同步 TaskDispatcher.task_status_map 中的任务状态
+        
+        Args:
+            callback_task_id: TaskDispatcher 侧的任务ID（为空或不存在时忽略）
+            **fields: 要更新的字段（status / message / result）
+        """
+        if not callback_task_id:
+            return
+        task_info = self.task_dispatcher.task_status_map.get(callback_task_id)
+        if task_info is None:
+            return
+        
+        for name, value in fields.items():
+            setattr(task_info, name, value)
+        task_info.updated_at = time.time()
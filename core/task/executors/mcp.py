@@ -1,11 +1,208 @@
 # core/task/executors/mcp.py
 """MCP任务执行器"""
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
-import json
+from collections import OrderedDict
+import asyncio
+import copy
+import functools
+import hashlib
+import itertools
+import re
+import time
 from core.task.executors.base import BaseTaskExecutor
+from core.mcp_control.connection_pool import McpConnectionPool
+from core.task.executors.plan_template import PlanTemplateStore
 from core.task.models import UnifiedTask, TaskStatus, TaskType, TaskPlan, PlanStep, PlanStepStatus
+from util import fast_json
+from util.keyword_matcher import KeywordMatcher, LabeledKeywordMatcher
+
+
+# 工具类型关键词（查询类优先于操作类，区分大小写）
+_TOOL_TYPE_MATCHER = LabeledKeywordMatcher(
+    (
+        ("query", ("Get", "List", "Query", "Find", "Search", "Fetch", "Describe", "Show")),
+        ("action", ("Set", "Create", "Update", "Delete", "Turn", "Start", "Stop", "Execute", "Send", "Run", "Call", "Invoke")),
+    ),
+    case_sensitive=True
+)
+
+# 错误模式关键词（靠前的分类优先）
+_ERROR_PATTERN_MATCHER = LabeledKeywordMatcher((
+    ("resource_not_found", ("not found", "does not exist", "unknown", "no such")),
+    ("invalid_parameter", ("invalid", "incorrect", "malformed", "bad request")),
+    ("permission_denied", ("permission", "forbidden", "unauthorized", "access denied")),
+    ("tool_unsupported", ("not support", "unsupported", "unavailable")),
+    ("network_issue", ("timeout", "network", "connection")),
+))
+
+# 超过该长度的错误信息不进入缓存（避免长文本占用缓存）
+_ERROR_CACHE_MAX_LEN = 200
+
+
+@functools.lru_cache(maxsize=2048)
+def _classify_tool_type_cached(tool_name: str) -> str:
+    """分类工具类型（纯函数，按工具名缓存）"""
+    return _TOOL_TYPE_MATCHER.classify(tool_name) or "hybrid"
+
+
+def _classify_error_pattern_impl(error_info: str) -> str:
+    """分类错误模式（纯函数）"""
+    return _ERROR_PATTERN_MATCHER.classify(error_info) or "unknown_error"
+
+
+_classify_error_pattern_cached = functools.lru_cache(maxsize=2048)(_classify_error_pattern_impl)
+
+
+# 任务意图动词：包含操作动词视为操作任务，仅包含查询动词视为纯查询任务
+_TASK_INTENT_MATCHER = LabeledKeywordMatcher((
+    ("action_task", (
+        "打开", "关闭", "设置", "调节", "控制", "开启", "关掉",
+        "关上", "启动", "停止", "发送", "创建", "删除", "修改",
+        "拉上", "拉开", "调整", "增加", "减少"
+    )),
+    ("query_only", (
+        "查看", "查询", "显示", "获取", "列出", "看", "看看",
+        "是多少", "是什么", "有哪些", "告诉我"
+    )),
+))
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_task_intent_cached(user_intent: str) -> str:
+    """分类用户任务意图（纯函数，按意图文本缓存），无法判断时返回 unknown"""
+    return _TASK_INTENT_MATCHER.classify(user_intent) or "unknown"
+
+
+def _extract_dict_content(error_data: Any) -> Optional[str]:
+    """方式1: 字典格式（已序列化的CallToolResult），取 content[0] 的 text"""
+    if not isinstance(error_data, dict):
+        return None
+    content = error_data.get("content")
+    if not content or not isinstance(content, list):
+        return None
+    first_content = content[0]
+    # TextContent对象或字典格式的TextContent
+    text = getattr(first_content, "text", None)
+    if text is None and isinstance(first_content, dict):
+        text = first_content.get("text")
+    return text
+
+
+def _extract_object_content(error_data: Any) -> Optional[str]:
+    """方式2: 对象格式（未序列化的CallToolResult），取 content[0].text"""
+    content_list = getattr(error_data, "content", None)
+    if not content_list:
+        return None
+    return getattr(content_list[0], "text", None)
+
+
+def _extract_dict_message_field(error_data: Any) -> Optional[str]:
+    """方式3: 字典的 message 字段"""
+    if isinstance(error_data, dict) and "message" in error_data:
+        return str(error_data["message"])
+    return None
+
+
+def _extract_dict_error_field(error_data: Any) -> Optional[str]:
+    """方式4: 字典的 error 字段（字符串，或带 message 的字典）"""
+    if not isinstance(error_data, dict):
+        return None
+    error_value = error_data.get("error")
+    if isinstance(error_value, str):
+        return error_value
+    if isinstance(error_value, dict):
+        return error_value.get("message", str(error_value))
+    return None
+
+
+def _extract_dict_dump(error_data: Any) -> Optional[str]:
+    """方式5: 将整个字典转为字符串（截取前200字符）"""
+    if not isinstance(error_data, dict):
+        return None
+    try:
+        error_str = fast_json.dumps(error_data, default=str)
+    except (TypeError, ValueError):
+        return None
+    if len(error_str) > 200:
+        return error_str[:200] + "..."
+    return error_str
+
+
+# 错误消息提取方式，按顺序尝试，首个返回非 None 的结果即为错误消息
+_ERROR_MESSAGE_EXTRACTORS = (
+    _extract_dict_content,
+    _extract_object_content,
+    _extract_dict_message_field,
+    _extract_dict_error_field,
+    _extract_dict_dump,
+)
+
+
+# 成功后可直接更新缓存设备状态的家居控制工具
+_HOME_CONTROL_TOOLS = frozenset(("HassTurnOn", "HassTurnOff", "HassSetPosition"))
+
+# GetLiveContext 设备名称是否为纯英文
+_ENGLISH_NAME_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+# GetLiveContext 文本是否为 JSON 对象（允许前导空白）
+_JSON_OBJECT_START_RE = re.compile(r"\s*\{")
+
+# 英文名称转 entity_id 时的字符替换（空格、连字符 -> 下划线）
+_ENTITY_NAME_TRANS = str.maketrans(" -", "__")
+
+# Home Assistant 相关工具名（区分大小写）
+_HASS_TOOLS = frozenset((
+    "HassGetLiveContext", "HassTurnOn", "HassTurnOff",
+    "HassSetPosition", "HassGetState", "HassListEntities",
+    "HassSetTemperature", "HassSetBrightness"
+))
+
+# 带前缀/后缀的工具名（如 server 命名空间前缀）按子串匹配
+_HASS_TOOL_MATCHER = LabeledKeywordMatcher((("hass", _HASS_TOOLS),), case_sensitive=True)
+
+
+def _is_hass_tool(tool_name: str) -> bool:
+    """是否为 Home Assistant 相关工具（精确命中直接返回，否则按子串匹配）"""
+    return tool_name in _HASS_TOOLS or _HASS_TOOL_MATCHER.classify(tool_name) is not None
+
+# 家居控制意图：动作词（扩展）
+_HOME_ACTION_MATCHER = KeywordMatcher((
+    "打开", "关闭", "调节", "设置", "控制", "开启", "关掉", "关上", "启动", "停止", "拉上", "拉开",
+    "调整", "增加", "减少"
+))
+
+# 家居控制意图：实体词（扩展）
+_HOME_ENTITY_MATCHER = KeywordMatcher((
+    "灯", "空调", "设备", "风扇", "温度", "亮度", "暖气", "加湿器", "窗帘", "门窗", "百叶窗", "床帘",
+    "电视", "插座"
+))
+
+
+@functools.lru_cache(maxsize=256)
+def _is_home_automation_intent(user_intent: str) -> bool:
+    """意图文本是否同时包含家居动作词与实体词（纯函数，按文本缓存）"""
+    return _HOME_ACTION_MATCHER.matches(user_intent) and _HOME_ENTITY_MATCHER.matches(user_intent)
+
+
+def _rule_max_revisions_reached(executor: "McpExecutor", task: UnifiedTask, execution_result: Dict[str, Any]) -> bool:
+    """已达到最大修订次数"""
+    return bool(task.plan) and task.plan.revision_count >= executor.max_plan_revisions
+
+
+def _rule_resource_missing(executor: "McpExecutor", task: UnifiedTask, execution_result: Dict[str, Any]) -> bool:
+    """执行失败且错误为资源未找到"""
+    return (
+        not execution_result.get("success")
+        and executor._classify_error_pattern(str(execution_result.get("error", ""))) == "resource_not_found"
+    )
+
+
+# 规则验证决策表：(条件, 是否需要修订, 日志)，按顺序匹配，首个命中的规则决定结果，均未命中则不修订
+_VERIFY_RULES = (
+    (_rule_max_revisions_reached, False, "Max plan revisions reached, no more revisions"),
+    (_rule_resource_missing, True, "Resource not found error detected, plan revision needed"),
+)
 
 
 @dataclass
@@ -17,6 +214,36 @@ class CompletionJudgment:
     analysis: str = ""  # 详细分析说明
 
 
+@dataclass(frozen=True)
+class ToolBehavior:
+    """工具的完成度评估策略"""
+    tool_type: str  # query / action / hybrid
+    expected_state: Optional[str] = None  # 执行成功后期望的设备状态
+    verify_state: bool = False  # 是否检查返回结果中的状态
+
+
+# 已知家居控制工具的评估策略
+_TOOL_BEHAVIOR: Dict[str, ToolBehavior] = {
+    "HassTurnOn": ToolBehavior("action", "on", True),
+    "HassTurnOff": ToolBehavior("action", "off", True),
+    "HassSetPosition": ToolBehavior("action", None, True),
+    "HassSetTemperature": ToolBehavior("action", None, True),
+    "HassSetBrightness": ToolBehavior("action", None, True),
+}
+
+
+@functools.lru_cache(maxsize=2048)
+def _tool_behavior(tool_name: str) -> ToolBehavior:
+    """获取工具的评估策略（未登记的工具按名称推断，结果按工具名缓存）"""
+    behavior = _TOOL_BEHAVIOR.get(tool_name)
+    if behavior is None:
+        behavior = ToolBehavior(
+            _classify_tool_type_cached(tool_name),
+            verify_state="Turn" in tool_name or "Set" in tool_name
+        )
+    return behavior
+
+
 class McpExecutor(BaseTaskExecutor):
     """MCP任务执行器
     
@@ -24,6 +251,95 @@ class McpExecutor(BaseTaskExecutor):
     整合自task_manager.py的逻辑
     """
     
+    # 传给 Router 的最近历史条数（Router 仅使用末尾几条生成提示词）
+    ROUTER_HISTORY_WINDOW = 10
+    
+    # 计划生成 Prompt 中列出的工具数量上限与单个工具描述的最大长度
+    _PLAN_PROMPT_MAX_TOOLS = 20
+    _TOOL_DESC_MAX = 120
+    
+    # 计划生成 Prompt 模板（占位符：goal、tools_summary）
+    _PLAN_PROMPT_TEMPLATE = """你是一个任务规划助手。根据用户目标和可用工具，生成一个详细的执行计划。
+
+**用户目标**：
+{goal}
+
+**可用工具**：
+{tools_summary}
+
+**计划要求**：
+1. 生成 3-8 个执行步骤
+2. 步骤应按逻辑顺序排列（如：先查询后操作）
+3. 每个步骤包含：
+   - description: 步骤描述（自然语言）
+   - expected_tool: 预期使用的工具名称（可选）
+   - depends_on: 依赖的步骤序号列表（从0开始，可选）；不依赖任何步骤时填 []，可与其他步骤并发执行
+4. 步骤粒度适中，避免过细或过粗
+
+**输出格式** (必须为 JSON)：
+```json
+{{
+  "steps": [
+    {{
+      "description": "步骤1描述",
+      "expected_tool": "工具名称或null",
+      "depends_on": []
+    }},
+    {{
+      "description": "步骤2描述",
+      "expected_tool": "工具名称或null",
+      "depends_on": [0]
+    }}
+  ]
+}}
+```
+
+请生成计划：
+"""
+    
+    # 计划修订 Prompt 模板（占位符：user_intent、completed_steps、reason）
+    _PLAN_REVISION_PROMPT_TEMPLATE = """你是一个任务规划助手。原有计划需要修订，请生成新的执行步骤。
+
+**用户原始意图**：
+{user_intent}
+
+**已完成的步骤**：
+{completed_steps}
+
+**修订原因**：
+{reason}
+
+**要求**：
+1. 生成剩余的执行步骤（考虑已完成的步骤）
+2. 步骤数量在 1-5 个
+3. 步骤应解决修订原因中提到的问题
+
+**输出格式** (必须为 JSON)：
+```json
+{{
+  "steps": [
+    {{
+      "description": "步骤描述",
+      "expected_tool": "工具名称或null"
+    }}
+  ]
+}}
+```
+
+请生成修订后的计划：
+"""
+    
+    # LLM 计划响应缓存容量与有效期（秒）
+    _PLAN_RESPONSE_CACHE_SIZE = 256
+    _PLAN_RESPONSE_CACHE_TTL = 300
+    
+    # 改动3：注入 goal 的参数使用规范
+    _GOAL_RULES = """【参数使用规范】
+1. 必须使用设备列表中的实际entity_id，不得使用用户输入的模糊名称
+2. 如需area参数，必须使用设备信息中的实际区域名（如"实验室"），禁止使用"当前位置"等占位符
+3. 如需name参数，优先使用entity_id，其次使用友好名称
+4. 窗帘类设备的position取值：0表示完全打开，100表示完全关闭"""
+    
     def __init__(self, router, connections, task_queue=None,
                  home_context_ttl=60,
                  completion_confidence_threshold=0.7,
@@ -31,7 +347,13 @@ class McpExecutor(BaseTaskExecutor):
                  enable_plan_based_mode=True,
                  max_plan_steps=20,
                  max_plan_revisions=3,
-                 plan_verification_mode="rule"):
+                 plan_verification_mode="rule",
+                 enable_plan_cache=True,
+                 plan_template_store=None,
+                 inline_step_budget=4,
+                 max_inflight_per_server=8,
+                 tools_cache_ttl=30,
+                 connection_pool=None):
         """初始化MCP执行器
         
         Args:
@@ -45,12 +367,34 @@ class McpExecutor(BaseTaskExecutor):
             max_plan_steps: 计划最大步骤数，默认20
             max_plan_revisions: 计划最大修订次数，默认3
             plan_verification_mode: 计划验证模式，"rule"或"llm"，默认"rule"
+            enable_plan_cache: 是否复用相同目标已成功执行的计划模板，默认True
+            plan_template_store: 计划模板存储，默认使用进程内共享的 PlanTemplateStore
+            inline_step_budget: 单个任务内连续执行的步骤数上限（超出后创建后续任务），默认4
+            max_inflight_per_server: 单个 MCP Server 同时进行的工具调用数上限，默认8
+            tools_cache_ttl: 可用工具列表缓存有效期（秒），默认30秒
+            connection_pool: MCP 连接池（通常传入 McpManager.connection_pool），默认为 connections 新建一个
         """
         super().__init__()
         self.router = router
         self.connections = connections
+        # 调用前检查连接状态，断开时惰性重连
+        self.connection_pool = connection_pool or McpConnectionPool(connections)
+        # server_id -> connection.call_tool（首次调用时解析）
+        self._tool_callers: Dict[str, Callable] = {}
+        # server_id -> 并发调用限制（并发步骤较多时避免压垮单个 Server）
+        self.max_inflight_per_server = max_inflight_per_server
+        self._server_semaphores: Dict[str, asyncio.Semaphore] = {}
         self.task_queue = task_queue
         self.home_context_ttl = home_context_ttl
+        # 跨任务共享的家居上下文：server_id -> (获取时间 time.monotonic(), home_live_context)
+        self._home_context_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # 可用工具列表缓存：(获取时间 time.monotonic(), 工具列表)
+        self.tools_cache_ttl = tools_cache_ttl
+        self._tools_cache: Optional[Tuple[float, list]] = None
+        # LLM 计划响应缓存：sha256(prompt) -> (写入时间 time.monotonic(), 计划数据)，按 LRU 淘汰
+        self._plan_response_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # 提供 GetLiveContext 的 server_id（首次使用时解析）
+        self._home_server_id: Optional[str] = None
         self.completion_confidence_threshold = completion_confidence_threshold
         self.enable_llm_completion_judge = enable_llm_completion_judge
         # 新增计划驱动模式配置
@@ -58,12 +402,14 @@ class McpExecutor(BaseTaskExecutor):
         self.max_plan_steps = max_plan_steps
         self.max_plan_revisions = max_plan_revisions
         self.plan_verification_mode = plan_verification_mode
+        # 计划模板缓存
+        self.enable_plan_cache = enable_plan_cache
+        self.plan_template_store = plan_template_store or PlanTemplateStore()
+        # 步骤内联执行预算
+        self.inline_step_budget = inline_step_budget
     
     async def validate(self, task: UnifiedTask) -> bool:
         """验证任务参数"""
-        if not await super().validate(task):
-            return False
-        
         # 验证goal
         goal = task.execution_data.get("goal")
         if not goal:
@@ -88,6 +434,22 @@ class McpExecutor(BaseTaskExecutor):
     async def _execute_plan_based(self, task: UnifiedTask) -> None:
         """计划驱动模式执行
         
+        步骤成功后若仍有余量（最多连续 inline_step_budget 步，且用时不超过任务超时的一半），
+        直接在本次调用中执行下一步骤，不再创建后续任务经过队列往返
+        """
+        # 已有计划的后续任务由已验证过的任务创建且共享同一 execution_data，无需再次验证
+        if task.plan is None and not await self.validate(task):
+            task.transition_to(TaskStatus.FAILED, "Validation failed")
+            return
+        
+        inline_deadline = time.monotonic() + task.timeout / 2
+        for inline_left in range(self.inline_step_budget, -1, -1):
+            if not await self._execute_plan_step(task, inline_deadline if inline_left > 0 else None):
+                return
+    
+    async def _execute_plan_step(self, task: UnifiedTask, inline_deadline: Optional[float] = None) -> bool:
+        """执行计划中的当前步骤
+        
         执行流程：
         1. 检查是否已有plan，没有则调用_generate_plan
         2. 检查plan是否全部完成，是则标记任务COMPLETED
@@ -96,50 +458,58 @@ class McpExecutor(BaseTaskExecutor):
         5. 调用_verify_plan验证计划是否需要修订
         6. 如需修订，调用_revise_plan更新计划
         7. 移动到下一步骤，创建后续任务
+        
+        Args:
+            task: 任务对象
+            inline_deadline: 允许继续在本次调用中执行下一步骤的截止时间（time.monotonic），None 表示不允许
+        
+        Returns:
+            bool: 步骤已成功且下一步骤应直接继续执行时返回True（此时任务保持运行状态）
         """
         try:
-            # 验证参数
-            if not await self.validate(task):
-                task.transition_to(TaskStatus.FAILED, "Validation failed")
-                return
-            
             goal = task.execution_data.get("goal")
             user_intent = task.execution_data.get("user_intent", goal)
             
-            # 步骤1：检查或生成计划
+            # 步骤1：检查或生成计划（优先复用相同目标的计划模板）
+            if not task.plan:
+                task.plan = self._load_plan_template(task, goal, user_intent)
             if not task.plan:
                 self._log(task, "No plan found, generating...")
                 task.plan = await self._generate_plan(task, goal, task.context)
             
+            # 跳过已在并发批次中完成的步骤
+            while (step := task.plan.get_current_step()) and step.status == PlanStepStatus.COMPLETED:
+                task.plan.advance_step()
+            
             # 步骤2：检查计划是否已完成
             if self._is_plan_completed(task.plan):
                 self._log(task, "All plan steps completed, task finished")
                 
                 # 提取所有步骤的执行结果
-                step_results = []
-                final_step_result = None
-                final_tool_output = None  # 👈 新增
+                steps = task.plan.steps
+                step_results = [
+                    {
+                        "description": step.description,
+                        "status": step.status.value,
+                        "result": step.execution_result
+                    }
+                    for step in steps if step.execution_result
+                ]
                 
-                for step in task.plan.steps:
-                    if step.execution_result:
-                        step_results.append({
-                            "description": step.description,
-                            "status": step.status.value,
-                            "result": step.execution_result
-                        })
-                        if step.status == PlanStepStatus.COMPLETED:
-                            final_step_result = step.execution_result
+                # 从后向前查找最后一个成功步骤
+                final_step = next(
+                    (step for step in reversed(steps)
+                     if step.execution_result and step.status == PlanStepStatus.COMPLETED),
+                    None
+                )
                 
-                # 👇 新增：提取最后一个成功步骤的实际输出
-                if final_step_result and isinstance(final_step_result, dict):
-                    if "formatted_output" in final_step_result:
-                        final_tool_output = final_step_result["formatted_output"]
-                    elif "result" in final_step_result:
-                        result_data = final_step_result["result"]
-                        if isinstance(result_data, dict) and "formatted_output" in result_data:
-                            final_tool_output = result_data["formatted_output"]
-                        else:
-                            final_tool_output = result_data
+                # 最后一个成功步骤的实际输出（步骤完成时已提取，未缓存时现场提取）
+                final_step_result = final_step.execution_result if final_step else None
+                final_tool_output = None
+                if final_step is not None:
+                    final_tool_output = final_step.extracted_output
+                    if final_tool_output is None:
+                        final_tool_output = self._extract_tool_output(final_step_result)
                 
                 # 构建最终结果
                 task.result = {
@@ -156,6 +526,9 @@ class McpExecutor(BaseTaskExecutor):
                 # 👇 新增：调试日志
                 self._log(task, f"Plan completed, final result={str(final_tool_output)[:100]}")
                 
+                # 保存成功执行的计划结构，供相同目标复用
+                self._save_plan_template(task, goal, user_intent)
+                
                 task.transition_to(TaskStatus.COMPLETED, "Plan completed successfully")
                 return
             
@@ -173,11 +546,17 @@ class McpExecutor(BaseTaskExecutor):
                 task.transition_to(TaskStatus.FAILED, "Plan has too many steps")
                 return
             
+            # 当前及后续互不依赖的步骤并发执行
+            ready = self._collect_ready_steps(task.plan)
+            if len(ready) > 1:
+                await self._execute_concurrent_steps(task, ready)
+                return
+            
             self._log(task, f"Executing step {task.plan.current_step_index + 1}/{len(task.plan.steps)}: {current_step.description}")
             
             # 标记步骤开始
             current_step.status = PlanStepStatus.IN_PROGRESS
-            current_step.started_at = datetime.now().timestamp()
+            current_step.started_at = time.time()
             
             # 家居任务上下文预获取
             if self._is_home_automation_task(task):
@@ -188,70 +567,54 @@ class McpExecutor(BaseTaskExecutor):
             step_goal = current_step.description
             decision = await self._analyze_step(task, step_goal, task.plan.current_step_index)
             
+            # 无需工具且高置信度：步骤直接完成（最常见的空操作步骤，优先判断）
+            if not decision.tool and decision.confidence >= 0.6:
+                return await self._complete_step_without_tool(task, current_step, decision, inline_deadline)
+            
             # 检查决策有效性
             if not decision.tool:
-                if decision.confidence >= 0.6:
-                    # 高置信度，认为步骤完成
-                    self._log(task, f"Step completed (no tool needed, confidence={decision.confidence})")
-                    current_step.status = PlanStepStatus.COMPLETED
-                    current_step.completed_at = datetime.now().timestamp()
-                    current_step.execution_result = {"success": True, "reasoning": decision.reasoning}
-                else:
-                    # 低置信度，步骤失败
-                    self._log(task, f"Step failed (cannot find tool, confidence={decision.confidence})", "ERROR")
-                    current_step.status = PlanStepStatus.FAILED
-                    current_step.completed_at = datetime.now().timestamp()
-                    current_step.execution_result = {"success": False, "error": decision.reasoning}
-                    
-                    # 尝试修订计划
-                    if task.plan.revision_count < self.max_plan_revisions:
-                        await self._revise_plan(task, f"Cannot find suitable tool: {decision.reasoning}")
-                    else:
-                        task.result = {"success": False, "error": "Cannot find suitable tool"}
-                        task.transition_to(TaskStatus.FAILED, "Cannot find suitable tool")
-                        return
-                
-                # 移动到下一步骤
-                task.plan.advance_step()
-                task.transition_to(TaskStatus.COMPLETED, f"Step {task.plan.current_step_index} completed")
-                
-                # 创建后续任务
-                await self._create_next_plan_task(task)
+                # 低置信度，步骤失败，尝试修订计划
+                self._log(task, f"Step failed (cannot find tool, confidence={decision.confidence})", "ERROR")
+                if await self._handle_step_failure(
+                    task, current_step,
+                    revise_reason=f"Cannot find suitable tool: {decision.reasoning}",
+                    fail_error="Cannot find suitable tool",
+                    fail_reason="Cannot find suitable tool",
+                    execution_result={"success": False, "error": decision.reasoning}
+                ):
+                    await self._create_next_plan_task(task)
                 return
             
             # 检查置信度
             if decision.confidence < 0.6:
                 self._log(task, f"Low confidence ({decision.confidence})", "ERROR")
-                current_step.status = PlanStepStatus.FAILED
-                current_step.completed_at = datetime.now().timestamp()
-                current_step.execution_result = {"success": False, "error": f"Low confidence: {decision.confidence}"}
-                
-                # 尝试修订计划
-                if task.plan.revision_count < self.max_plan_revisions:
-                    await self._revise_plan(task, f"Low confidence decision: {decision.confidence}")
-                    task.plan.advance_step()
-                    task.transition_to(TaskStatus.COMPLETED, "Step failed, plan revised")
+                if await self._handle_step_failure(
+                    task, current_step,
+                    revise_reason=f"Low confidence decision: {decision.confidence}",
+                    fail_error="Low confidence and max revisions reached",
+                    fail_reason="Low confidence",
+                    execution_result={"success": False, "error": f"Low confidence: {decision.confidence}"}
+                ):
                     await self._create_next_plan_task(task)
-                else:
-                    task.result = {"success": False, "error": "Low confidence and max revisions reached"}
-                    task.transition_to(TaskStatus.FAILED, "Low confidence")
                 return
             
             # 执行工具
             tool_result = await self._execute_tool(task, decision)
             
-            # 记录历史
-            self._record_history(task, decision, tool_result, task.plan.current_step_index)
+            # 记录历史（与步骤完成时间共用同一时间戳）
+            completed_at = time.time()
+            self._record_history(task, decision, tool_result, task.plan.current_step_index, ts=completed_at)
             
             # 记录执行结果到步骤
             current_step.execution_result = tool_result
-            current_step.completed_at = datetime.now().timestamp()
+            current_step.completed_at = completed_at
             
             # 步骤5：处理结果
             if tool_result["success"]:
                 # 成功
                 self._extract_query_result_to_context(task, decision, tool_result)
                 current_step.status = PlanStepStatus.COMPLETED
+                tool_output = current_step.extracted_output = self._extract_tool_output(tool_result)
                 
                 self._log(task, f"Step {task.plan.current_step_index + 1} completed successfully")
                 
@@ -265,22 +628,6 @@ class McpExecutor(BaseTaskExecutor):
                 # 步骤7：移动到下一步骤
                 task.plan.advance_step()
                 
-                # 👇 修复：正确提取和保存工具输出
-                # 优先使用 formatted_output，如果没有则使用 result
-                tool_output = None
-                if isinstance(tool_result, dict):
-                    # 尝试提取 formatted_output
-                    if "formatted_output" in tool_result:
-                        tool_output = tool_result["formatted_output"]
-                    # 否则提取 result 字段
-                    elif "result" in tool_result:
-                        result_data = tool_result["result"]
-                        # 如果 result 是字典且有 formatted_output
-                        if isinstance(result_data, dict) and "formatted_output" in result_data:
-                            tool_output = result_data["formatted_output"]
-                        else:
-                            tool_output = result_data
-                
                 # 设置中间结果（即使还没完成全部计划）
                 task.result = {
                     "success": True,
@@ -295,6 +642,10 @@ class McpExecutor(BaseTaskExecutor):
                 # 👇 新增：调试日志
                 self._log(task, f"Task result set: result={str(tool_output)[:100]}")
                 
+                # 计划未被修订时直接继续下一步骤
+                if not need_revision and self._can_continue_inline(inline_deadline):
+                    return True
+                
                 task.transition_to(TaskStatus.COMPLETED, f"Step {task.plan.current_step_index} completed")
                 
                 # 创建后续任务
@@ -304,29 +655,302 @@ class McpExecutor(BaseTaskExecutor):
                 current_step.status = PlanStepStatus.FAILED
                 self._log(task, f"Step {task.plan.current_step_index + 1} failed: {tool_result.get('error')}", "ERROR")
                 
-                # 检查是否需要修订计划
+                # 检查是否需要修订计划，否则重试当前步骤
                 need_revision = await self._verify_plan(task, current_step, tool_result)
-                
-                if need_revision and task.plan.revision_count < self.max_plan_revisions:
-                    await self._revise_plan(task, f"Step failed: {tool_result.get('error')}")
-                    task.plan.advance_step()
-                    task.transition_to(TaskStatus.COMPLETED, "Step failed, plan revised")
-                    await self._create_next_plan_task(task)
-                elif task.can_retry():
-                    # 重试当前步骤
-                    task.increment_retry()
-                    current_step.status = PlanStepStatus.PENDING  # 重置为待执行
-                    task.transition_to(TaskStatus.RETRYING, f"Retry {task.retry_count}/{task.max_retries}")
-                    task.transition_to(TaskStatus.COMPLETED, "Retry task created")
+                if await self._handle_step_failure(
+                    task, current_step,
+                    revise_reason=f"Step failed: {tool_result.get('error')}",
+                    fail_error=tool_result.get("error"),
+                    need_revision=need_revision,
+                    allow_retry=True
+                ):
                     await self._create_next_plan_task(task)
-                else:
-                    # 任务失败
-                    task.result = {"success": False, "error": tool_result.get("error")}
-                    task.transition_to(TaskStatus.FAILED, "Step failed and cannot retry")
                     
         except Exception as e:
             await self.handle_error(task, e)
     
+    def _load_plan_template(self, task: UnifiedTask, goal: str, user_intent: str) -> Optional[TaskPlan]:
+        """查找相同目标的计划模板并生成新计划
+        
+        Args:
+            task: 任务对象
+            goal: 用户目标
+            user_intent: 用户意图
+            
+        Returns:
+            Optional[TaskPlan]: 命中时返回由模板生成的计划，否则返回None
+        """
+        if not self.enable_plan_cache:
+            return None
+        
+        template = self.plan_template_store.get(PlanTemplateStore.make_key(goal, user_intent))
+        if not template:
+            return None
+        
+        plan = TaskPlan(steps=[
+            PlanStep(
+                description=step["description"],
+                expected_tool=step.get("expected_tool"),
+                depends_on=step.get("depends_on")
+            )
+            for step in template
+        ])
+        
+        self._log(task, f"Plan template hit, reusing {len(plan.steps)} steps")
+        task.history.append({
+            "timestamp": time.time(),
+            "event": "plan_template_hit",
+            "steps": [step.to_dict() for step in plan.steps]
+        })
+        return plan
+    
+    def _save_plan_template(self, task: UnifiedTask, goal: str, user_intent: str) -> None:
+        """将已完成计划中成功的步骤（不含工具参数）保存为模板
+        
+        Args:
+            task: 任务对象
+            goal: 用户目标
+            user_intent: 用户意图
+        """
+        if not self.enable_plan_cache or not task.plan:
+            return
+        
+        completed = [step for step in task.plan.steps if step.status == PlanStepStatus.COMPLETED]
+        # 有步骤被跳过时索引会变化，不保留 depends_on（复用时按顺序执行）
+        keep_depends = len(completed) == len(task.plan.steps)
+        steps = [
+            {
+                "description": step.description,
+                "expected_tool": step.expected_tool,
+                "depends_on": step.depends_on if keep_depends else None
+            }
+            for step in completed
+        ]
+        self.plan_template_store.put(PlanTemplateStore.make_key(goal, user_intent), steps)
+    
+    @staticmethod
+    def _can_continue_inline(inline_deadline: Optional[float]) -> bool:
+        """是否可以在本次调用中继续执行下一步骤"""
+        return inline_deadline is not None and time.monotonic() < inline_deadline
+    
+    def _collect_ready_steps(self, plan: TaskPlan) -> List[int]:
+        """从当前步骤开始，收集可立即执行的连续步骤
+        
+        步骤需显式声明 depends_on 且所依赖的步骤均已完成；
+        未声明 depends_on 的步骤视为依赖之前所有步骤，到此为止
+        
+        Args:
+            plan: 任务计划
+            
+        Returns:
+            List[int]: 可并发执行的步骤索引
+        """
+        steps = plan.steps
+        ready = []
+        for index in range(plan.current_step_index, len(steps)):
+            step = steps[index]
+            if step.status != PlanStepStatus.PENDING or step.depends_on is None:
+                break
+            if not all(
+                0 <= dep < len(steps) and steps[dep].status == PlanStepStatus.COMPLETED
+                for dep in step.depends_on
+            ):
+                break
+            ready.append(index)
+        return ready
+    
+    async def _run_plan_step(self, task: UnifiedTask, step: PlanStep, step_index: int) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """决策并执行单个步骤（并发批次使用）
+        
+        Returns:
+            Tuple: (路由决策, 工具执行结果)，无需工具或置信度不足时结果为None
+        """
+        decision = await self._analyze_step(task, step.description, step_index)
+        if not decision.tool or decision.confidence < 0.6:
+            return decision, None
+        return decision, await self._execute_tool(task, decision)
+    
+    async def _execute_concurrent_steps(self, task: UnifiedTask, ready: List[int]) -> None:
+        """并发执行一批互不依赖的步骤
+        
+        各步骤的决策与工具调用通过asyncio.gather并发进行；
+        全部成功则越过整批步骤，否则回到第一个失败的步骤，按单步失败流程处理
+        
+        Args:
+            task: 任务对象
+            ready: 可并发执行的步骤索引
+        """
+        plan = task.plan
+        steps = [plan.steps[index] for index in ready]
+        self._log(task, f"Executing {len(ready)} independent steps concurrently: {[index + 1 for index in ready]}")
+        
+        started_at = time.time()
+        for step in steps:
+            step.status = PlanStepStatus.IN_PROGRESS
+            step.started_at = started_at
+        
+        # 家居任务上下文预获取
+        if self._is_home_automation_task(task):
+            self._log(task, "Detected home automation task, ensuring context")
+            await self._ensure_home_context(task)
+        
+        outcomes = await asyncio.gather(
+            *(self._run_plan_step(task, step, index) for index, step in zip(ready, steps)),
+            return_exceptions=True
+        )
+        
+        # 按原顺序记录结果
+        completed_at = time.time()
+        failed = []
+        last_result = None
+        tool_output = None
+        for index, step, outcome in zip(ready, steps, outcomes):
+            step.completed_at = completed_at
+            
+            if isinstance(outcome, BaseException):
+                step.execution_result = {"success": False, "error": str(outcome)}
+            else:
+                decision, tool_result = outcome
+                if tool_result is None:
+                    # 与单步执行一致：无需工具且高置信度视为完成，否则失败
+                    if not decision.tool and decision.confidence >= 0.6:
+                        step.execution_result = {"success": True, "reasoning": decision.reasoning}
+                    else:
+                        step.execution_result = {
+                            "success": False,
+                            "error": decision.reasoning or f"Low confidence: {decision.confidence}"
+                        }
+                else:
+                    self._record_history(task, decision, tool_result, index, ts=completed_at)
+                    step.execution_result = tool_result
+                    if tool_result["success"]:
+                        self._extract_query_result_to_context(task, decision, tool_result)
+                        tool_output = step.extracted_output = self._extract_tool_output(tool_result)
+                        last_result = tool_result
+            
+            if step.execution_result.get("success"):
+                step.status = PlanStepStatus.COMPLETED
+            else:
+                step.status = PlanStepStatus.FAILED
+                failed.append(index)
+        
+        if not failed:
+            for _ in ready:
+                plan.advance_step()
+            
+            task.result = {
+                "success": True,
+                "plan_completed": False,
+                "current_step": plan.current_step_index,
+                "total_steps": len(plan.steps),
+                "latest_result": last_result,
+                "result": tool_output,
+                "formatted_output": tool_output
+            }
+            self._log(task, f"Steps {[index + 1 for index in ready]} completed successfully")
+            task.transition_to(TaskStatus.COMPLETED, f"Step {plan.current_step_index} completed")
+            await self._create_next_plan_task(task)
+            return
+        
+        # 有步骤失败：回到第一个失败的步骤，其余失败步骤重置为待执行
+        first_failed = failed[0]
+        for index in failed[1:]:
+            plan.steps[index].status = PlanStepStatus.PENDING
+        plan.current_step_index = first_failed
+        failed_step = plan.steps[first_failed]
+        error = failed_step.execution_result.get("error")
+        self._log(task, f"Step {first_failed + 1} failed: {error}", "ERROR")
+        
+        need_revision = await self._verify_plan(task, failed_step, failed_step.execution_result)
+        if await self._handle_step_failure(
+            task, failed_step,
+            revise_reason=f"Step failed: {error}",
+            fail_error=error,
+            need_revision=need_revision,
+            allow_retry=True
+        ):
+            await self._create_next_plan_task(task)
+    
+    async def _complete_step_without_tool(self, task: UnifiedTask, step: PlanStep, decision,
+                                          inline_deadline: Optional[float]) -> bool:
+        """无需调用工具的步骤直接完成
+        
+        Returns:
+            bool: 是否继续在本次调用中执行下一步骤
+        """
+        self._log(task, f"Step completed (no tool needed, confidence={decision.confidence})")
+        step.status = PlanStepStatus.COMPLETED
+        step.completed_at = time.time()
+        step.execution_result = {"success": True, "reasoning": decision.reasoning}
+        
+        # 移动到下一步骤
+        task.plan.advance_step()
+        if self._can_continue_inline(inline_deadline):
+            return True
+        task.transition_to(TaskStatus.COMPLETED, f"Step {task.plan.current_step_index} completed")
+        
+        # 创建后续任务
+        await self._create_next_plan_task(task)
+        return False
+    
+    async def _handle_step_failure(self, task: UnifiedTask, step: PlanStep, revise_reason: str, fail_error: Any,
+                                   fail_reason: str = "Step failed and cannot retry",
+                                   execution_result: Optional[Dict[str, Any]] = None,
+                                   need_revision: bool = True, allow_retry: bool = False) -> bool:
+        """步骤失败后的统一处理：修订计划并越过该步骤 / 重试该步骤 / 任务失败
+        
+        Args:
+            task: 任务对象
+            step: 失败的步骤
+            revise_reason: 修订计划的原因
+            fail_error: 无法修订或重试时写入 task.result 的错误信息
+            fail_reason: 无法修订或重试时的状态转换原因
+            execution_result: 提供时将步骤标记为失败并记录该执行结果
+            need_revision: 是否需要修订计划（修订次数未用完时生效）
+            allow_retry: 无法修订时是否允许重试当前步骤
+            
+        Returns:
+            bool: 是否需要创建后续计划任务
+        """
+        if execution_result is not None:
+            step.status = PlanStepStatus.FAILED
+            step.completed_at = time.time()
+            step.execution_result = execution_result
+        
+        if need_revision and task.plan.revision_count < self.max_plan_revisions:
+            await self._revise_plan(task, revise_reason)
+            task.plan.advance_step()
+            task.transition_to(TaskStatus.COMPLETED, "Step failed, plan revised")
+            return True
+        
+        if allow_retry and task.can_retry():
+            task.increment_retry()
+            step.status = PlanStepStatus.PENDING  # 重置为待执行
+            task.transition_to(TaskStatus.RETRYING, f"Retry {task.retry_count}/{task.max_retries}")
+            task.transition_to(TaskStatus.COMPLETED, "Retry task created")
+            return True
+        
+        task.result = {"success": False, "error": fail_error}
+        task.transition_to(TaskStatus.FAILED, fail_reason)
+        return False
+    
+    @staticmethod
+    def _extract_tool_output(tool_result: Any) -> Any:
+        """提取工具执行结果中的实际内容
+        
+        优先使用 formatted_output，其次是 result（result 为字典且含 formatted_output 时取后者）
+        """
+        if not isinstance(tool_result, dict):
+            return None
+        
+        if "formatted_output" in tool_result:
+            return tool_result["formatted_output"]
+        
+        result_data = tool_result.get("result")
+        if isinstance(result_data, dict) and "formatted_output" in result_data:
+            return result_data["formatted_output"]
+        return result_data
+    
     async def _create_next_plan_task(self, task: UnifiedTask) -> None:
         """创建后续计划任务
         
@@ -338,13 +962,15 @@ class McpExecutor(BaseTaskExecutor):
             return
         
         # 创建新任务，继承 plan
+        # 计划模式下 execution_data 只读，后续任务直接共享；
+        # context 会被各步骤写入（步骤结果、家居上下文），仍需浅拷贝
         next_task = UnifiedTask(
             task_type=TaskType.MCP_CALL,
             priority=task.priority,
             timeout=task.timeout,
             max_retries=task.max_retries,
-            context=task.context.copy(),
-            execution_data=task.execution_data.copy(),
+            context=task.context.copy() if task.context else {},
+            execution_data=task.execution_data,
             plan=task.plan  # 继承计划
         )
         
@@ -509,7 +1135,7 @@ class McpExecutor(BaseTaskExecutor):
         router_context = {
             "goal": goal,
             "current_step": current_step,
-            "history": task.history,
+            "history": list(itertools.islice(reversed(task.history), self.ROUTER_HISTORY_WINDOW))[::-1],
             "environment": task.context
         }
         
@@ -538,23 +1164,67 @@ class McpExecutor(BaseTaskExecutor):
             return await self._execute_local_tool(task, decision)
         
         # 原有逻辑：远程 MCP 工具
-        connection = self.connections.get(decision.server_id)
-        if not connection:
+        call_tool = self._get_tool_caller(decision.server_id)
+        if not call_tool:
             return {"success": False, "error": f"Connection {decision.server_id} not found"}
         
+        # 连接断开时先尝试重连（重连不替换连接对象，缓存的 call_tool 仍然有效）
+        await self.connection_pool.get(decision.server_id)
+        
         # 调用工具
         self._log(task, f"Calling tool {decision.tool} on {decision.server_id}")
-        result = await connection.call_tool(decision.tool, decision.arguments)
+        async with self._get_server_semaphore(decision.server_id):
+            result = await call_tool(decision.tool, decision.arguments)
         # 方案二：规范化结果解析
         result = self._normalize_tool_result(result, decision.tool)
         
         if result.get("success"):
             self._log(task, f"Tool call succeeded")
+            if decision.tool in _HOME_CONTROL_TOOLS:
+                self._patch_home_context(task, decision)
         else:
             self._log(task, f"Tool call failed: {result.get('error')}", "ERROR")
         
         return result
 
+    def _get_tool_caller(self, server_id: str) -> Optional[Callable]:
+        """获取指定 Server 连接的 call_tool 方法（按 server_id 缓存）"""
+        call_tool = self._tool_callers.get(server_id)
+        if call_tool is None:
+            connection = self.connections.get(server_id)
+            if not connection:
+                return None
+            call_tool = self._tool_callers[server_id] = connection.call_tool
+        return call_tool
+    
+    def _get_server_semaphore(self, server_id: str) -> asyncio.Semaphore:
+        """获取指定 Server 的并发调用限制"""
+        semaphore = self._server_semaphores.get(server_id)
+        if semaphore is None:
+            semaphore = self._server_semaphores[server_id] = asyncio.Semaphore(self.max_inflight_per_server)
+        return semaphore
+    
+    def reset_tool_callers(self) -> None:
+        """清空 call_tool 缓存、已解析的家居 Server 与工具列表缓存（替换 connections 中的连接后调用）"""
+        self._tool_callers.clear()
+        self._home_server_id = None
+        self._tools_cache = None
+    
+    def _resolve_home_server(self) -> Optional[str]:
+        """查找提供 GetLiveContext 的 server（结果缓存，连接被移除后重新查找）"""
+        server_id = self._home_server_id
+        if server_id is not None and server_id in self.connections:
+            return server_id
+        
+        self._home_server_id = None
+        for server_id in self.connections:
+            # 这里简化处理，假设有home-assistant server
+            lowered = server_id.lower()
+            if "home" in lowered or "hass" in lowered:
+                self._home_server_id = server_id
+                break
+        return self._home_server_id
+
     # 👇 新增：本地工具执行方法
     async def _execute_local_tool(self, task: UnifiedTask, decision) -> Dict[str, Any]:
         """执行本地工具
@@ -604,54 +1274,48 @@ class McpExecutor(BaseTaskExecutor):
                 "error": error_msg
             }
     
-    def _record_history(self, task: UnifiedTask, decision, result: Dict[str, Any], current_step: int) -> None:
-        """记录执行历史"""
+    def _record_history(self, task: UnifiedTask, decision, result: Dict[str, Any], current_step: int,
+                        ts: Optional[float] = None) -> None:
+        """记录执行历史
+        
+        空的 server_id / arguments 不写入条目（读取方均使用 .get()），
+        result 保持完整（TaskDispatcher 从中读取最终输出）；
+        失败时同时记录 error_pattern，后续重试 / 刷新判断直接读取，无需再次分类
+        
+        Args:
+            ts: 记录时间戳，调用方已取得当前时间时直接传入
+        """
         entry = {
             "step": current_step,
-            "timestamp": datetime.now().timestamp(),
+            "timestamp": ts if ts is not None else time.time(),
             "action": "call_tool",
-            "server_id": decision.server_id,
             "tool": decision.tool,
-            "arguments": decision.arguments,
             "result": result
         }
+        if decision.server_id:
+            entry["server_id"] = decision.server_id
+        if decision.arguments:
+            entry["arguments"] = decision.arguments
+        if not result.get("success"):
+            entry["error_pattern"] = self._classify_error_pattern(str(result.get("error", "")))
         task.history.append(entry)
     
     def _classify_tool_type(self, tool_name: str) -> str:
-        """分类工具类型"""
-        query_keywords = ["Get", "List", "Query", "Find", "Search", "Fetch", "Describe", "Show"]
-        action_keywords = ["Set", "Create", "Update", "Delete", "Turn", "Start", "Stop", "Execute", "Send", "Run", "Call", "Invoke"]
-        
-        for keyword in query_keywords:
-            if keyword in tool_name:
-                return "query"
-        
-        for keyword in action_keywords:
-            if keyword in tool_name:
-                return "action"
-        
-        return "hybrid"
+        """分类工具类型（结果按工具名缓存）"""
+        return _classify_tool_type_cached(tool_name)
     
     def _classify_error_pattern(self, error_info: str) -> str:
-        """分类错误模式"""
-        error_lower = error_info.lower()
-        
-        if any(keyword in error_lower for keyword in ["not found", "does not exist", "unknown", "no such"]):
-            return "resource_not_found"
-        
-        if any(keyword in error_lower for keyword in ["invalid", "incorrect", "malformed", "bad request"]):
-            return "invalid_parameter"
-        
-        if any(keyword in error_lower for keyword in ["permission", "forbidden", "unauthorized", "access denied"]):
-            return "permission_denied"
-        
-        if any(keyword in error_lower for keyword in ["not support", "unsupported", "unavailable"]):
-            return "tool_unsupported"
-        
-        if any(keyword in error_lower for keyword in ["timeout", "network", "connection"]):
-            return "network_issue"
-        
-        return "unknown_error"
+        """分类错误模式（较短的错误信息按原文缓存）"""
+        if len(error_info) > _ERROR_CACHE_MAX_LEN:
+            return _classify_error_pattern_impl(error_info)
+        return _classify_error_pattern_cached(error_info)
+    
+    def _history_error_pattern(self, entry: Dict[str, Any]) -> str:
+        """读取历史条目的错误模式（条目未记录时现场分类）"""
+        error_pattern = entry.get("error_pattern")
+        if error_pattern is None:
+            error_pattern = self._classify_error_pattern(str(entry.get("result", {}).get("error", "")))
+        return error_pattern
     
     def _extract_result_summary(self, decision, result: Dict[str, Any]) -> str:
         """提取执行结果摘要"""
@@ -709,8 +1373,11 @@ class McpExecutor(BaseTaskExecutor):
             else:
                 next_goal = "继续执行后续操作（如有）"
         else:
-            error_info = result.get("error", "")
-            error_pattern = self._classify_error_pattern(str(error_info))
+            # 本次结果已记录到历史时直接读取其错误模式
+            if task.history and task.history[-1].get("result") is result:
+                error_pattern = self._history_error_pattern(task.history[-1])
+            else:
+                error_pattern = self._classify_error_pattern(str(result.get("error", "")))
             
             if error_pattern == "resource_not_found":
                 next_goal = "重新查询可用资源信息，然后使用正确的标识符重试"
@@ -760,10 +1427,7 @@ class McpExecutor(BaseTaskExecutor):
             # 改动7：重试时检查错误类型，决定是否强制刷新上下文
             # 从当前任务历史中获取最后一次失败的错误
             if current_task.history:
-                last_entry = current_task.history[-1]
-                result = last_entry.get("result", {})
-                error_info = str(result.get("error", ""))
-                error_pattern = self._classify_error_pattern(error_info)
+                error_pattern = self._history_error_pattern(current_task.history[-1])
                 
                 if error_pattern in ["resource_not_found", "invalid_parameter"]:
                     next_task.context["force_refresh_home_context"] = True
@@ -785,38 +1449,18 @@ class McpExecutor(BaseTaskExecutor):
         Returns:
             str: 任务类型 - "query_only" / "action_task" / "unknown"
         """
-        # 查询动词
-        query_verbs = ["查看", "查询", "显示", "获取", "列出", "看", "看看", 
-                       "是多少", "是什么", "有哪些", "告诉我"]
-        
-        # 操作动词
-        action_verbs = ["打开", "关闭", "设置", "调节", "控制", "开启", "关掉",
-                        "关上", "启动", "停止", "发送", "创建", "删除", "修改",
-                        "拉上", "拉开", "调整", "增加", "减少"]
-        
-        has_query = any(verb in user_intent for verb in query_verbs)
-        has_action = any(verb in user_intent for verb in action_verbs)
-        
-        if has_action:
-            # 包含操作动词，视为操作任务
-            return "action_task"
-        elif has_query:
-            # 仅包含查询动词，视为纯查询任务
-            return "query_only"
-        else:
-            # 无法判断，默认为操作任务（保守策略）
-            return "unknown"
+        return _classify_task_intent_cached(user_intent)
     
     # ================== 家居任务上下文预获取 ==================
     
     def _is_home_automation_task(self, task: UnifiedTask) -> bool:
         """判断是否为家居控制任务
         
-        识别规则：
+        识别规则（按开销从低到高依次判断，任一命中即返回）：
         0. 任务类型明确标记为home_automation
-        1. 用户意图包含家居动作词 + 家居实体词
-        2. 工具历史中出现Home Assistant相关工具
-        3. 上下文标记home_automation=true
+        1. 上下文标记home_automation=true
+        2. 用户意图包含家居动作词 + 家居实体词
+        3. 工具历史中出现Home Assistant相关工具
         
         Args:
             task: 任务对象
@@ -832,41 +1476,26 @@ class McpExecutor(BaseTaskExecutor):
         if task.context.get("home_automation"):
             return True
         
-        # 规则2：检查工具历史
-        hass_tools = ["HassGetLiveContext", "HassTurnOn", "HassTurnOff", 
-                      "HassSetPosition", "HassGetState", "HassListEntities",
-                      "HassSetTemperature", "HassSetBrightness"]
-        for entry in task.history:
-            if entry.get("action") == "call_tool":
-                tool_name = entry.get("tool", "")
-                if any(hass_tool in tool_name for hass_tool in hass_tools):
-                    return True
-        
-        # 改动1：规则3 - 扩展关键词匹配
+        # 改动1：规则2 - 扩展关键词匹配（同一意图文本的结果会被缓存）
         user_intent = task.execution_data.get("user_intent", "")
         if not user_intent:
             user_intent = task.execution_data.get("goal", "")
         
-        # 动作词（扩展）
-        action_keywords = ["打开", "关闭", "调节", "设置", "控制", 
-                          "开启", "关掉", "关上", "启动", "停止",
-                          "拉上", "拉开", "调整", "增加", "减少"]
-        # 家居实体词（扩展）
-        entity_keywords = ["灯", "空调", "设备", "风扇", "温度", "亮度", 
-                          "暖气", "加湿器",
-                          "窗帘", "门窗", "百叶窗", "床帘",
-                          "电视", "插座"]
+        if _is_home_automation_intent(user_intent):
+            return True
         
-        has_action = any(keyword in user_intent for keyword in action_keywords)
-        has_entity = any(keyword in user_intent for keyword in entity_keywords)
+        # 规则3：检查工具历史（从最近的记录开始）
+        for entry in reversed(task.history):
+            if entry.get("action") == "call_tool" and _is_hass_tool(entry.get("tool", "")):
+                return True
         
-        return has_action and has_entity
+        return False
     
     async def _ensure_home_context(self, task: UnifiedTask) -> bool:
         """确保家居上下文已获取
         
         检查是否需要调用GetLiveContext：
-        - 首次执行或缓存过期
+        - 首次执行或缓存过期（新任务首次执行时优先使用其他任务在 TTL 内获取的上下文）
         - 上一轮操作失败且错误提示设备不存在
         - 强制刷新标志被设置
         
@@ -876,7 +1505,9 @@ class McpExecutor(BaseTaskExecutor):
         Returns:
             bool: 是否更新了上下文
         """
-        current_time = datetime.now().timestamp()
+        # TTL 使用单调时钟计算（不受系统时间调整影响）
+        current_time = time.monotonic()
+        need_refresh = False
         
         # 改动2：检查强制刷新标志
         force_refresh = task.context.get("force_refresh_home_context", False)
@@ -898,14 +1529,12 @@ class McpExecutor(BaseTaskExecutor):
                 self._log(task, "Home context not found, fetching for the first time")
             
             # 检查是否因设备不存在错误需要刷新
-            need_refresh = False
             if task.history:
                 last_entry = task.history[-1]
                 if last_entry.get("action") == "call_tool":
                     result = last_entry.get("result", {})
                     if not result.get("success"):
-                        error_msg = str(result.get("error", "")).lower()
-                        if any(keyword in error_msg for keyword in ["not found", "does not exist", "unknown"]):
+                        if self._history_error_pattern(last_entry) == "resource_not_found":
                             need_refresh = True
                             self._log(task, "Device not found error detected, refreshing context")
             
@@ -913,25 +1542,29 @@ class McpExecutor(BaseTaskExecutor):
             if home_context and not need_refresh:
                 return False
         
+        # 查找包含GetLiveContext的server
+        get_live_context_server = self._resolve_home_server()
+        
+        # 首次执行且无需强制刷新：复用 TTL 内已获取的家居上下文
+        if not force_refresh and not need_refresh and get_live_context_server:
+            cached = self._home_context_cache.get(get_live_context_server)
+            if cached and current_time - cached[0] < self.home_context_ttl:
+                task.context["home_live_context"] = cached[1]
+                task.context["home_automation"] = True
+                self._log(task, "Using shared home context")
+                return True
+        
         # 调用GetLiveContext
         try:
             self._log(task, "Calling GetLiveContext to fetch device information")
             
-            # 查找包含GetLiveContext的server
-            get_live_context_server = None
-            for server_id, connection in self.connections.items():
-                # 假设我们可以通过connection检查工具
-                # 这里简化处理，假设有home-assistant server
-                if "home" in server_id.lower() or "hass" in server_id.lower():
-                    get_live_context_server = server_id
-                    break
-            
             if not get_live_context_server:
                 self._log(task, "GetLiveContext server not found, skipping context fetch", "WARNING")
                 return False
             
-            connection = self.connections[get_live_context_server]
-            result = await connection.call_tool("GetLiveContext", {})
+            await self.connection_pool.get(get_live_context_server)
+            async with self._get_server_semaphore(get_live_context_server):
+                result = await self._get_tool_caller(get_live_context_server)("GetLiveContext", {})
             
             if not result.get("success"):
                 self._log(task, f"GetLiveContext failed: {result.get('error')}", "WARNING")
@@ -943,14 +1576,16 @@ class McpExecutor(BaseTaskExecutor):
             
             print(f"devices_info: {devices_info}")
             
-            # 注入到context
+            # 注入到context（timestamp 为 time.monotonic() 获取时间，仅用于 TTL 判断）
+            fetched_at = time.monotonic()
             task.context["home_live_context"] = {
-                "timestamp": current_time,
+                "timestamp": fetched_at,
                 "devices": devices_info.get("devices", []),
                 "areas": devices_info.get("areas", []),
                 "raw_data": raw_data
             }
             task.context["home_automation"] = True
+            self._home_context_cache[get_live_context_server] = (fetched_at, task.context["home_live_context"])
             
             self._log(task, f"Home context updated: {len(devices_info.get('devices', []))} devices found")
             return True
@@ -959,6 +1594,89 @@ class McpExecutor(BaseTaskExecutor):
             self._log(task, f"Error fetching home context: {e}", "WARNING")
             return False
     
+    @staticmethod
+    def _iter_live_context_devices(text_content: str):
+        """逐行扫描 GetLiveContext 的 YAML 设备列表
+        
+        每个设备块以 "- names:" 开始，依次包含 domain、state，可选 areas 与 attributes；
+        缺少 domain 或 state 的块会被忽略
+        
+        Yields:
+            Tuple: (names, domain, state, areas, current_position)，缺省的 areas 为 ""，current_position 为 None
+        """
+        device = None
+        in_attributes = False
+        
+        for line in text_content.split("\n"):
+            stripped = line.strip()
+            
+            if stripped.startswith("- names:"):
+                if device and device.get("domain") and device.get("state"):
+                    yield (device["names"], device["domain"], device["state"],
+                           device.get("areas", ""), device.get("current_position"))
+                device = {"names": stripped[len("- names:"):].strip()}
+                in_attributes = False
+                continue
+            
+            if device is None:
+                continue
+            
+            key, sep, value = stripped.partition(":")
+            if not sep:
+                continue
+            value = value.strip()
+            
+            if in_attributes:
+                # 解析attributes中的current_position（用于窗帘等）
+                if key == "current_position" and value:
+                    device["current_position"] = value.strip("'").strip()
+            elif key == "attributes":
+                in_attributes = True
+            elif key == "domain":
+                device["domain"] = value
+            elif key == "state":
+                device["state"] = value.strip("'\"")
+            elif key == "areas":
+                device["areas"] = value
+        
+        if device and device.get("domain") and device.get("state"):
+            yield (device["names"], device["domain"], device["state"],
+                   device.get("areas", ""), device.get("current_position"))
+    
+    def _patch_home_context(self, task: UnifiedTask, decision) -> None:
+        """控制类工具调用成功后，就地更新家居上下文中对应设备的状态
+        
+        home_live_context 与跨任务共享的缓存是同一对象，更新后后续任务也能看到最新状态；
+        无法定位到单个设备时（如按区域批量控制）丢弃共享缓存，下一个任务重新获取
+        """
+        home_context = task.context.get("home_live_context")
+        if not home_context:
+            return
+        
+        arguments = decision.arguments or {}
+        target = arguments.get("entity_id") or arguments.get("name")
+        matched = [
+            device for device in home_context.get("devices", [])
+            if target and target in (device.get("entity_id"), device.get("friendly_name"))
+        ]
+        
+        if len(matched) != 1:
+            for server_id, (_, cached) in list(self._home_context_cache.items()):
+                if cached is home_context:
+                    del self._home_context_cache[server_id]
+            return
+        
+        device = matched[0]
+        is_cover = device.get("device_type") == "cover"
+        if decision.tool == "HassTurnOn":
+            device["state"] = "open" if is_cover else "on"
+        elif decision.tool == "HassTurnOff":
+            device["state"] = "closed" if is_cover else "off"
+        elif decision.tool == "HassSetPosition" and "position" in arguments:
+            device["position"] = str(arguments["position"])
+        
+        self._log(task, f"Home context patched: {device.get('entity_id')} after {decision.tool}")
+    
     def _parse_live_context(self, raw_data: Any) -> Dict[str, Any]:
         """解析GetLiveContext返回的设备信息
         
@@ -972,9 +1690,6 @@ class McpExecutor(BaseTaskExecutor):
         areas = set()
         
         try:
-            import json
-            import re
-            
             # 步骤1: 提取文本内容
             text_content = None
             
@@ -1004,31 +1719,23 @@ class McpExecutor(BaseTaskExecutor):
                 return {"devices": [], "areas": []}
             
             # 步骤2: 解析嵌套的JSON（如果text_content是JSON字符串）
-            try:
-                parsed_json = json.loads(text_content)
-                if isinstance(parsed_json, dict):
-                    # 提取result字段（Home Assistant格式）
-                    if "result" in parsed_json:
-                        text_content = parsed_json["result"]
-                    # 或者直接包含entities
-                    elif "entities" in parsed_json or "devices" in parsed_json:
-                        return self._parse_entities_dict(parsed_json)
-            except (json.JSONDecodeError, TypeError):
-                # 不是JSON，继续作为纯文本处理
-                pass
-            
-            # 步骤3: 解析YAML格式的设备列表
-            # 使用正则表达式提取每个设备块
-            device_pattern = r'-\s+names:\s+([^\n]+)\n\s+domain:\s+(\w+)\n\s+state:\s+([^\n]+)(?:\n\s+areas:\s+([^\n]+))?(?:\n\s+attributes:([^-]*))?'
-            matches = re.finditer(device_pattern, text_content, re.MULTILINE)
-            
-            for match in matches:
-                names_str = match.group(1).strip()
-                domain = match.group(2).strip()
-                state = match.group(3).strip().strip("'\"")
-                areas_str = match.group(4).strip() if match.group(4) else ""
-                attributes_str = match.group(5) if match.group(5) else ""
-                
+            # 只有以 "{" 开头的文本才尝试解析，YAML 文本直接进入步骤3，省去一次解析失败
+            if not isinstance(text_content, str) or _JSON_OBJECT_START_RE.match(text_content):
+                try:
+                    parsed_json = fast_json.loads(text_content)
+                    if isinstance(parsed_json, dict):
+                        # 提取result字段（Home Assistant格式）
+                        if "result" in parsed_json:
+                            text_content = parsed_json["result"]
+                        # 或者直接包含entities
+                        elif "entities" in parsed_json or "devices" in parsed_json:
+                            return self._parse_entities_dict(parsed_json)
+                except (ValueError, TypeError):
+                    # 不是JSON（两种实现的 JSONDecodeError 均为 ValueError），继续作为纯文本处理
+                    pass
+            
+            # 步骤3: 解析YAML格式的设备列表（逐行扫描提取每个设备块）
+            for names_str, domain, state, areas_str, current_position in self._iter_live_context_devices(text_content):
                 # 解析names（可能是逗号分隔的多个名称）
                 names_list = [n.strip() for n in names_str.split(',')]
                 friendly_name = names_list[0] if names_list else ""
@@ -1038,8 +1745,8 @@ class McpExecutor(BaseTaskExecutor):
                 entity_name = None
                 for name in names_list:
                     # 检查是否为纯英文
-                    if re.match(r'^[a-zA-Z0-9_-]+$', name):
-                        entity_name = name.lower().replace(' ', '_').replace('-', '_')
+                    if _ENGLISH_NAME_RE.match(name):
+                        entity_name = name.lower().translate(_ENTITY_NAME_TRANS)
                         break
                 if not entity_name:
                     # 如果没有英文名，使用第一个名称
@@ -1051,13 +1758,6 @@ class McpExecutor(BaseTaskExecutor):
                 device_areas = [a.strip() for a in areas_str.split(',')] if areas_str else []
                 primary_area = device_areas[0] if device_areas else ""
                 
-                # 解析attributes中的current_position（用于窗帘等）
-                current_position = None
-                if attributes_str:
-                    position_match = re.search(r"current_position:\s*'?([^'\n]+)'?", attributes_str)
-                    if position_match:
-                        current_position = position_match.group(1).strip()
-                
                 # 构建设备对象
                 device = {
                     "entity_id": entity_id,
@@ -1074,9 +1774,8 @@ class McpExecutor(BaseTaskExecutor):
                 devices.append(device)
                 
                 # 收集所有区域
-                for area in device_areas:
-                    if area:
-                        areas.add(area)
+                if device_areas:
+                    areas.update(filter(None, device_areas))
             
             print(f"[McpExecutor] Parsed {len(devices)} devices from live context")
             
@@ -1085,9 +1784,10 @@ class McpExecutor(BaseTaskExecutor):
             import traceback
             traceback.print_exc()
         
+        # 区域排序输出，保证相同设备列表得到相同结果
         return {
             "devices": devices,
-            "areas": list(areas)
+            "areas": sorted(areas)
         }
     
     def _parse_entities_dict(self, data: dict) -> Dict[str, Any]:
@@ -1119,7 +1819,7 @@ class McpExecutor(BaseTaskExecutor):
         
         return {
             "devices": devices,
-            "areas": list(areas)
+            "areas": sorted(areas)
         }
 
     
@@ -1142,45 +1842,38 @@ class McpExecutor(BaseTaskExecutor):
             return original_goal
         
         # 构建设备信息摘要（最多显示10个设备）
-        device_summary = []
-        for device in devices[:10]:
-            entity_id = device.get("entity_id", "")
-            friendly_name = device.get("friendly_name", "")
-            area = device.get("area", "")
-            state = device.get("state", "")
-            device_type = device.get("device_type", "")
-            
-            summary = f"- entity_id: {entity_id}"
-            if friendly_name:
-                summary += f"（友好名称：{friendly_name}"
-                if area:
-                    summary += f"，区域：{area}"
-                if state:
-                    summary += f"，当前状态：{state}"
-                # 改动3：窗帘设备的position信息
-                if device_type == "cover" and "position" in device:
-                    position = device.get("position", "")
-                    summary += f"，位置：{position}"
-                summary += "）"
-            
-            device_summary.append(summary)
-        
-        # 改动3：添加参数使用规范
-        enhanced_goal = f"""{original_goal}
+        device_summary = "\n".join(map(self._format_device_line, devices[:10]))
+        
+        return f"""{original_goal}
 
 【可用设备信息】
-{chr(10).join(device_summary)}
+{device_summary}
 
-【参数使用规范】
-1. 必须使用设备列表中的实际entity_id，不得使用用户输入的模糊名称
-2. 如需area参数，必须使用设备信息中的实际区域名（如"实验室"），禁止使用"当前位置"等占位符
-3. 如需name参数，优先使用entity_id，其次使用友好名称
-4. 窗帘类设备的position取值：0表示完全打开，100表示完全关闭
+{self._GOAL_RULES}
 
 【执行目标】
 根据用户描述"{original_goal}"，从设备列表中匹配最合适的设备，调用相应工具完成操作。"""
-        
-        return enhanced_goal
+    
+    @staticmethod
+    def _format_device_line(device: Dict[str, Any]) -> str:
+        """格式化单个设备的摘要行（仅有友好名称时附带区域、状态、位置）"""
+        line = f"- entity_id: {device.get('entity_id', '')}"
+        friendly_name = device.get("friendly_name")
+        if not friendly_name:
+            return line
+        
+        area = device.get("area")
+        state = device.get("state")
+        # 改动3：窗帘设备的position信息
+        has_position = device.get("device_type") == "cover" and "position" in device
+        return "".join((
+            line,
+            f"（友好名称：{friendly_name}",
+            f"，区域：{area}" if area else "",
+            f"，当前状态：{state}" if state else "",
+            f"，位置：{device['position']}" if has_position else "",
+            "）",
+        ))
     
     # ================== 工具结果精准解析 ==================
     
@@ -1238,55 +1931,12 @@ class McpExecutor(BaseTaskExecutor):
         Returns:
             str: 错误消息
         """
-        # 处理CallToolResult对象或字典    
-        # 方式1: 如果是字典格式（已序列化的CallToolResult）
-        if isinstance(error_data, dict):
-            content = error_data.get('content')
-            if content:
-                if isinstance(content, list) and len(content) > 0:
-                    first_content = content[0]
-                    # 检查是否是TextContent对象
-                    if hasattr(first_content, 'text'):
-                        return first_content.text
-                    # 或者是字典格式的TextContent
-                    elif isinstance(first_content, dict) and 'text' in first_content:
-                        text = first_content['text']
-                        return text
-        
-        # 方式2: 如果是对象格式（未序列化的CallToolResult）
-        if hasattr(error_data, 'content'):
-            # 从Content对象中提取text
-            content_list = error_data.content
-            if content_list and len(content_list) > 0:
-                first_content = content_list[0]
-                if hasattr(first_content, 'text'):
-                    return first_content.text
-        
-        # 方式3: 备用处理 - 尝试其他字段（向后兼容）
-        if isinstance(error_data, dict):
-            # 优先级1: message字段
-            if "message" in error_data:
-                return str(error_data["message"])
-            
-            # 优先级2: error字段
-            if "error" in error_data:
-                error_value = error_data["error"]
-                if isinstance(error_value, str):
-                    return error_value
-                elif isinstance(error_value, dict):
-                    return error_value.get("message", str(error_value))
-            
-            # 优先级3: 将整个字典转为字符串（截取前200字符）
-            try:
-                import json
-                error_str = json.dumps(error_data, ensure_ascii=False, default=str)
-                if len(error_str) > 200:
-                    return error_str[:200] + "..."
-                return error_str
-            except:
-                pass
-        
-        # 优先级4: 通用提示
+        for extractor in _ERROR_MESSAGE_EXTRACTORS:
+            message = extractor(error_data)
+            if message is not None:
+                return message
+        
+        # 均未提取到：通用提示
         return "工具执行失败，但未返回详细错误信息"
     
     # ================== 任务完成度智能评估 ==================
@@ -1309,7 +1959,8 @@ class McpExecutor(BaseTaskExecutor):
         """
         try:
             tool_name = decision.tool
-            tool_type = self._classify_tool_type(tool_name)
+            behavior = _tool_behavior(tool_name)
+            tool_type = behavior.tool_type
             
             # 改动5：规则1 - 查询类工具场景判断（区分纯查询与准备查询）
             if tool_type == "query":
@@ -1348,14 +1999,14 @@ class McpExecutor(BaseTaskExecutor):
                 content = result.get("content") or result.get("result", {})
                 
                 # 对于家居控制工具，检查状态
-                if "Turn" in tool_name or "Set" in tool_name:
+                if behavior.verify_state:
                     state = None
                     if isinstance(content, dict):
                         state = content.get("state")
                     
                     if state:
                         # 有状态验证，高置信度完成
-                        expected_state = self._infer_expected_state(tool_name)
+                        expected_state = behavior.expected_state
                         if expected_state and state == expected_state:
                             return CompletionJudgment(
                                 completed=True,
@@ -1449,7 +2100,7 @@ class McpExecutor(BaseTaskExecutor):
             
             # 记录到历史
             task.history.append({
-                "timestamp": datetime.now().timestamp(),
+                "timestamp": time.time(),
                 "event": "plan_generated",
                 "steps": [step.to_dict() for step in plan.steps]
             })
@@ -1477,46 +2128,37 @@ class McpExecutor(BaseTaskExecutor):
         Returns:
             str: Prompt 文本
         """
-        tools_summary = "\n".join([f"- {tool.get('name', 'Unknown')}: {tool.get('description', '')}" for tool in available_tools[:20]])
+        # 同名工具（如多个 Server 提供）只列一次；描述截断，避免单个冗长描述撑大 Prompt
+        unique_tools: Dict[str, str] = {}
+        for tool in available_tools:
+            if len(unique_tools) >= self._PLAN_PROMPT_MAX_TOOLS:
+                break
+            unique_tools.setdefault(tool.get("name", "Unknown"), tool.get("description") or "")
+        
+        tools_summary = "\n".join(
+            f"- {name}: {description[:self._TOOL_DESC_MAX]}" for name, description in unique_tools.items()
+        )
         
-        prompt = f"""你是一个任务规划助手。根据用户目标和可用工具，生成一个详细的执行计划。
-
-**用户目标**：
-{goal}
-
-**可用工具**：
-{tools_summary}
-
-**计划要求**：
-1. 生成 3-8 个执行步骤
-2. 步骤应按逻辑顺序排列（如：先查询后操作）
-3. 每个步骤包含：
-   - description: 步骤描述（自然语言）
-   - expected_tool: 预期使用的工具名称（可选）
-4. 步骤粒度适中，避免过细或过粗
-
-**输出格式** (必须为 JSON)：
-```json
-{{
-  "steps": [
-    {{
-      "description": "步骤1描述",
-      "expected_tool": "工具名称或null"
-    }},
-    {{
-      "description": "步骤2描述",
-      "expected_tool": "工具名称或null"
-    }}
-  ]
-}}
-```
-
-请生成计划：
-"""
-        return prompt
+        return self._PLAN_PROMPT_TEMPLATE.format(goal=goal, tools_summary=tools_summary)
     
     async def _get_available_tools(self) -> list:
-        """获取可用工具列表
+        """获取可用工具列表（TTL 内复用上次获取的结果，调用方不得修改返回的列表）
+        
+        Returns:
+            list: 工具列表
+        """
+        cached = self._tools_cache
+        if cached is not None and time.monotonic() - cached[0] < self.tools_cache_ttl:
+            return cached[1]
+        
+        tools = await self._fetch_available_tools()
+        # 获取失败（空列表）时不缓存，下次重新获取
+        if tools:
+            self._tools_cache = (time.monotonic(), tools)
+        return tools
+    
+    async def _fetch_available_tools(self) -> list:
+        """从 Router 或各连接获取可用工具列表
         
         Returns:
             list: 工具列表
@@ -1526,18 +2168,30 @@ class McpExecutor(BaseTaskExecutor):
             if hasattr(self.router, 'get_available_tools'):
                 return await self.router.get_available_tools()
             
-            # 备用：从 connections 收集工具
+            # 备用：从 connections 并发收集工具（单个 Server 失败不影响其他 Server）
+            servers = [
+                (server_id, connection) for server_id, connection in self.connections.items()
+                if hasattr(connection, 'list_tools')
+            ]
+            results = await asyncio.gather(
+                *(connection.list_tools() for _, connection in servers),
+                return_exceptions=True
+            )
+            
             tools = []
-            for server_id, connection in self.connections.items():
-                if hasattr(connection, 'list_tools'):
-                    server_tools = await connection.list_tools()
-                    if server_tools:
-                        for tool in server_tools:
-                            tools.append({
-                                "name": tool.get("name", ""),
-                                "description": tool.get("description", ""),
-                                "server_id": server_id
-                            })
+            for (server_id, _), server_tools in zip(servers, results):
+                if isinstance(server_tools, BaseException):
+                    print(f"[McpExecutor] Error listing tools from {server_id}: {server_tools}")
+                    continue
+                if server_tools:
+                    tools.extend(
+                        {
+                            "name": tool.get("name", ""),
+                            "description": tool.get("description", ""),
+                            "server_id": server_id
+                        }
+                        for tool in server_tools
+                    )
             return tools
         except Exception as e:
             print(f"[McpExecutor] Error getting available tools: {e}")
@@ -1546,6 +2200,35 @@ class McpExecutor(BaseTaskExecutor):
     async def _call_llm_for_plan(self, prompt: str) -> Dict[str, Any]:
         """调用 LLM 生成计划
         
+        相同 Prompt（如重试时重复的修订请求）在有效期内直接返回缓存的计划数据副本
+        
+        Args:
+            prompt: Prompt 文本
+            
+        Returns:
+            Dict[str, Any]: LLM 返回的计划数据
+        """
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        cached = self._plan_response_cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < self._PLAN_RESPONSE_CACHE_TTL:
+                self._plan_response_cache.move_to_end(key)
+                return copy.deepcopy(cached[1])
+            del self._plan_response_cache[key]
+        
+        plan_data = await self._request_llm_plan(prompt)
+        
+        # 只缓存包含步骤的有效响应
+        if isinstance(plan_data, dict) and plan_data.get("steps"):
+            self._plan_response_cache[key] = (time.monotonic(), copy.deepcopy(plan_data))
+            if len(self._plan_response_cache) > self._PLAN_RESPONSE_CACHE_SIZE:
+                self._plan_response_cache.popitem(last=False)
+        
+        return plan_data
+    
+    async def _request_llm_plan(self, prompt: str) -> Dict[str, Any]:
+        """请求 LLM 生成计划
+        
         Args:
             prompt: Prompt 文本
             
@@ -1555,13 +2238,25 @@ class McpExecutor(BaseTaskExecutor):
         try:
             # 尝试从 router 获取 LLM 客户端
             if hasattr(self.router, 'llm_client'):
-                response = await self.router.llm_client.chat_completion(
-                    model="gpt-4",
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"}
-                )
-                content = response.get("choices", [{}])[0].get("message", {}).get("content", "{}")
-                return json.loads(content)
+                llm_client = self.router.llm_client
+                messages = [{"role": "user", "content": prompt}]
+                
+                # 支持流式输出时，收到完整的 JSON 对象后立即停止读取
+                if hasattr(llm_client, 'chat_completion_stream'):
+                    content = await self._read_json_object(
+                        llm_client.chat_completion_stream(
+                            messages=messages,
+                            response_format={"type": "json_object"}
+                        )
+                    )
+                else:
+                    response = await llm_client.chat_completion(
+                        model="gpt-4",
+                        messages=messages,
+                        response_format={"type": "json_object"}
+                    )
+                    content = response.get("choices", [{}])[0].get("message", {}).get("content", "{}")
+                return fast_json.loads(content or "{}")
             else:
                 # 如果没有 LLM 客户端，返回空计划
                 return {"steps": []}
@@ -1569,6 +2264,56 @@ class McpExecutor(BaseTaskExecutor):
             print(f"[McpExecutor] Error calling LLM for plan: {e}")
             return {"steps": []}
     
+    @staticmethod
+    async def _read_json_object(chunks) -> str:
+        """读取流式文本，直到第一个完整的 JSON 对象结束
+        
+        跟踪对象内的括号深度（忽略字符串中的括号），对象闭合后关闭数据流，
+        不再等待模型输出的剩余内容；对象之前的多余文本会被丢弃
+        
+        Args:
+            chunks: 逐段产出文本的异步迭代器
+            
+        Returns:
+            str: JSON 对象文本（流提前结束时为已收到的全部文本）
+        """
+        parts: List[str] = []
+        depth = 0
+        in_string = False
+        escaped = False
+        
+        try:
+            async for chunk in chunks:
+                for index, char in enumerate(chunk):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == "\\":
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                    elif char == "{":
+                        depth += 1
+                    elif depth == 0:
+                        continue
+                    elif char == '"':
+                        in_string = True
+                    elif char == "}":
+                        depth -= 1
+                        if depth == 0:
+                            parts.append(chunk[:index + 1])
+                            text = "".join(parts)
+                            return text[text.find("{"):]
+                parts.append(chunk)
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        
+        text = "".join(parts)
+        start = text.find("{")
+        return text[start:] if start >= 0 else text
+    
     def _parse_plan_data(self, plan_data: Dict[str, Any]) -> TaskPlan:
         """解析计划数据
         
@@ -1581,10 +2326,18 @@ class McpExecutor(BaseTaskExecutor):
         plan = TaskPlan()
         
         steps_data = plan_data.get("steps", [])
-        for step_data in steps_data:
+        for index, step_data in enumerate(steps_data):
+            # 只接受指向前序步骤的依赖，其他情况按顺序执行
+            depends_on = step_data.get("depends_on")
+            if not isinstance(depends_on, list) or not all(
+                isinstance(dep, int) and 0 <= dep < index for dep in depends_on
+            ):
+                depends_on = None
+            
             step = PlanStep(
                 description=step_data.get("description", ""),
-                expected_tool=step_data.get("expected_tool")
+                expected_tool=step_data.get("expected_tool"),
+                depends_on=depends_on
             )
             plan.steps.append(step)
         
@@ -1607,6 +2360,10 @@ class McpExecutor(BaseTaskExecutor):
                 return self._rule_based_verification(task, current_step, execution_result)
             # LLM 验证模式
             elif self.plan_verification_mode == "llm":
+                # 查询类步骤成功返回了数据即视为符合预期，无需调用 LLM
+                if (execution_result.get("success") and execution_result.get("result")
+                        and self._classify_tool_type(current_step.expected_tool or "") == "query"):
+                    return False
                 return await self._llm_based_verification(task, current_step, execution_result)
             else:
                 return False
@@ -1625,17 +2382,11 @@ class McpExecutor(BaseTaskExecutor):
         Returns:
             bool: 是否需要修订计划
         """
-        # 规割1：如果已达到最大修订次数，不再修订
-        if task.plan and task.plan.revision_count >= self.max_plan_revisions:
-            self._log(task, "Max plan revisions reached, no more revisions")
-            return False
-        
-        # 规割2：如果执行失败且错误为资源未找到，需要修订
-        if not execution_result.get("success"):
-            error_info = str(execution_result.get("error", "")).lower()
-            if any(keyword in error_info for keyword in ["not found", "does not exist", "unknown"]):
-                self._log(task, "Resource not found error detected, plan revision needed")
-                return True
+        # 规则见 _VERIFY_RULES：达到最大修订次数时不再修订；资源未找到时需要修订
+        for condition, need_revision, message in _VERIFY_RULES:
+            if condition(self, task, execution_result):
+                self._log(task, message)
+                return need_revision
         
         # 默认不需要修订
         return False
@@ -1669,9 +2420,6 @@ class McpExecutor(BaseTaskExecutor):
                 self._log(task, "No plan to revise", "WARNING")
                 return
             
-            # 记录修订前的计划
-            old_plan = task.plan.to_dict()
-            
             # 获取当前进度和剩余步骤
             current_index = task.plan.current_step_index
             remaining_steps = task.plan.steps[current_index:]
@@ -1694,29 +2442,34 @@ class McpExecutor(BaseTaskExecutor):
             new_steps_data = new_plan_data.get("steps", [])
             
             # 标记受影响的步骤为 SKIPPED
-            for step in remaining_steps:
-                if step.status == PlanStepStatus.PENDING:
+            skip_reason = f"Plan revised: {reason}"
+            skipped_indices = []
+            for index, step in enumerate(remaining_steps, current_index):
+                if step.status is PlanStepStatus.PENDING:
                     step.status = PlanStepStatus.SKIPPED
-                    step.skip_reason = f"Plan revised: {reason}"
+                    step.skip_reason = skip_reason
+                    skipped_indices.append(index)
             
             # 添加新步骤
-            for step_data in new_steps_data:
-                new_step = PlanStep(
+            new_steps = [
+                PlanStep(
                     description=step_data.get("description", ""),
                     expected_tool=step_data.get("expected_tool")
                 )
-                task.plan.steps.append(new_step)
+                for step_data in new_steps_data
+            ]
+            task.plan.steps.extend(new_steps)
             
             # 增加修订计数
             task.plan.increment_revision()
             
-            # 记录修订历史
+            # 记录修订历史（只记录本次变更，完整计划见 task.plan）
             task.history.append({
-                "timestamp": datetime.now().timestamp(),
+                "timestamp": time.time(),
                 "event": "plan_revised",
                 "reason": reason,
-                "old_plan": old_plan,
-                "new_plan": task.plan.to_dict(),
+                "skipped_indices": skipped_indices,
+                "added_steps": [step.description for step in new_steps],
                 "revision_count": task.plan.revision_count
             })
             
@@ -1737,42 +2490,16 @@ class McpExecutor(BaseTaskExecutor):
         Returns:
             str: Prompt 文本
         """
-        completed_steps = [
+        completed_steps = "\n".join(
             f"- {step.description} [{step.status.value}]"
             for step in current_plan.steps[:current_plan.current_step_index]
-        ]
+        )
         
-        prompt = f"""你是一个任务规划助手。原有计划需要修订，请生成新的执行步骤。
-
-**用户原始意图**：
-{user_intent}
-
-**已完成的步骤**：
-{chr(10).join(completed_steps) if completed_steps else "无"}
-
-**修订原因**：
-{reason}
-
-**要求**：
-1. 生成剩余的执行步骤（考虑已完成的步骤）
-2. 步骤数量在 1-5 个
-3. 步骤应解决修订原因中提到的问题
-
-**输出格式** (必须为 JSON)：
-```json
-{{
-  "steps": [
-    {{
-      "description": "步骤描述",
-      "expected_tool": "工具名称或null"
-    }}
-  ]
-}}
-```
-
-请生成修订后的计划：
-"""
-        return prompt
+        return self._PLAN_REVISION_PROMPT_TEMPLATE.format(
+            user_intent=user_intent,
+            completed_steps=completed_steps or "无",
+            reason=reason
+        )
     
     def _is_plan_completed(self, plan: Optional[TaskPlan]) -> bool:
         """检查计划是否全部完成
@@ -0,0 +1,88 @@
+# core/task/executors/plan_template.py
+"""计划模板缓存
+
+相同目标的任务复用已成功执行的计划结构（步骤描述 + 预期工具），
+命中时无需再调用 LLM 生成计划
+"""
+import hashlib
+import time
+from typing import Dict, List, Optional
+
+
+class PlanTemplateStore:
+    """计划模板存储（进程内单例）
+
+    以规范化后的 goal + user_intent 的 sha256 为键，
+    超出容量时淘汰使用次数最少的模板（LFU，次数相同时淘汰最久未使用的）
+    """
+
+    _instance = None
+
+    def __new__(cls, max_entries: int = 500):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_entries: int = 500):
+        """初始化模板存储
+
+        Args:
+            max_entries: 最多保存的模板数量，默认500
+        """
+        if self._initialized:
+            return
+
+        self.max_entries = max_entries
+        # key -> {"steps": [...], "hits": int, "last_used": float}
+        self._templates: Dict[str, Dict] = {}
+        self._initialized = True
+
+    @staticmethod
+    def make_key(goal: str, user_intent: str = "") -> str:
+        """计算模板键（忽略大小写与多余空白）"""
+        normalized = " ".join(goal.lower().split())
+        intent = " ".join((user_intent or "").lower().split())
+        return hashlib.sha256(f"{normalized}\x00{intent}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Optional[str]]]]:
+        """查找模板
+
+        Returns:
+            步骤模板列表（每项包含 description、expected_tool、depends_on），未命中返回 None
+        """
+        entry = self._templates.get(key)
+        if entry is None:
+            return None
+
+        entry["hits"] += 1
+        entry["last_used"] = time.monotonic()
+        return entry["steps"]
+
+    def put(self, key: str, steps: List[Dict[str, Optional[str]]]) -> None:
+        """写入或更新模板
+
+        Args:
+            key: 模板键
+            steps: 步骤模板列表（仅保存 description、expected_tool、depends_on，不含工具参数）
+        """
+        if not steps:
+            return
+
+        entry = self._templates.get(key)
+        if entry is not None:
+            entry["steps"] = steps
+            entry["last_used"] = time.monotonic()
+            return
+
+        if len(self._templates) >= self.max_entries:
+            victim = min(
+                self._templates,
+                key=lambda k: (self._templates[k]["hits"], self._templates[k]["last_used"])
+            )
+            del self._templates[victim]
+
+        self._templates[key] = {"steps": steps, "hits": 0, "last_used": time.monotonic()}
+
+    def __len__(self) -> int:
+        return len(self._templates)
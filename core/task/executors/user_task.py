@@ -14,6 +14,8 @@ class UserTaskExecutor(BaseTaskExecutor):
     执行用户通过API或WebSocket发送的自定义任务
     """
     
+    __slots__ = ("agent",)
+    
     def __init__(self, agent: 'RobotAgent'):
         """初始化用户任务执行器
         
@@ -25,9 +27,6 @@ class UserTaskExecutor(BaseTaskExecutor):
     
     async def validate(self, task: UnifiedTask) -> bool:
         """验证任务参数"""
-        if not await super().validate(task):
-            return False
-        
         # 验证command_type
         command_type = task.execution_data.get("command_type")
         if not command_type:
@@ -57,14 +56,9 @@ class UserTaskExecutor(BaseTaskExecutor):
             self._log(task, f"Executing user command: {command_type}")
             
             # 根据命令类型执行
-            if command_type == "speak":
-                await self._handle_speak_command(task, command_params)
-            elif command_type == "alert":
-                await self._handle_alert_command(task, command_params)
-            elif command_type == "action":
-                await self._handle_action_command(task, command_params)
-            elif command_type == "custom":
-                await self._handle_custom_command(task, command_params)
+            handler = self._HANDLERS.get(command_type)
+            if handler is not None:
+                await handler(self, task, command_params)
             else:
                 self._log(task, f"Unknown command type: {command_type}", "ERROR")
                 task.result = {"success": False, "error": f"Unknown command type: {command_type}"}
@@ -132,3 +126,11 @@ class UserTaskExecutor(BaseTaskExecutor):
         self._log(task, "Custom command execution not implemented", "WARNING")
         task.result = {"success": False, "error": "Custom command not implemented"}
         task.transition_to(TaskStatus.FAILED, "Not implemented")
+    
+    # 命令类型 -> 处理方法
+    _HANDLERS = {
+        "speak": _handle_speak_command,
+        "alert": _handle_alert_command,
+        "action": _handle_action_command,
+        "custom": _handle_custom_command,
+    }
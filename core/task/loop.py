@@ -1,11 +1,15 @@
 # core/task/loop.py
 """统一任务循环实现"""
 import asyncio
+import logging
+import time
 from typing import Optional
 from core.task.models import TaskStatus
 from core.task.queue import TaskQueue
 from core.task.scheduler import TaskScheduler
 
+logger = logging.getLogger("task_loop")
+
 
 class UnifiedTaskLoop:
     """统一任务循环
@@ -13,40 +17,50 @@ class UnifiedTaskLoop:
     协调任务队列和调度器，运行主循环
     """
     
+    # 无任务变化时统计信息的最短输出间隔（秒）
+    STATS_INTERVAL = 60.0
+    
     def __init__(self, task_queue: TaskQueue, scheduler: TaskScheduler, loop_interval: float = 1.0):
         """初始化统一任务循环
         
         Args:
             task_queue: 任务队列
             scheduler: 任务调度器
-            loop_interval: 主循环检查间隔（秒）
+            loop_interval: 主循环最长等待间隔（秒）；新任务入队或运行中任务结束时立即唤醒
         """
         self.task_queue = task_queue
         self.scheduler = scheduler
         self.loop_interval = loop_interval
         
+        # 唤醒事件：任务入队、任务结束（释放并发槽位）时置位
+        self._wake = asyncio.Event()
+        task_queue.on_enqueue = self._wake.set
+        scheduler.on_task_finished = self._wake.set
+        
         self._running = False
         self._main_task: Optional[asyncio.Task] = None
         self._cleanup_task: Optional[asyncio.Task] = None
+        # 上次输出统计信息的时间（time.monotonic()）
+        self._last_stats_ts = 0.0
         
-        print(f"[UnifiedTaskLoop] Initialized with loop_interval={loop_interval}s")
+        logger.info("[UnifiedTaskLoop] Initialized with loop_interval=%ss", loop_interval)
     
     def start(self) -> None:
         """启动任务循环"""
         if self._running:
-            print("[UnifiedTaskLoop] Already running")
+            logger.warning("[UnifiedTaskLoop] Already running")
             return
         
         self._running = True
         self._main_task = asyncio.create_task(self._main_loop())
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
         
-        print("[UnifiedTaskLoop] Task loop started")
+        logger.info("[UnifiedTaskLoop] Task loop started")
     
     def stop(self) -> None:
         """停止任务循环"""
         if not self._running:
-            print("[UnifiedTaskLoop] Not running")
+            logger.warning("[UnifiedTaskLoop] Not running")
             return
         
         self._running = False
@@ -61,41 +75,48 @@ class UnifiedTaskLoop:
             self._cleanup_task.cancel()
             self._cleanup_task = None
         
-        print("[UnifiedTaskLoop] Task loop stopped")
+        logger.info("[UnifiedTaskLoop] Task loop stopped")
     
     async def _main_loop(self) -> None:
         """主循环逻辑"""
         try:
-            print("[UnifiedTaskLoop] Entering main loop")
+            logger.info("[UnifiedTaskLoop] Entering main loop")
             
             while self._running:
-                # 1. 检查是否有待执行任务
-                queue_size = await self.task_queue.size()
+                # 1. 按空闲并发槽位数，依次取出优先级最高的待执行任务（队列为空时 dequeue 返回 None）
+                free_slots = self.scheduler.max_concurrent_tasks - self.scheduler.get_running_count()
                 
-                if queue_size > 0 and self.scheduler.can_schedule():
-                    # 2. 从队列中取出优先级最高的任务
+                while free_slots > 0 and self.scheduler.can_schedule():
                     task = await self.task_queue.dequeue()
+                    if not task:
+                        break
+                    
+                    # 2. 调度任务执行
+                    scheduled = await self.scheduler.schedule(task)
+                    
+                    if not scheduled:
+                        # 调度失败，重新入队（不唤醒循环，等下一轮 loop_interval 再重试），本轮不再继续调度
+                        await self.task_queue.enqueue(task, notify=False)
+                        break
                     
-                    if task:
-                        # 3. 调度任务执行
-                        scheduled = await self.scheduler.schedule(task)
-                        
-                        if not scheduled:
-                            # 调度失败，重新入队
-                            await self.task_queue.enqueue(task)
+                    free_slots -= 1
                 
-                # 4. 短暂休眠避免CPU占用
-                await asyncio.sleep(self.loop_interval)
+                # 3. 等待新任务入队或并发槽位释放（最长 loop_interval，兜底轮询）
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.loop_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
                 
         except asyncio.CancelledError:
-            print("[UnifiedTaskLoop] Main loop cancelled")
+            logger.info("[UnifiedTaskLoop] Main loop cancelled")
         except Exception as e:
-            print(f"[UnifiedTaskLoop] Error in main loop: {e}")
+            logger.error("[UnifiedTaskLoop] Error in main loop: %s", e)
     
     async def _cleanup_loop(self) -> None:
         """清理循环 - 定期清理已完成的任务"""
         try:
-            print("[UnifiedTaskLoop] Entering cleanup loop")
+            logger.info("[UnifiedTaskLoop] Entering cleanup loop")
             
             while self._running:
                 # 每10秒清理一次
@@ -108,20 +129,25 @@ class UnifiedTaskLoop:
                 cleaned_count = await self.scheduler.cleanup_finished_tasks()
                 
                 if removed_count > 0 or cleaned_count > 0:
-                    print(f"[UnifiedTaskLoop] Cleanup: removed {removed_count} tasks from queue, "
-                          f"cleaned {cleaned_count} finished async tasks")
+                    logger.info("[UnifiedTaskLoop] Cleanup: removed %d tasks from queue, "
+                                "cleaned %d finished async tasks", removed_count, cleaned_count)
                 
-                # 打印统计信息
-                stats = await self.task_queue.get_statistics()
-                running_count = self.scheduler.get_running_count()
-                print(f"[UnifiedTaskLoop] Stats: queue_total={stats['total']}, "
-                      f"pending={stats['pending']}, running={running_count}, "
-                      f"completed={stats['completed']}, failed={stats['failed']}")
+                # 统计信息（需遍历队列）：仅在 DEBUG 级别开启，且本轮有任务被清理或距上次输出超过 STATS_INTERVAL 时计算
+                now = time.monotonic()
+                if logger.isEnabledFor(logging.DEBUG) and (
+                    removed_count > 0 or cleaned_count > 0 or now - self._last_stats_ts >= self.STATS_INTERVAL
+                ):
+                    self._last_stats_ts = now
+                    stats = await self.task_queue.get_statistics()
+                    logger.debug("[UnifiedTaskLoop] Stats: queue_total=%d, pending=%d, running=%d, "
+                                 "completed=%d, failed=%d",
+                                 stats["total"], stats["pending"], self.scheduler.get_running_count(),
+                                 stats["completed"], stats["failed"])
                 
         except asyncio.CancelledError:
-            print("[UnifiedTaskLoop] Cleanup loop cancelled")
+            logger.info("[UnifiedTaskLoop] Cleanup loop cancelled")
         except Exception as e:
-            print(f"[UnifiedTaskLoop] Error in cleanup loop: {e}")
+            logger.error("[UnifiedTaskLoop] Error in cleanup loop: %s", e)
     
     def is_running(self) -> bool:
         """检查任务循环是否正在运行
@@ -1,10 +1,17 @@
 # core/task/models.py
 """统一任务模型定义"""
+import asyncio
 import uuid
+from collections import deque
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional
 from dataclasses import dataclass, field
+from functools import cached_property
+
+
+# 单个任务保留的历史条数上限（长时间运行的对话任务会持续写入日志）
+HISTORY_MAXLEN = 200
 
 
 class TaskType(Enum):
@@ -35,6 +42,10 @@ class PlanStepStatus(Enum):
     FAILED = "failed"            # 执行失败
 
 
+# 计划完成判定时视为已结束的步骤状态
+_DONE_STEP_STATUSES = frozenset((PlanStepStatus.COMPLETED, PlanStepStatus.SKIPPED))
+
+
 @dataclass
 class PlanStep:
     """执行计划中的单个步骤
@@ -49,6 +60,8 @@ class PlanStep:
     skip_reason: Optional[str] = None  # 跳过原因（如果被跳过）
     started_at: Optional[float] = None  # 开始执行时间戳
     completed_at: Optional[float] = None  # 完成时间戳
+    depends_on: Optional[List[int]] = None  # 依赖的步骤索引（None 表示依赖之前所有步骤，按顺序执行）
+    extracted_output: Any = None  # 从 execution_result 提取的工具输出（运行时缓存，不参与序列化）
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式
@@ -64,7 +77,8 @@ class PlanStep:
             "execution_result": self.execution_result,
             "skip_reason": self.skip_reason,
             "started_at": self.started_at,
-            "completed_at": self.completed_at
+            "completed_at": self.completed_at,
+            "depends_on": self.depends_on
         }
 
 
@@ -96,12 +110,10 @@ class TaskPlan:
         Returns:
             bool: 是否所有步骤都已完成或跳过
         """
-        if not self.steps:
+        # 先比较步骤索引：执行过程中每步都会检查，仅在最后一步之后才需要扫描各步骤状态
+        if not self.steps or self.current_step_index < len(self.steps):
             return False
-        return all(
-            step.status in [PlanStepStatus.COMPLETED, PlanStepStatus.SKIPPED]
-            for step in self.steps
-        ) and self.current_step_index >= len(self.steps)
+        return all(step.status in _DONE_STEP_STATUSES for step in self.steps)
     
     def advance_step(self) -> None:
         """移动到下一步骤"""
@@ -145,9 +157,23 @@ class UnifiedTask:
     max_retries: int = 3  # 最大重试次数
     context: Dict[str, Any] = field(default_factory=dict)  # 任务上下文数据
     execution_data: Dict[str, Any] = field(default_factory=dict)  # 执行相关数据
-    history: List[Dict[str, Any]] = field(default_factory=list)  # 执行历史记录
+    history: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=HISTORY_MAXLEN))  # 执行历史记录（仅保留最近 HISTORY_MAXLEN 条）
     result: Optional[Any] = None  # 任务执行结果
     plan: Optional[TaskPlan] = None  # 任务执行计划（计划驱动模式）
+    # 完成队列：进入终态时投递 (task_id, status)，由 RobotAgent 在有等待方时注入
+    completion_queue: Optional[asyncio.Queue] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """构造时校验必需字段"""
+        if self.execution_data is None:
+            raise ValueError("UnifiedTask.execution_data is required")
+        if not isinstance(self.history, deque):
+            self.history = deque(self.history, maxlen=HISTORY_MAXLEN)
+    
+    @cached_property
+    def short_id(self) -> str:
+        """任务ID前8位（用于日志，首次访问后缓存）"""
+        return self.task_id[:8]
     
     def transition_to(self, new_status: TaskStatus, reason: str = "") -> None:
         """状态转换
@@ -169,7 +195,10 @@ class UnifiedTask:
             "reason": reason
         })
         
-        print(f"[Task:{self.task_id[:8]}] {old_status.value} -> {new_status.value} ({reason})")
+        print(f"[Task:{self.short_id}] {old_status.value} -> {new_status.value} ({reason})")
+        
+        if self.completion_queue is not None and self.is_terminal():
+            self.completion_queue.put_nowait((self.task_id, new_status))
     
     def is_terminal(self) -> bool:
         """检查是否为终态
@@ -275,7 +304,7 @@ class UnifiedTask:
             "max_retries": self.max_retries,
             "context": self.context,
             "execution_data": self.execution_data,
-            "history": self.history,
+            "history": [dict(entry) for entry in self.history],  # LogEntry 等条目转为普通字典
             "result": self.result
         }
         
@@ -2,7 +2,7 @@
 """任务队列实现"""
 import asyncio
 import heapq
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
 from core.task.models import UnifiedTask, TaskStatus
 
@@ -18,14 +18,16 @@ class TaskQueue:
         self._heap: List[tuple] = []  # (负优先级, 创建时间, task_id, task)
         self._tasks: Dict[str, UnifiedTask] = {}  # task_id -> task 的映射
         self._lock = asyncio.Lock()  # 异步锁，保证线程安全
+        self.on_enqueue: Optional[Callable[[], None]] = None  # 入队回调（用于唤醒任务循环）
         
         print("[TaskQueue] Initialized")
     
-    async def enqueue(self, task: UnifiedTask) -> None:
+    async def enqueue(self, task: UnifiedTask, notify: bool = True) -> None:
         """入队任务
         
         Args:
             task: 要入队的任务
+            notify: 是否触发入队回调（任务循环重新入队调度失败的任务时传 False，避免立即被唤醒重试）
         """
         async with self._lock:
             # 使用负优先级以实现大顶堆（Python heapq 是小顶堆）
@@ -36,6 +38,9 @@ class TaskQueue:
             )
             self._tasks[task.task_id] = task
             
+            if notify and self.on_enqueue:
+                self.on_enqueue()
+            
             print(f"[TaskQueue] Enqueued task {task.task_id[:8]} "
                   f"(type={task.task_type.value}, priority={task.priority})")
     
@@ -1,7 +1,7 @@
 # core/task/scheduler.py
 """任务调度器实现"""
 import asyncio
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from datetime import datetime
 from core.task.models import UnifiedTask, TaskType, TaskStatus
 
@@ -18,6 +18,7 @@ class TaskScheduler:
         self.max_concurrent_tasks = max_concurrent_tasks
         self._executors: Dict[TaskType, 'BaseTaskExecutor'] = {}  # 执行器映射
         self._running_tasks: Dict[str, asyncio.Task] = {}  # 运行中的异步任务
+        self.on_task_finished: Optional[Callable[[], None]] = None  # 任务结束回调（释放并发槽位时唤醒任务循环）
         
         print(f"[TaskScheduler] Initialized with max_concurrent_tasks={max_concurrent_tasks}")
     
@@ -118,6 +119,9 @@ class TaskScheduler:
             # 从运行中任务列表移除
             if task.task_id in self._running_tasks:
                 del self._running_tasks[task.task_id]
+            
+            if self.on_task_finished:
+                self.on_task_finished()
     
     async def cancel_task(self, task_id: str) -> bool:
         """取消运行中的任务
@@ -7,10 +7,12 @@ from core.mcp_control.manager import McpManager
 from core.client.openai_client import OpenAIClient
 from core.task.executors.mcp import McpExecutor
 from core.task.models import TaskType
+from util.log_queue import setup_queue_logging, stop_queue_logging
 import config
 
 async def main():
     """主程序入口（使用新的通信架构）"""
+    setup_queue_logging()
     print("[Main] Initializing Robot Agent...")
     
     # 创建 Agent
@@ -52,7 +54,8 @@ async def main():
             mcp_executor = McpExecutor(
                 router=mcp_manager.router,
                 connections=mcp_manager.connections,
-                task_queue=agent.task_queue
+                task_queue=agent.task_queue,
+                connection_pool=mcp_manager.connection_pool
             )
             agent.task_scheduler.register_executor(TaskType.MCP_CALL, mcp_executor)
             print("[Main] McpExecutor registered for MCP_CALL tasks")
@@ -122,6 +125,7 @@ async def main():
             print(f"[Main] Error closing MCP connections: {e}")
         
         print("[Main] Agent stopped.")
+        stop_queue_logging()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -15,9 +15,11 @@ from core.action.listen_action_vad import VADPresets
 from core.task.models import UnifiedTask, TaskType
 from core.action.base import ActionContext
 from core.agent import AgentState
+from util.log_queue import setup_queue_logging, stop_queue_logging
 
 
 async def main():
+    setup_queue_logging()
     print("\n" + "="*60)
     print("🤖 智能问答机器人")
     print("="*60)
@@ -44,7 +46,8 @@ async def main():
     mcp_executor = McpExecutor(
         router=mcp_manager.router,
         connections=mcp_manager.connections,
-        task_queue=agent.task_queue
+        task_queue=agent.task_queue,
+        connection_pool=mcp_manager.connection_pool
     )
     agent.task_scheduler.register_executor(TaskType.MCP_CALL, mcp_executor)
     
@@ -143,6 +146,7 @@ async def main():
         listen_action.cleanup()
         print("👋 再见！")
         print("="*60 + "\n")
+        stop_queue_logging()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+# test/test_action_chain.py
+"""测试 Action 链执行器的结果结构"""
+
+import pytest
+
+from core.action import ActionResult
+from core.task import UnifiedTask, TaskType, TaskStatus
+from core.task.executors.action_chain import ActionChainExecutor
+
+
+class _FakeAgent:
+    """按名称返回预设结果的代理"""
+
+    def __init__(self, failing=()):
+        self.actions = {"a": object(), "b": object(), "c": object()}
+        self._failing = set(failing)
+
+    async def execute_action(self, name, input_data=None):
+        if name in self._failing:
+            return ActionResult(success=False, error=RuntimeError(f"{name} failed"))
+        return ActionResult(success=True, output=f"{input_data}->{name}")
+
+
+def _make_task(action_names):
+    return UnifiedTask(
+        task_type=TaskType.ACTION_CHAIN,
+        execution_data={"action_names": action_names, "initial_input": "in"}
+    )
+
+
+class TestActionChainResult:
+    """测试 Action 链结果"""
+
+    @pytest.mark.asyncio
+    async def test_success_result_is_plain_dict(self):
+        """成功路径的结果为普通字典，results 已组装"""
+        task = _make_task(["a", "b"])
+        await ActionChainExecutor(_FakeAgent()).execute(task)
+
+        assert task.status == TaskStatus.COMPLETED
+        assert task.result == {
+            "success": True,
+            "results": [
+                {"action": "a", "success": True, "output": "in->a", "error": None},
+                {"action": "b", "success": True, "output": "in->a->b", "error": None},
+            ],
+            "final_output": "in->a->b",
+        }
+        assert type(task.result) is dict
+        assert task.to_dict()["result"] == task.result
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_chain(self):
+        """失败时停止执行并记录已执行的结果"""
+        task = _make_task(["a", "b", "c"])
+        await ActionChainExecutor(_FakeAgent(failing={"b"})).execute(task)
+
+        assert task.status == TaskStatus.FAILED
+        assert task.result["stopped_at"] == "b"
+        assert [r["action"] for r in task.result["results"]] == ["a", "b"]
+        assert task.result["results"][1] == {
+            "action": "b", "success": False, "output": None, "error": "b failed"
+        }
@@ -0,0 +1,101 @@
+# test/test_agent.py
+"""测试 RobotAgent 任务完成等待（wait_for / wait_any）"""
+
+import asyncio
+
+import pytest
+
+from core.agent import RobotAgent
+from core.task import UnifiedTask, TaskType, TaskStatus
+
+
+def _make_task() -> UnifiedTask:
+    return UnifiedTask(task_type=TaskType.USER_COMMAND, execution_data={"command": "noop"})
+
+
+class TestCompletionWait:
+    """测试任务完成等待"""
+
+    @pytest.mark.asyncio
+    async def test_wait_for_completed(self):
+        """任务进入终态后 wait_for 返回终态"""
+        agent = RobotAgent()
+        task = _make_task()
+        await agent.submit_task(task)
+
+        waiter = asyncio.create_task(agent.wait_for(task.task_id, timeout=1))
+        await asyncio.sleep(0)
+        task.transition_to(TaskStatus.COMPLETED, "done")
+
+        assert await waiter == TaskStatus.COMPLETED
+        assert agent._completion_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_wait_for_already_terminal(self):
+        """已处于终态的任务直接返回"""
+        agent = RobotAgent()
+        task = _make_task()
+        await agent.submit_task(task)
+        task.transition_to(TaskStatus.FAILED, "error")
+
+        assert await agent.wait_for(task.task_id, timeout=1) == TaskStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_wait_for_timeout_drops_waiter(self):
+        """超时后移除等待方"""
+        agent = RobotAgent()
+        task = _make_task()
+        await agent.submit_task(task)
+
+        assert await agent.wait_for(task.task_id, timeout=0.01) is None
+        assert agent._completion_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_multiple_waiters(self):
+        """同一任务的多个等待方都被唤醒；其中一个超时不影响其他等待方"""
+        agent = RobotAgent()
+        task = _make_task()
+        await agent.submit_task(task)
+
+        short = asyncio.create_task(agent.wait_for(task.task_id, timeout=0.01))
+        long = asyncio.create_task(agent.wait_for(task.task_id, timeout=1))
+        assert await short is None
+
+        task.transition_to(TaskStatus.COMPLETED, "done")
+        assert await long == TaskStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_wait_any(self):
+        """wait_any 返回最先进入终态的任务"""
+        agent = RobotAgent()
+        first, second = _make_task(), _make_task()
+        await agent.submit_task(first)
+        await agent.submit_task(second)
+
+        waiter = asyncio.create_task(agent.wait_any([first.task_id, second.task_id], timeout=1))
+        await asyncio.sleep(0)
+        second.transition_to(TaskStatus.CANCELLED, "cancelled")
+
+        assert await waiter == (second.task_id, TaskStatus.CANCELLED)
+        assert agent._completion_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_wait_any_timeout(self):
+        """wait_any 超时返回 None 并移除全部等待方"""
+        agent = RobotAgent()
+        tasks = [_make_task(), _make_task()]
+        for task in tasks:
+            await agent.submit_task(task)
+
+        assert await agent.wait_any([t.task_id for t in tasks], timeout=0.01) is None
+        assert agent._completion_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_unwaited_task_not_enqueued(self):
+        """无人等待的任务进入终态时不投递完成事件"""
+        agent = RobotAgent()
+        task = _make_task()
+        await agent.submit_task(task)
+        task.transition_to(TaskStatus.COMPLETED, "done")
+
+        assert agent._completion_cq.empty()
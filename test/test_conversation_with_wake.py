@@ -0,0 +1,93 @@
+# test/test_conversation_with_wake.py
+"""测试永久监听对话执行器的文本处理"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.task.executors.conversation_with_wake import ConversationExecutorWithWake, _CHITCHAT_RE
+
+
+class TestChitchatBypass:
+    """测试闲聊短句识别"""
+
+    @pytest.mark.parametrize("text", ["你好", "您好！", "谢谢", "谢谢你呀~", "晚安。", "Hello"])
+    def test_greetings_and_thanks(self, text):
+        assert _CHITCHAT_RE.fullmatch(text)
+
+    @pytest.mark.parametrize("text", ["好的", "好", "可以", "嗯嗯", "行", "没问题", "打开客厅灯", "你好，打开客厅灯"])
+    def test_replies_go_to_intent_analysis(self, text):
+        """应答词可能是对确认提问的回答，不能跳过意图分析"""
+        assert not _CHITCHAT_RE.fullmatch(text)
+
+
+class TestFormatToolOutput:
+    """测试 MCP 结果中工具输出的提取"""
+
+    @pytest.fixture
+    def executor(self):
+        # 只测试纯同步的提取逻辑，无需初始化录音与 LLM
+        return ConversationExecutorWithWake.__new__(ConversationExecutorWithWake)
+
+    @pytest.mark.parametrize("mcp_result, expected", [
+        ({"formatted_output": "格式化结果", "result": "忽略"}, "格式化结果"),
+        ({"result": {"formatted_output": "内层格式化结果", "results": []}}, "内层格式化结果"),
+        ({"result": {"results": []}}, "未找到相关结果"),
+        ({"result": {"results": [{"title": "标题", "content": "内容"}, "纯文本"]}},
+         "1. 标题\n   内容\n\n2. 纯文本"),
+        ({"result": {"status": "ok"}}, "{'status': 'ok'}"),
+        ({"result": [1, 2]}, "[1, 2]"),
+        ({"step_results": [{"result": "第一步"}, {"result": "第二步"}]}, "第二步"),
+        ({"step_results": []}, "未能获取到有效结果"),
+        ({}, "未能获取到有效结果"),
+    ])
+    def test_extract(self, executor, mcp_result, expected):
+        assert executor._format_tool_output(mcp_result) == expected
+
+
+class _FakeToolIndex:
+    def __init__(self, tools):
+        self.tools = tools
+        self.revision = 1
+        self.calls = 0
+
+    def get_all_tools(self):
+        self.calls += 1
+        return [SimpleNamespace(tool_name=name, description=desc) for name, desc in self.tools]
+
+
+class _FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def chat_completion(self, messages, **kwargs):
+        self.prompts.append(messages[0]["content"])
+        return '{"intent_type": "chat"}'
+
+
+class TestIntentPromptCache:
+    """测试意图分析 Prompt 缓存"""
+
+    @pytest.fixture
+    def executor(self):
+        executor = ConversationExecutorWithWake.__new__(ConversationExecutorWithWake)
+        executor.llm_client = _FakeLLM()
+        executor._cached_prompt = None
+        executor._cached_tools_key = None
+        executor._mcp_tool_index = _FakeToolIndex([("search", "搜索")])
+        return executor
+
+    @pytest.mark.asyncio
+    async def test_reuse_until_revision_changes(self, executor):
+        tool_index = executor._mcp_tool_index
+
+        await executor._analyze_intent("查一下新闻")
+        await executor._analyze_intent("再查一下")
+        assert tool_index.calls == 1
+        assert executor.llm_client.prompts[0] is executor.llm_client.prompts[1]
+
+        tool_index.tools.append(("weather", "天气查询"))
+        tool_index.revision += 1
+        assert await executor._analyze_intent("天气怎么样") == {"intent_type": "chat"}
+        assert tool_index.calls == 2
+        assert "weather" in executor.llm_client.prompts[-1]
@@ -0,0 +1,110 @@
+# test/test_executors.py
+"""测试任务执行器基类"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.task import UnifiedTask, TaskType, TaskStatus
+from core.task.executors.base import BaseTaskExecutor
+from core.task.executors.conversation import ConversationExecutor
+
+
+class _NoopExecutor(BaseTaskExecutor):
+    """不重写 validate 的执行器"""
+
+    async def execute(self, task: UnifiedTask) -> None:
+        pass
+
+
+class TestBaseValidate:
+    """测试基类参数校验"""
+
+    @pytest.mark.asyncio
+    async def test_empty_execution_data_rejected(self):
+        """默认的空 execution_data 校验失败"""
+        task = UnifiedTask(task_type=TaskType.USER_COMMAND)
+        assert await _NoopExecutor().validate(task) is False
+
+    @pytest.mark.asyncio
+    async def test_execution_data_accepted(self):
+        task = UnifiedTask(task_type=TaskType.USER_COMMAND, execution_data={"command_type": "alert"})
+        assert await _NoopExecutor().validate(task) is True
+
+    def test_none_execution_data_raises(self):
+        """execution_data 为 None 时构造即失败"""
+        with pytest.raises(ValueError):
+            UnifiedTask(task_type=TaskType.USER_COMMAND, execution_data=None)
+
+
+class _AgentExecutor(_NoopExecutor):
+    """持有 agent 的执行器"""
+
+    __slots__ = ("agent",)
+
+    def __init__(self, agent):
+        super().__init__()
+        self.agent = agent
+
+
+class TestMcpToolIndex:
+    """测试 MCP 工具索引的延迟解析"""
+
+    def test_resolved_after_manager_injected(self):
+        """MCP Manager 晚于执行器注入时，下次获取即可解析到，之后复用缓存"""
+        agent = SimpleNamespace(mcp_manager=None)
+        executor = _AgentExecutor(agent)
+        assert executor._get_mcp_tool_index() is None
+
+        tool_index = object()
+        agent.mcp_manager = SimpleNamespace(tool_index=tool_index)
+        assert executor._get_mcp_tool_index() is tool_index
+
+        agent.mcp_manager = None
+        assert executor._get_mcp_tool_index() is tool_index
+
+    def test_without_agent(self):
+        assert _NoopExecutor()._get_mcp_tool_index() is None
+
+
+class _FailingStreamLLM:
+    """意图分析返回 MCP 任务，生成回复时流式输出一句后中断"""
+
+    async def chat_completion(self, messages, **kwargs):
+        return '{"intent_type": "task_request", "task_info": {"executor_type": "mcp"}}'
+
+    async def chat_completion_stream(self, messages, **kwargs):
+        yield "客厅灯已经打开了。"
+        raise ConnectionError("stream closed")
+
+
+class _SlowSpeakConversationExecutor(ConversationExecutor):
+    """MCP 调用直接成功、播报较慢的对话执行器"""
+
+    async def _call_mcp_tool(self, task_info):
+        return {"success": True, "result": "ok"}
+
+    async def _speak(self, text):
+        await asyncio.sleep(1)
+        return True
+
+
+class TestConversationSpeak:
+    """测试对话执行器的后台播报"""
+
+    @pytest.mark.asyncio
+    async def test_speak_task_tracked_when_stream_fails(self):
+        """流式生成失败时逐句播报任务被取消并登记，不会悬空"""
+        agent = SimpleNamespace(mcp_manager=None)
+        executor = _SlowSpeakConversationExecutor(agent, _FailingStreamLLM())
+        task = UnifiedTask(task_type=TaskType.CONVERSATION, execution_data={"user_text": "打开客厅灯"})
+        await executor.execute(task)
+
+        assert task.status == TaskStatus.FAILED
+        assert len(executor._speak_tasks) == 1
+        speak_task = next(iter(executor._speak_tasks))
+        await asyncio.gather(speak_task, return_exceptions=True)
+        assert speak_task.cancelled()
+        assert not executor._speak_tasks
+        assert task.result["spoken"] is False
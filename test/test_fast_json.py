@@ -0,0 +1,42 @@
+# test/test_fast_json.py
+"""测试 JSON 编解码（orjson 与标准库两种实现结果一致）"""
+
+import json
+
+import pytest
+
+from util import fast_json
+
+BACKENDS = ["json", "orjson"]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """切换实现（未安装 orjson 时跳过）"""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+class TestFastJson:
+    """测试 fast_json"""
+
+    @pytest.mark.parametrize("text", ['{"intent_type": "mcp", "tools": ["搜索", 1, 2.5, null, true]}', "[]", '"字符串"'])
+    def test_loads(self, backend, text):
+        assert fast_json.loads(text) == json.loads(text)
+        assert fast_json.loads(text.encode("utf-8")) == json.loads(text)
+
+    def test_loads_error_is_value_error(self, backend):
+        with pytest.raises(ValueError):
+            fast_json.loads("not json")
+
+    def test_dumps_round_trip(self, backend):
+        data = {"设备": "客厅灯", "state": "on", "values": [1, 2.5, None, True]}
+        text = fast_json.dumps(data)
+        assert "客厅灯" in text  # 非 ASCII 字符原样输出
+        assert json.loads(text) == data
+
+    def test_dumps_default(self, backend):
+        assert json.loads(fast_json.dumps({"value": object()}, default=lambda _: "obj")) == {"value": "obj"}
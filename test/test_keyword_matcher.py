@@ -0,0 +1,125 @@
+# test/test_keyword_matcher.py
+"""测试多关键词匹配（Aho-Corasick 与正则两种实现结果一致）"""
+
+import random
+
+import pytest
+
+from util import keyword_matcher
+from util.keyword_matcher import KeywordMatcher
+
+BACKENDS = ["regex", "ahocorasick"]
+
+
+def _build(cls, backend, monkeypatch, *args, **kwargs):
+    """按指定实现构造匹配器（未安装 pyahocorasick 时跳过）"""
+    if backend == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+    return cls(*args, **kwargs)
+
+
+class TestKeywordMatcher:
+    """测试 KeywordMatcher"""
+
+    KEYWORDS = ["小狐狸", "狐狸", "Hey Fox", "fox", "abcd", "bc"]
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @pytest.mark.parametrize("text, expected", [
+        ("你好小狐狸", "小狐狸"),
+        ("狐狸你好", "狐狸"),
+        ("HEY FOX, wake up", "Hey Fox"),
+        ("a FOX", "fox"),
+        ("xabcd", "abcd"),       # 起始位置更早的 abcd 优先于先结束的 bc
+        ("xbcabcd", "bc"),
+        ("今天天气怎么样", None),
+        ("", None),
+    ])
+    def test_find(self, backend, monkeypatch, text, expected):
+        matcher = _build(KeywordMatcher, backend, monkeypatch, self.KEYWORDS)
+        assert matcher.find(text) == expected
+        assert matcher.matches(text) is (expected is not None)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_empty_keywords(self, backend, monkeypatch):
+        matcher = _build(KeywordMatcher, backend, monkeypatch, ["", None])
+        assert not matcher
+        assert matcher.find("anything") is None
+
+    def test_backends_agree_on_random_text(self, monkeypatch):
+        """随机文本上两种实现的结果一致"""
+        pytest.importorskip("ahocorasick")
+        rng = random.Random(0)
+        alphabet = "abcdAB狐狸小 "
+        keywords = ["".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(30)]
+
+        automaton = KeywordMatcher(keywords)
+        monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+        regex = KeywordMatcher(keywords)
+
+        for _ in range(500):
+            text = "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+            assert automaton.find(text) == regex.find(text), text
+
+
+class TestLabeledKeywordMatcher:
+    """测试 LabeledKeywordMatcher"""
+
+    GROUPS = (
+        ("resource_not_found", ("not found", "does not exist", "unknown")),
+        ("invalid_parameter", ("invalid", "malformed")),
+        ("network_issue", ("timeout", "connection")),
+    )
+
+    @staticmethod
+    def _classify_naive(groups, text, case_sensitive=False):
+        """按分组顺序逐个 `keyword in text` 判断（匹配器应与之等价）"""
+        if not case_sensitive:
+            text = text.lower()
+        for label, keywords in groups:
+            for keyword in keywords:
+                if keyword and (keyword if case_sensitive else keyword.lower()) in text:
+                    return label
+        return None
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @pytest.mark.parametrize("text, expected", [
+        ("Connection timeout", "network_issue"),
+        ("Invalid entity: NOT FOUND", "resource_not_found"),   # 靠前的分组优先，与出现位置无关
+        ("malformed request", "invalid_parameter"),
+        ("ok", None),
+        ("", None),
+    ])
+    def test_classify(self, backend, monkeypatch, text, expected):
+        matcher = _build(keyword_matcher.LabeledKeywordMatcher, backend, monkeypatch, self.GROUPS)
+        assert matcher.classify(text) == expected
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_case_sensitive(self, backend, monkeypatch):
+        groups = (("query", ("Get", "List")), ("action", ("Set", "Turn")))
+        matcher = _build(keyword_matcher.LabeledKeywordMatcher, backend, monkeypatch, groups, case_sensitive=True)
+        assert matcher.classify("HassTurnOn") == "action"
+        assert matcher.classify("GetLiveContext") == "query"
+        assert matcher.classify("turn_on") is None
+
+    @pytest.mark.parametrize("case_sensitive", [False, True])
+    def test_backends_agree_on_random_text(self, monkeypatch, case_sensitive):
+        """随机文本上两种实现的结果一致，且与逐个 in 判断等价"""
+        pytest.importorskip("ahocorasick")
+        rng = random.Random(1)
+        alphabet = "abcAB错误 "
+        groups = [
+            (f"g{i}", ["".join(rng.choices(alphabet, k=rng.randint(1, 3))) for _ in range(5)])
+            for i in range(6)
+        ]
+
+        automaton = keyword_matcher.LabeledKeywordMatcher(groups, case_sensitive=case_sensitive)
+        monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+        regex = keyword_matcher.LabeledKeywordMatcher(groups, case_sensitive=case_sensitive)
+
+        for _ in range(500):
+            text = "".join(rng.choices(alphabet, k=rng.randint(0, 15)))
+            expected = self._classify_naive(groups, text, case_sensitive)
+            assert automaton.classify(text) == expected, text
+            assert regex.classify(text) == expected, text
@@ -0,0 +1,41 @@
+# test/test_log_queue.py
+"""测试后台队列日志的安装与卸载"""
+
+import logging
+from logging.handlers import QueueHandler
+
+from util.log_queue import setup_queue_logging, stop_queue_logging
+
+
+def _queue_handlers():
+    return [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+
+
+class TestQueueLogging:
+    """测试 setup_queue_logging / stop_queue_logging"""
+
+    def test_stop_removes_handler(self):
+        level = logging.getLogger().level
+        try:
+            setup_queue_logging()
+            assert len(_queue_handlers()) == 1
+            stop_queue_logging()
+            assert _queue_handlers() == []
+        finally:
+            stop_queue_logging()
+            logging.getLogger().setLevel(level)
+
+    def test_setup_again_after_stop(self, capfd):
+        """停止后再次安装不会重复输出"""
+        level = logging.getLogger().level
+        try:
+            setup_queue_logging()
+            stop_queue_logging()
+            setup_queue_logging()
+            assert len(_queue_handlers()) == 1
+            logging.getLogger("executor").info("once")
+            stop_queue_logging()
+            assert capfd.readouterr().err.count("once") == 1
+        finally:
+            stop_queue_logging()
+            logging.getLogger().setLevel(level)
@@ -0,0 +1,153 @@
+# test/test_mcp_executor.py
+"""测试 McpExecutor 的流式计划读取与家居上下文解析"""
+
+import json
+import re
+
+import pytest
+
+from core.task.executors.mcp import McpExecutor
+
+
+class _Stream:
+    """按给定分段产出文本的异步迭代器，记录读取进度与是否被关闭"""
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed >= len(self._chunks):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return self._chunks[self.consumed - 1]
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestReadJsonObject:
+    """测试 _read_json_object"""
+
+    @pytest.mark.asyncio
+    async def test_stops_after_object(self):
+        stream = _Stream(['{"steps": [', '{"a": 1}', ']}', " trailing", " never read"])
+        assert await McpExecutor._read_json_object(stream) == '{"steps": [{"a": 1}]}'
+        assert stream.consumed == 3
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_braces_inside_strings(self):
+        obj = '{"description": "打开 {客厅} 灯 }}", "tool": "x"}'
+        stream = _Stream([obj[:20], obj[20:], '{"other": 1}'])
+        assert await McpExecutor._read_json_object(stream) == obj
+
+    @pytest.mark.asyncio
+    async def test_escaped_quotes_inside_strings(self):
+        obj = r'{"text": "say \"}\" and \\", "n": {"m": 2}}'
+        stream = _Stream([obj[i:i + 3] for i in range(0, len(obj), 3)] + ["}"])
+        assert await McpExecutor._read_json_object(stream) == obj
+
+    @pytest.mark.asyncio
+    async def test_text_before_object(self):
+        """对象之前的说明文字（含引号、右括号）被丢弃"""
+        stream = _Stream(['好的，计划如下 "plan" }:\n```json\n{"st', 'eps": []}\n```'])
+        assert await McpExecutor._read_json_object(stream) == '{"steps": []}'
+
+    @pytest.mark.asyncio
+    async def test_incomplete_stream(self):
+        """流提前结束时返回已收到的文本（从第一个 { 开始）"""
+        stream = _Stream(["前缀 ", '{"steps": [1, 2'])
+        assert await McpExecutor._read_json_object(stream) == '{"steps": [1, 2'
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_no_object(self):
+        assert await McpExecutor._read_json_object(_Stream(["无法生成计划"])) == "无法生成计划"
+
+
+# chunk21-3 之前使用的正则解析（作为逐行扫描实现的对照）
+_OLD_DEVICE_RE = re.compile(
+    r'-\s+names:\s+([^\n]+)\n\s+domain:\s+(\w+)\n\s+state:\s+([^\n]+)(?:\n\s+areas:\s+([^\n]+))?(?:\n\s+attributes:([^-]*))?',
+    re.MULTILINE
+)
+_OLD_POSITION_RE = re.compile(r"current_position:\s*'?([^'\n]+)'?")
+
+
+def _old_iter_devices(text):
+    for match in _OLD_DEVICE_RE.finditer(text):
+        position = _OLD_POSITION_RE.search(match.group(5) or "")
+        yield (
+            match.group(1).strip(),
+            match.group(2).strip(),
+            match.group(3).strip().strip("'\""),
+            match.group(4).strip() if match.group(4) else "",
+            position.group(1).strip() if position else None,
+        )
+
+
+LIVE_CONTEXT_YAML = """Live Context: An overview of the areas and the devices in this smart home:
+- names: Living Room Light, 客厅灯
+  domain: light
+  state: 'on'
+  areas: Living Room, 客厅
+  attributes:
+    brightness: '180'
+- names: 卧室窗帘
+  domain: cover
+  state: open
+  areas: 卧室
+  attributes:
+    current_position: '60'
+- names: Front Door
+  domain: lock
+  state: "locked"
+- names: Kitchen Fan
+  domain: fan
+  state: 'off'
+  areas: Kitchen
+"""
+
+
+class TestParseLiveContext:
+    """测试 GetLiveContext 设备列表解析"""
+
+    def test_line_scan_matches_old_regex(self):
+        assert list(McpExecutor._iter_live_context_devices(LIVE_CONTEXT_YAML)) == \
+            list(_old_iter_devices(LIVE_CONTEXT_YAML))
+
+    def test_parse_payload(self):
+        executor = McpExecutor.__new__(McpExecutor)
+        payload = {"content": [{"text": json.dumps({"result": LIVE_CONTEXT_YAML})}]}
+
+        assert executor._parse_live_context(payload) == {
+            "devices": [
+                {"entity_id": "light.living_room_light", "friendly_name": "Living Room Light",
+                 "area": "Living Room", "state": "on", "device_type": "light"},
+                {"entity_id": "cover.卧室窗帘", "friendly_name": "卧室窗帘",
+                 "area": "卧室", "state": "open", "device_type": "cover", "position": "60"},
+                {"entity_id": "lock.front_door", "friendly_name": "Front Door",
+                 "area": "", "state": "locked", "device_type": "lock"},
+                {"entity_id": "fan.kitchen_fan", "friendly_name": "Kitchen Fan",
+                 "area": "Kitchen", "state": "off", "device_type": "fan"},
+            ],
+            "areas": ["Kitchen", "Living Room", "卧室", "客厅"],
+        }
+
+    def test_position_after_hyphenated_attribute(self):
+        """属性值含 "-" 时，旧正则截断了 attributes，逐行扫描仍能取到 current_position"""
+        text = (
+            "- names: Study Blind\n"
+            "  domain: cover\n"
+            "  state: closed\n"
+            "  attributes:\n"
+            "    device_class: roller-blind\n"
+            "    current_position: '0'\n"
+        )
+        assert list(McpExecutor._iter_live_context_devices(text)) == [
+            ("Study Blind", "cover", "closed", "", "0")
+        ]
@@ -0,0 +1,81 @@
+# test/test_mcp_pool.py
+"""测试 MCP 连接池"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.mcp_control.connection_pool import McpConnectionPool
+from core.task.executors.mcp import McpExecutor
+
+
+def _state(value):
+    return SimpleNamespace(value=value)
+
+
+class _Connection:
+    """可控制重连结果的连接"""
+
+    def __init__(self, state="error", reconnect_ok=True):
+        self.state = _state(state)
+        self.reconnect_ok = reconnect_ok
+        self.reconnects = 0
+
+    async def reconnect(self):
+        self.reconnects += 1
+        await asyncio.sleep(0.01)
+        if not self.reconnect_ok:
+            raise ConnectionError("server unavailable")
+        self.state = _state("ready")
+
+
+class TestMcpConnectionPool:
+    """测试 McpConnectionPool"""
+
+    def test_executor_uses_given_pool(self):
+        """执行器使用传入的连接池（通常为 McpManager.connection_pool），未传入时为 connections 新建"""
+        connections = {}
+        pool = McpConnectionPool(connections)
+        assert McpExecutor(router=None, connections=connections, task_queue=None,
+                           connection_pool=pool).connection_pool is pool
+
+        executor = McpExecutor(router=None, connections=connections, task_queue=None)
+        assert executor.connection_pool is not pool
+        assert executor.connection_pool.connections is connections
+
+    @pytest.mark.asyncio
+    async def test_ready_and_missing(self):
+        ready = _Connection(state="ready")
+        plain = object()  # 没有 state 属性的连接视为可用
+        pool = McpConnectionPool({"ready": ready, "plain": plain})
+
+        assert await pool.get("ready") is ready
+        assert await pool.get("plain") is plain
+        assert await pool.get("missing") is None
+        assert ready.reconnects == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_reconnect(self):
+        connection = _Connection()
+        pool = McpConnectionPool({"hass": connection})
+
+        results = await asyncio.gather(*(pool.get("hass") for _ in range(5)))
+        assert all(result is connection for result in results)
+        assert connection.reconnects == 1
+        assert pool.is_ready(connection)
+
+    @pytest.mark.asyncio
+    async def test_reconnect_throttled(self):
+        connection = _Connection(reconnect_ok=False)
+        pool = McpConnectionPool({"hass": connection}, reconnect_interval=60.0)
+
+        assert await pool.get("hass") is connection  # 重连失败仍返回原连接
+        assert await pool.get("hass") is connection
+        assert connection.reconnects == 1
+
+        pool.reconnect_interval = 0.0
+        connection.reconnect_ok = True
+        await pool.get("hass")
+        assert connection.reconnects == 2
+        assert pool.is_ready(connection)
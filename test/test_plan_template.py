@@ -0,0 +1,61 @@
+# test/test_plan_template.py
+"""测试计划模板缓存"""
+
+import pytest
+
+from core.task.executors.plan_template import PlanTemplateStore
+
+STEPS = [{"description": "打开客厅灯", "expected_tool": "HassTurnOn", "depends_on": None}]
+
+
+@pytest.fixture
+def make_store(monkeypatch):
+    """创建新的模板存储（隔离进程内单例）"""
+    def make(max_entries=500):
+        monkeypatch.setattr(PlanTemplateStore, "_instance", None)
+        return PlanTemplateStore(max_entries=max_entries)
+    return make
+
+
+class TestPlanTemplateStore:
+    """测试 PlanTemplateStore"""
+
+    def test_singleton(self, make_store):
+        store = make_store()
+        assert PlanTemplateStore() is store
+
+    def test_key_normalization(self):
+        assert PlanTemplateStore.make_key("打开  客厅灯 ", "Turn ON") == PlanTemplateStore.make_key("打开 客厅灯", "turn on")
+        assert PlanTemplateStore.make_key("打开客厅灯", "a") != PlanTemplateStore.make_key("打开客厅灯", "b")
+        assert PlanTemplateStore.make_key("打开客厅灯") == PlanTemplateStore.make_key("打开客厅灯", None)
+
+    def test_put_get(self, make_store):
+        store = make_store()
+        key = store.make_key("打开客厅灯")
+        assert store.get(key) is None
+
+        store.put(key, STEPS)
+        assert store.get(key) == STEPS
+
+        store.put(key, [])  # 空模板不写入
+        assert store.get(key) == STEPS
+
+    def test_evicts_least_used(self, make_store):
+        store = make_store(max_entries=2)
+        store.put("a", STEPS)
+        store.put("b", STEPS)
+        store.get("a")
+
+        store.put("c", STEPS)
+        assert len(store) == 2
+        assert store.get("b") is None
+        assert store.get("a") == STEPS and store.get("c") == STEPS
+
+    def test_evicts_oldest_on_tie(self, make_store):
+        store = make_store(max_entries=2)
+        store.put("a", STEPS)
+        store.put("b", STEPS)
+
+        store.put("c", STEPS)
+        assert store.get("a") is None
+        assert store.get("b") == STEPS
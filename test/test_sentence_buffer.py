@@ -0,0 +1,51 @@
+# test/test_sentence_buffer.py
+"""测试流式文本分句"""
+
+from util.sentence_buffer import SentenceBuffer
+
+
+def _split(deltas, min_length=4):
+    """逐段喂入增量文本，返回 (按序切出的句子, 流结束时剩余的文本)"""
+    buffer = SentenceBuffer(min_length=min_length)
+    sentences = []
+    for delta in deltas:
+        sentences.extend(buffer.feed(delta))
+    return sentences, buffer.flush()
+
+
+class TestSentenceBuffer:
+    """测试 SentenceBuffer"""
+
+    def test_chinese_punctuation(self):
+        assert _split(["今天天气很好。明天会下雨！要带伞吗？"]) == (
+            ["今天天气很好。", "明天会下雨！", "要带伞吗？"], None
+        )
+
+    def test_sentence_split_across_deltas(self):
+        sentences, rest = _split(["今天天", "气很好", "。明天", "会下雨"])
+        assert sentences == ["今天天气很好。"]
+        assert rest == "明天会下雨"
+
+    def test_short_fragment_merged_with_next(self):
+        """过短的片段与下一句合并后再输出"""
+        assert _split(["好的。客厅灯已经打开了。"], min_length=6) == (["好的。客厅灯已经打开了。"], None)
+
+    def test_english_period_needs_whitespace(self):
+        """英文句号后需有空白才断句（小数、网址不切开）"""
+        sentences, rest = _split(["Pi is 3.14 today. See example.com now"])
+        assert sentences == ["Pi is 3.14 today."]
+        assert rest == "See example.com now"
+
+    def test_abbreviations_not_split(self):
+        sentences, rest = _split(["Dr. Smith met Mr. J. Lee today. Done"])
+        assert sentences == ["Dr. Smith met Mr. J. Lee today."]
+        assert rest == "Done"
+
+    def test_newline_and_semicolon(self):
+        assert _split(["第一条新闻内容\n第二条新闻内容；"]) == (["第一条新闻内容", "第二条新闻内容；"], None)
+
+    def test_flush_clears_buffer(self):
+        buffer = SentenceBuffer()
+        buffer.feed("没有句末标点")
+        assert buffer.flush() == "没有句末标点"
+        assert buffer.flush() is None
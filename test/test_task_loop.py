@@ -0,0 +1,65 @@
+# test/test_task_loop.py
+"""测试统一任务循环的唤醒与调度"""
+
+import asyncio
+
+import pytest
+
+from core.task import UnifiedTask, TaskType, TaskStatus, TaskQueue, TaskScheduler, UnifiedTaskLoop
+
+
+class _CompleteExecutor:
+    """立即完成任务的执行器"""
+
+    async def execute(self, task: UnifiedTask) -> None:
+        task.transition_to(TaskStatus.COMPLETED, "done")
+
+
+class TestUnifiedTaskLoop:
+    """测试任务循环"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_wakes_loop(self):
+        """入队立即唤醒循环，无需等待 loop_interval"""
+        queue = TaskQueue()
+        scheduler = TaskScheduler(max_concurrent_tasks=2)
+        scheduler.register_executor(TaskType.USER_COMMAND, _CompleteExecutor())
+        loop = UnifiedTaskLoop(queue, scheduler, loop_interval=5.0)
+        loop.start()
+        try:
+            await asyncio.sleep(0.01)
+            task = UnifiedTask(task_type=TaskType.USER_COMMAND, execution_data={"command": "noop"})
+            await queue.enqueue(task)
+
+            for _ in range(100):
+                if task.status == TaskStatus.COMPLETED:
+                    break
+                await asyncio.sleep(0.01)
+            assert task.status == TaskStatus.COMPLETED
+        finally:
+            loop.stop()
+
+    @pytest.mark.asyncio
+    async def test_schedule_failure_does_not_spin(self):
+        """调度失败的任务重新入队后等待 loop_interval 再重试，不会立即被唤醒"""
+        queue = TaskQueue()
+        scheduler = TaskScheduler(max_concurrent_tasks=2)
+        loop = UnifiedTaskLoop(queue, scheduler, loop_interval=0.2)
+
+        attempts = 0
+
+        async def failing_schedule(task):
+            nonlocal attempts
+            attempts += 1
+            return False
+
+        scheduler.schedule = failing_schedule
+
+        await queue.enqueue(UnifiedTask(task_type=TaskType.USER_COMMAND, execution_data={"command": "noop"}))
+        loop.start()
+        try:
+            await asyncio.sleep(0.5)
+        finally:
+            loop.stop()
+
+        assert 1 <= attempts <= 4
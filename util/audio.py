@@ -344,6 +344,7 @@ def save_pcm_as_wav(pcm_data: bytes, wav_path: str, rate: int = 16000, channels:
 
 import asyncio
 import time
+from collections import deque
 from enum import Enum
 from typing import Optional
 from util.vad_detector import VADDetector
@@ -401,6 +402,12 @@ class SpeechSegmenter:
         self.pre_padding_frames = pre_speech_padding_ms // frame_duration_ms
         self.post_padding_frames = post_speech_padding_ms // frame_duration_ms
         
+        # 预分配语音缓冲区（按最长语音 + 前后填充估算），多次监听复用，避免逐帧构造列表再拼接；
+        # 语音中夹杂的短静音帧不计入语音帧数，超出容量时 bytearray 会自动扩容
+        self._frame_bytes = vad_detector.get_frame_size()
+        capacity_frames = self.max_speech_frames + self.pre_padding_frames + self.post_padding_frames + self.silence_frames
+        self._speech_buf = bytearray(capacity_frames * self._frame_bytes)
+        
         print(f"[SpeechSegmenter] Initialized")
         print(f"  Min speech: {min_speech_duration_ms}ms ({self.min_speech_frames} frames)")
         print(f"  Max speech: {max_speech_duration_ms}ms ({self.max_speech_frames} frames)")
@@ -424,8 +431,9 @@ class SpeechSegmenter:
         print("[SpeechSegmenter] Starting to listen for speech...")
         
         state = SegmentState.IDLE
-        speech_buffer = []  # 语音缓冲区
-        pre_buffer = []     # 前置缓冲区（环形）
+        speech_buf = self._speech_buf                     # 语音缓冲区（预分配，复用）
+        speech_len = 0                                    # 缓冲区中已写入的字节数
+        pre_buffer = deque(maxlen=self.pre_padding_frames)  # 前置缓冲区（环形）
         speech_frames = 0   # 语音帧计数
         silence_frames = 0  # 静音帧计数
         total_frames = 0    # 总帧数
@@ -433,9 +441,21 @@ class SpeechSegmenter:
         start_time = time.time()
         frame_size = self.vad.get_frame_size()
         
+        def append(frame: bytes):
+            """将一帧写入语音缓冲区"""
+            nonlocal speech_len
+            end = speech_len + len(frame)
+            speech_buf[speech_len:end] = frame
+            speech_len = end
+        
+        def take() -> bytes:
+            """取出缓冲区中的语音数据"""
+            with memoryview(speech_buf) as view:
+                return bytes(view[:speech_len])
+        
         # 在线程池中执行录音循环
         def record_loop():
-            nonlocal state, speech_buffer, pre_buffer, speech_frames, silence_frames, total_frames
+            nonlocal state, speech_len, speech_frames, silence_frames, total_frames
             
             try:
                 recorder.start()
@@ -458,23 +478,22 @@ class SpeechSegmenter:
                     
                     # 状态机处理
                     if state == SegmentState.IDLE:
-                        # 维护前置缓冲区（环形队列）
+                        # 维护前置缓冲区（环形队列，超出 maxlen 自动丢弃最旧帧）
                         pre_buffer.append(frame)
-                        if len(pre_buffer) > self.pre_padding_frames:
-                            pre_buffer.pop(0)
                         
                         # 检测到语音 → 进入 DETECTING
                         if is_speech:
                             print(f"[SpeechSegmenter] Speech detected at frame {total_frames}")
                             state = SegmentState.DETECTING
                             # 添加前置缓冲区
-                            speech_buffer.extend(pre_buffer)
-                            speech_buffer.append(frame)
+                            for pre_frame in pre_buffer:
+                                append(pre_frame)
+                            append(frame)
                             speech_frames = 1
                             silence_frames = 0
                     
                     elif state == SegmentState.DETECTING:
-                        speech_buffer.append(frame)
+                        append(frame)
                         
                         if is_speech:
                             speech_frames += 1
@@ -491,12 +510,12 @@ class SpeechSegmenter:
                             if silence_frames >= self.silence_frames:
                                 print(f"[SpeechSegmenter] False alarm, back to IDLE")
                                 state = SegmentState.IDLE
-                                speech_buffer.clear()
+                                speech_len = 0
                                 speech_frames = 0
                                 silence_frames = 0
                     
                     elif state == SegmentState.SPEAKING:
-                        speech_buffer.append(frame)
+                        append(frame)
                         
                         if is_speech:
                             speech_frames += 1
@@ -505,7 +524,7 @@ class SpeechSegmenter:
                             # 超过最大长度 → 强制结束
                             if speech_frames >= self.max_speech_frames:
                                 print(f"[SpeechSegmenter] Max duration reached, ending")
-                                return b''.join(speech_buffer)
+                                return take()
                         else:
                             silence_frames += 1
                             
@@ -515,7 +534,7 @@ class SpeechSegmenter:
                                 state = SegmentState.ENDING
                     
                     elif state == SegmentState.ENDING:
-                        speech_buffer.append(frame)
+                        append(frame)
                         
                         if is_speech:
                             # 又开始说话 → 回到 SPEAKING
@@ -537,12 +556,12 @@ class SpeechSegmenter:
                                 while post_padding_count < self.post_padding_frames:
                                     post_frame = recorder.read(frame_size)
                                     if post_frame:
-                                        speech_buffer.append(post_frame)
+                                        append(post_frame)
                                         post_padding_count += 1
                                     else:
                                         break
                                 
-                                return b''.join(speech_buffer)
+                                return take()
                 
             finally:
                 if recorder.is_recording():
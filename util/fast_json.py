@@ -0,0 +1,29 @@
+"""JSON 编解码
+
+已安装 orjson 时使用 orjson（C 实现，解析/序列化更快），否则回退到标准库 json。
+两种实现的 JSONDecodeError 都是 ValueError 的子类。
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = orjson.JSONDecodeError if orjson else json.JSONDecodeError
+
+
+def loads(data: Any) -> Any:
+    """解析 JSON（接受 str / bytes）"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """序列化为 JSON 字符串（非 ASCII 字符原样输出）"""
+    if orjson:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False, default=default)
@@ -0,0 +1,155 @@
+"""多关键词匹配
+
+已安装 pyahocorasick 时使用 Aho-Corasick 自动机（单次扫描文本即可匹配全部关键词），
+否则回退到预编译的正则多选分支。KeywordMatcher 的关键词与文本均按小写匹配；
+正则分支使用 re.IGNORECASE，不必为（可能很长的）文本生成小写副本。
+"""
+
+import re
+from typing import Iterable, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """关键词集合匹配器（构造时预处理，匹配时单次扫描）"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Args:
+            keywords: 关键词列表（大小写不敏感）
+        """
+        # 小写 -> 原始关键词；保持顺序去重
+        self._keywords = {}
+        for keyword in keywords:
+            if keyword:
+                self._keywords.setdefault(keyword.lower(), keyword)
+
+        self._automaton = None
+        self._pattern = None
+        self._max_len = max(map(len, self._keywords), default=0)
+
+        if not self._keywords:
+            return
+
+        if ahocorasick:
+            self._automaton = ahocorasick.Automaton()
+            for lowered in self._keywords:
+                self._automaton.add_word(lowered, lowered)
+            self._automaton.make_automaton()
+        else:
+            # 长关键词优先，避免被其前缀抢先匹配
+            alternatives = sorted(self._keywords, key=len, reverse=True)
+            self._pattern = re.compile("|".join(map(re.escape, alternatives)), re.IGNORECASE)
+
+    def find(self, text: str) -> Optional[str]:
+        """返回文本中最先出现的关键词（原始写法；同一位置开始的取最长），无匹配返回 None"""
+        if not text:
+            return None
+
+        if self._automaton is not None:
+            # 自动机按结束位置报告匹配，需比较起始位置；
+            # 之后的匹配起始位置不早于 end - 最长关键词长度 + 1，超过当前最优时即可停止
+            best = None
+            for end, lowered in self._automaton.iter(text.lower()):
+                if best is not None and end - self._max_len >= best[0]:
+                    break
+                candidate = (end - len(lowered) + 1, -len(lowered), lowered)
+                if best is None or candidate < best:
+                    best = candidate
+            return None if best is None else self._keywords[best[2]]
+
+        if self._pattern is not None:
+            match = self._pattern.search(text)
+            if match:
+                return self._keywords[match.group().lower()]
+
+        return None
+
+    def matches(self, text: str) -> bool:
+        """文本中是否包含任一关键词"""
+        return self.find(text) is not None
+
+    def __bool__(self) -> bool:
+        return bool(self._keywords)
+
+
+class LabeledKeywordMatcher:
+    """带标签的关键词分组匹配器
+
+    各分组按优先级排列，返回文本中出现了关键词的优先级最高的分组标签
+    （与按分组顺序逐个 `keyword in text` 判断的结果一致，但只需扫描一次文本）
+    """
+
+    def __init__(self, groups: Sequence[Tuple[str, Iterable[str]]], case_sensitive: bool = False):
+        """
+        Args:
+            groups: (标签, 关键词列表) 序列，靠前的分组优先
+            case_sensitive: 是否区分大小写，默认不区分
+        """
+        self._case_sensitive = case_sensitive
+        self._labels = [label for label, _keywords in groups]
+
+        # 关键词 -> 所属分组中优先级最高的序号
+        self._ranks = {}
+        for rank, (_label, keywords) in enumerate(groups):
+            for keyword in keywords:
+                if keyword:
+                    self._ranks.setdefault(self._normalize(keyword), rank)
+
+        self._automaton = None
+        self._pattern = None
+
+        if not self._ranks:
+            return
+
+        if ahocorasick:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, rank in self._ranks.items():
+                self._automaton.add_word(keyword, rank)
+            self._automaton.make_automaton()
+        else:
+            # 单个正则：每个分组一个命名组（g<序号>），按优先级排列；
+            # 整体包在零宽先行断言中，逐位置报告该处优先级最高的分组，匹配之间不会互相吞掉
+            grouped = [[] for _ in self._labels]
+            for keyword, rank in self._ranks.items():
+                grouped[rank].append(keyword)
+            alternatives = "|".join(
+                f"(?P<g{rank}>{'|'.join(map(re.escape, keywords))})"
+                for rank, keywords in enumerate(grouped) if keywords
+            )
+            self._pattern = re.compile(
+                f"(?=(?:{alternatives}))", 0 if case_sensitive else re.IGNORECASE
+            )
+
+    def _normalize(self, text: str) -> str:
+        return text if self._case_sensitive else text.lower()
+
+    def classify(self, text: str) -> Optional[str]:
+        """返回匹配到的优先级最高的分组标签，无匹配返回 None"""
+        if not text:
+            return None
+
+        if self._automaton is not None:
+            best = None
+            for _end, rank in self._automaton.iter(self._normalize(text)):
+                if rank == 0:
+                    return self._labels[0]
+                if best is None or rank < best:
+                    best = rank
+            return None if best is None else self._labels[best]
+
+        if self._pattern is not None:
+            best = None
+            for match in self._pattern.finditer(text):
+                rank = int(match.lastgroup[1:])
+                if rank == 0:
+                    return self._labels[0]
+                if best is None or rank < best:
+                    best = rank
+            return None if best is None else self._labels[best]
+
+        return None
@@ -0,0 +1,61 @@
+"""后台日志输出
+
+通过 QueueHandler -> QueueListener 把日志格式化与写出移到后台线程，
+热路径上只做一次入队操作。
+"""
+
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def setup_queue_logging(level: int = logging.INFO, log_file: Optional[str] = None) -> QueueListener:
+    """在应用启动时安装队列日志（重复调用返回已有的 listener）
+
+    Args:
+        level: 根 logger 级别
+        log_file: 可选的日志文件路径，默认只输出到 stderr
+
+    Returns:
+        QueueListener: 已启动的后台 listener
+    """
+    global _listener, _queue_handler
+
+    if _listener is not None:
+        return _listener
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    formatter = logging.Formatter("%(asctime)s [%(name)s:%(levelname)s] %(message)s")
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    _queue_handler = QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """从根 logger 移除 QueueHandler，停止后台 listener 并刷出剩余日志"""
+    global _listener, _queue_handler
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,61 @@
+"""流式文本分句
+
+LLM 流式输出的增量文本先进入缓冲区，凑够完整句子即切出，
+供 TTS 逐句播报（边生成边播放）。
+"""
+
+import re
+from typing import List, Optional
+
+# 中文句末标点直接断句；英文 . ! ? 需后跟空白才断句（避免 3.14、URL 等被切开）
+_SENTENCE_END_RE = re.compile(r"[。！？；\n]|[.!?](?=\s)")
+
+# 以 "." 结尾但不是句末的常见缩写
+_ABBREVIATIONS = frozenset({"mr", "mrs", "ms", "dr", "prof", "st", "vs", "etc", "e.g", "i.e", "no"})
+
+
+def _is_abbreviation(text: str) -> bool:
+    """判断 "." 前的单词是否为缩写（含单个字母，如人名首字母）"""
+    words = text.rsplit(None, 1)
+    if not words:
+        return False
+    word = words[-1].lower()
+    return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+class SentenceBuffer:
+    """句子缓冲区
+
+    Args:
+        min_length: 最短句长，过短的片段（如"好的。"）与下一句合并后再输出
+    """
+
+    def __init__(self, min_length: int = 10):
+        self._buffer = ""
+        self._min_length = min_length
+
+    def feed(self, delta: str) -> List[str]:
+        """追加增量文本，返回已完整的句子列表"""
+        self._buffer += delta
+
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(self._buffer):
+            if match.group() == "." and _is_abbreviation(self._buffer[start:match.start()]):
+                continue
+
+            sentence = self._buffer[start:match.end()].strip()
+            if len(sentence) < self._min_length:
+                continue
+
+            sentences.append(sentence)
+            start = match.end()
+
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """取出缓冲区剩余文本（流结束时调用）"""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None